@@ -4,10 +4,743 @@ from tkinter import ttk, messagebox, filedialog
 import numpy as np
 import pandas as pd
 import itertools
+import argparse
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import threading
+import time
+import warnings
+import zipfile
+from collections import Counter, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import MappingProxyType
+from urllib.parse import parse_qs, urlparse
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+SUFIJOS_AUXILIARES = ('clasificacion', 'registro')  # Suffixes of the files that accompany a scoresheet
+
+
+def ruta_historica(file_path):
+    """
+    Get the path of the historical classification file that belongs to a scoresheet.
+
+    Args:
+        file_path (str): Path of the scoresheet CSV file.
+
+    Returns:
+        str: Path of the file ending with "clasificacion.csv".
+    """
+    return file_path.replace('.csv', 'clasificacion.csv')
+
+
+def ruta_registro(file_path):
+    """
+    Get the path of the log of result updates that belongs to a scoresheet.
+
+    Args:
+        file_path (str): Path of the scoresheet CSV file.
+
+    Returns:
+        str: Path of the file ending with "registro.csv".
+    """
+    return file_path.replace('.csv', 'registro.csv')
+
+
+def ruta_provisional(file_path):
+    """
+    Get the path of the provisional standings of the matches in play of a scoresheet.
+
+    Args:
+        file_path (str): Path of the scoresheet CSV file.
+
+    Returns:
+        str: Path of the file ending with "provisional.json".
+    """
+    return file_path.replace('.csv', 'provisional.json')
+
+
+def archivos_liga(file_path):
+    """
+    Get the list of files that make up a league on disk.
+
+    Args:
+        file_path (str): Path of the scoresheet CSV file.
+
+    Returns:
+        list: Paths of the scoresheet, the historical classification and the log of result updates.
+    """
+    return [file_path, ruta_historica(file_path), ruta_registro(file_path)]
+
+
+def es_archivo_auxiliar(ruta):
+    """
+    Check whether a file is one of the files that accompany a scoresheet.
+
+    A file is only auxiliary when the scoresheet it belongs to exists next to it, so a league
+    whose own name ends like an auxiliary file is not hidden.
+
+    Args:
+        ruta (str): Path of the file, with or without the .csv extension.
+    """
+    nombre = ruta[:-len('.csv')] if ruta.endswith('.csv') else ruta
+    return any(nombre.endswith(sufijo) and os.path.isfile(nombre[:-len(sufijo)] + '.csv')
+               for sufijo in SUFIJOS_AUXILIARES)
+
+
+def firma_archivos(rutas):
+    """
+    Build a cheap signature of a set of files to detect changes without reading them.
+
+    Args:
+        rutas (list): Paths of the files to check.
+
+    Returns:
+        tuple: Modification time and size of each file, or None for missing files.
+    """
+    firma = []
+    for ruta in rutas:
+        try:
+            estado = os.stat(ruta)
+            firma.append((estado.st_mtime_ns, estado.st_size))
+        except FileNotFoundError:
+            firma.append(None)
+    return tuple(firma)
+
+
+def partidos_jugados(df):
+    """
+    List the matches of a scoresheet that have a result, in scoresheet order.
+
+    Args:
+        df (DataFrame): The N x N scoresheet.
+
+    Returns:
+        list: (local, visitante) pairs.
+    """
+    filas, columnas = np.nonzero(df.notna().to_numpy())
+    return [(df.index[fila], df.columns[columna]) for fila, columna in zip(filas, columnas)]
+
+
+def inferir_jornadas(df, conocidas):
+    """
+    Assign a game week to every played match of a scoresheet.
+
+    The matches with a known game week keep it. The others are given, in scoresheet order,
+    the first game week in which neither team has played yet.
+
+    Args:
+        df (DataFrame): The N x N scoresheet.
+        conocidas (dict): Known game week by (local, visitante) pair.
+
+    Returns:
+        dict: Game week by (local, visitante) pair for every played match.
+    """
+    jornadas = {}
+    ocupadas = {equipo: set() for equipo in itertools.chain(df.index, df.columns)}
+    pendientes = []
+    for local, visitante in partidos_jugados(df):
+        jornada = conocidas.get((local, visitante))
+        if jornada:
+            jornadas[(local, visitante)] = jornada
+            ocupadas[local].add(jornada)
+            ocupadas[visitante].add(jornada)
+        else:
+            pendientes.append((local, visitante))
+
+    for local, visitante in pendientes:
+        jornada = 1
+        while jornada in ocupadas[local] or jornada in ocupadas[visitante]:
+            jornada += 1
+        jornadas[(local, visitante)] = jornada
+        ocupadas[local].add(jornada)
+        ocupadas[visitante].add(jornada)
+    return jornadas
+
+
+class ConflictoResultado(Exception):
+    """
+    Raised when a result was changed by another writer to a different score.
+    """
+
+
+class BloqueoArchivo:
+    """
+    An advisory, exclusive lock on a file, used as a context manager.
+
+    The lock is shared with other processes that lock the same file, so several operators
+    can update the same league without overwriting each other. Where flock is available the
+    lock file is removed on release, so it is only on disk while somebody holds the lock.
+    """
+
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta (str): Path of the lock file. It is created if it does not exist.
+        """
+        self.ruta = ruta
+        self.archivo = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            while True:
+                self.archivo = open(self.ruta, 'a+b')
+                fcntl.flock(self.archivo.fileno(), fcntl.LOCK_EX)
+                # The previous holder may have removed the file while we waited for it
+                try:
+                    if os.stat(self.ruta).st_ino == os.fstat(self.archivo.fileno()).st_ino:
+                        break
+                except FileNotFoundError:
+                    pass
+                self.archivo.close()
+        else:
+            self.archivo = open(self.ruta, 'a+b')
+            # msvcrt only retries for a few seconds, so keep waiting until the lock is free
+            while True:
+                try:
+                    self.archivo.seek(0)
+                    msvcrt.locking(self.archivo.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if fcntl is not None:
+            os.remove(self.ruta)  # Waiting writers see that the file changed and lock the new one
+            fcntl.flock(self.archivo.fileno(), fcntl.LOCK_UN)
+        else:
+            self.archivo.seek(0)
+            msvcrt.locking(self.archivo.fileno(), msvcrt.LK_UNLCK, 1)
+        self.archivo.close()
+        self.archivo = None
+
+
+class LigaVersionada:
+    """
+    A league scoresheet with an append-only log of result updates.
+
+    Every result is written as one numbered line in the "registro.csv" file under an advisory
+    lock, instead of rewriting the whole scoresheet. The sequence number of the last line read
+    is the version of the in-memory scoresheet: before writing, the updates posted by other
+    writers since that version are merged, and a result is rejected if another writer posted
+    a different score for the same match in the meantime. The scoresheet CSV is rewritten
+    from time to time to fold the log into it, and the log is then replaced by one that starts
+    at that version, so loading a league does not replay its whole history.
+    """
+
+    CAMPOS = ['Secuencia', 'Local', 'Visitante', 'Anterior', 'Resultado', 'Jornada']
+    COMPACTAR_CADA = 50  # Number of logged updates between two rewrites of the scoresheet
+
+    def __init__(self, file_path):
+        """
+        Load the league.
+
+        Args:
+            file_path (str): Path of the scoresheet CSV file.
+        """
+        self.file_path = file_path
+        self.ruta_registro = ruta_registro(file_path)
+        self.ruta_bloqueo = file_path.replace('.csv', '.lock')
+        self.df = None
+        self.jornadas = {}  # (local, visitante) -> game week, for the results posted with one
+        self.version = 0
+        self._posicion = 0  # Bytes of the log already read
+        self._base = 0  # Version the log being read starts at, after the last compaction
+        self._campos = self.CAMPOS  # Columns of the log, taken from its header
+        self.suscriptores = []  # Functions called with every log entry applied
+
+        self.cargar()
+
+    def cargar(self):
+        """
+        Load the scoresheet and replay the log of result updates on top of it.
+
+        Replaying the whole log is always correct, because each line sets a cell to an absolute value
+        and lines already folded into the scoresheet just set the same value again.
+        """
+        # A compaction between reading the scoresheet and the log is found by the next read of the log
+        self._base = self._leer_base()
+        self.df = pd.read_csv(self.file_path, index_col=0).astype(object)
+        self.jornadas = {}
+        self.version = 0
+        self._posicion = 0
+        self.refrescar()
+
+    def refrescar(self):
+        """
+        Apply the updates posted by other writers since the last read.
+
+        Returns:
+            list: The new log entries, as dictionaries.
+        """
+        entradas = self._leer_registro()
+        for entrada in entradas:
+            self._aplicar(entrada)
+        return entradas
+
+    def publicar(self, local, visitante, resultado, jornada=None, esperado=None):
+        """
+        Post a result for a match.
+
+        Args:
+            local (str): Home team.
+            visitante (str): Away team.
+            resultado (str): Score in 'X-Y' format, or an empty string to remove the result.
+            jornada (int, optional): Game week of the match. By default, the first game week
+                in which neither team has played yet.
+            esperado (str, optional): Score the match must still have, or an empty string for
+                no result, checked under the lock. Undoing a change uses it so as not to
+                overwrite a later change by another writer.
+
+        Returns:
+            dict: The log entry written, with the previous game week of the match under
+                'JornadaAnterior', or None if the match already had that result and game week.
+
+        Raises:
+            ConflictoResultado: If another writer posted a different score for the same match
+                since this scoresheet was last read, or the match does not have the expected score.
+        """
+        resultado = str(resultado).strip()
+        with BloqueoArchivo(self.ruta_bloqueo):
+            # Merge what other writers posted since our version
+            for entrada in self.refrescar():
+                if (entrada['Local'], entrada['Visitante']) == (local, visitante) and entrada['Resultado'] != resultado:
+                    raise ConflictoResultado(
+                        f"El resultado de {local} - {visitante} ha sido cambiado a "
+                        f"'{entrada['Resultado']}' por otro usuario.")
+
+            anterior = self.df.at[local, visitante]
+            anterior = str(anterior) if pd.notna(anterior) else ''
+            if esperado is not None and anterior != esperado:
+                raise ConflictoResultado(
+                    f"El resultado de {local} - {visitante} es '{anterior}' y no '{esperado}': "
+                    f"lo ha cambiado otro usuario.")
+            jornada_anterior = self.jornadas.get((local, visitante))
+            if anterior and jornada_anterior is None:
+                jornada_anterior = self.jornadas_partidos().get((local, visitante))  # Inferred game week
+            if jornada is None and resultado:
+                jornada = self.jornadas.get((local, visitante)) or self.jornada_libre(local, visitante)
+            jornada = int(jornada) if resultado else None
+            if anterior == resultado and self.jornadas.get((local, visitante)) == jornada:
+                return None
+
+            entrada = {'Secuencia': self.version + 1, 'Local': local, 'Visitante': visitante,
+                       'Anterior': anterior, 'Resultado': resultado, 'Jornada': jornada}
+            self._escribir_registro(entrada)
+            self._aplicar(entrada)
+            entrada['JornadaAnterior'] = jornada_anterior  # Not logged, lets the caller revert the change
+
+            if self.version % self.COMPACTAR_CADA == 0:
+                self.compactar()
+        return entrada
+
+    def jornada_libre(self, local, visitante, jornadas=None):
+        """
+        Get the first game week in which neither of two teams has a result yet.
+
+        Args:
+            local (str): Home team.
+            visitante (str): Away team.
+            jornadas (dict, optional): The game weeks of the played matches, as returned by
+                jornadas_partidos, to infer them once for several matches.
+
+        Returns:
+            int: The game week.
+        """
+        jornadas = self.jornadas_partidos() if jornadas is None else jornadas
+        ocupadas = {jornada for partido, jornada in jornadas.items()
+                    if local in partido or visitante in partido}
+        jornada = 1
+        while jornada in ocupadas:
+            jornada += 1
+        return jornada
+
+    def jornadas_partidos(self):
+        """
+        Get the game week of every played match.
+
+        The game week of the results posted without one, like those entered before the log
+        existed, is inferred as the first game week in which neither team has played yet.
+
+        Returns:
+            dict: Game week by (local, visitante) pair.
+        """
+        return inferir_jornadas(self.df, self.jornadas)
+
+    def suscribir(self, funcion):
+        """
+        Register a function to be called with every log entry applied from now on.
+
+        This allows views derived from the results to be updated incrementally, both with the
+        results posted here and with those merged from other writers.
+
+        Args:
+            funcion (callable): Function receiving the log entry as a dictionary.
+        """
+        self.suscriptores.append(funcion)
+
+    def compactar(self):
+        """
+        Rewrite the scoresheet CSV with the current results.
+
+        The file is replaced atomically, so readers always see a complete scoresheet. The log is
+        then replaced by one whose header holds the current version as its base, with one line per
+        match with a game week, as the scoresheet does not keep them. Readers that had not reached
+        this version load the league again. It must be called while holding the lock of the league.
+        """
+        temporal = self.file_path + '.tmp'
+        self.df.to_csv(temporal)
+        os.replace(temporal, self.file_path)
+
+        temporal = self.ruta_registro + '.tmp'
+        with open(temporal, 'w', newline='', encoding='utf-8') as archivo:
+            escritor = csv.writer(archivo, lineterminator='\n')
+            escritor.writerow(['#base', self.version])
+            escritor.writerow(self.CAMPOS)
+            for (local, visitante), jornada in self.jornadas.items():
+                escritor.writerow([self.version, local, visitante, '', self.df.at[local, visitante], jornada])
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, self.ruta_registro)
+        self._base = self.version
+        self._posicion = os.path.getsize(self.ruta_registro)
+
+    def _aplicar(self, entrada):
+        """
+        Apply a log entry to the in-memory scoresheet.
+        """
+        partido = (entrada['Local'], entrada['Visitante'])
+        self.df.at[partido] = entrada['Resultado'] or np.nan
+        if entrada['Resultado'] and entrada['Jornada']:
+            self.jornadas[partido] = int(entrada['Jornada'])
+        else:
+            self.jornadas.pop(partido, None)
+        self.version = entrada['Secuencia']
+        for funcion in self.suscriptores:
+            funcion(entrada)
+
+    def _leer_base(self, archivo=None):
+        """
+        Read the version the log starts at, 0 if it was never compacted or does not exist.
+
+        Args:
+            archivo (file, optional): The log, already open in binary mode.
+        """
+        if archivo is None:
+            try:
+                with open(self.ruta_registro, 'rb') as archivo:
+                    return self._leer_base(archivo)
+            except FileNotFoundError:
+                return 0
+        archivo.seek(0)
+        linea = archivo.readline()
+        return int(linea.split(b',')[1]) if linea.startswith(b'#base,') else 0
+
+    def _resincronizar(self):
+        """
+        Load the league again after its log was compacted past our version.
+
+        The entries between our version and the base of the new log are gone, so the differences
+        between the old and the reloaded scoresheet are returned as entries instead. Applying them
+        again sets the same values, and passes them to the subscribers.
+
+        Returns:
+            list: One entry per match whose result or game week changed.
+        """
+        df, jornadas = self.df, self.jornadas
+        suscriptores, self.suscriptores = self.suscriptores, []
+        try:
+            self.cargar()
+        finally:
+            self.suscriptores = suscriptores
+
+        def valor(tabla, partido):
+            return str(tabla.at[partido]) if pd.notna(tabla.at[partido]) else ''
+
+        entradas = []
+        for partido in itertools.product(self.df.index, self.df.columns):
+            anterior, resultado = valor(df, partido), valor(self.df, partido)
+            if anterior != resultado or jornadas.get(partido) != self.jornadas.get(partido):
+                entradas.append({'Secuencia': self.version, 'Local': partido[0], 'Visitante': partido[1],
+                                 'Anterior': anterior, 'Resultado': resultado,
+                                 'Jornada': self.jornadas.get(partido, '')})
+        return entradas
+
+    def _leer_registro(self):
+        """
+        Read the complete lines appended to the log since the last read.
+        """
+        try:
+            with open(self.ruta_registro, 'rb') as archivo:
+                base = self._leer_base(archivo)
+                if base != self._base:
+                    return self._resincronizar()  # The log was compacted since the last read
+                archivo.seek(self._posicion)
+                datos = archivo.read()
+        except FileNotFoundError:
+            return []
+
+        # A line is only consumed once it is complete
+        fin = datos.rfind(b'\n') + 1
+        if fin == 0:
+            return []
+        lineas = list(csv.reader(datos[:fin].decode('utf-8').splitlines()))
+        if self._posicion == 0:
+            self._base = int(lineas.pop(0)[1]) if lineas[0][0] == '#base' else 0
+            self._campos = lineas.pop(0) if lineas else self.CAMPOS  # Older logs have fewer columns
+        self._posicion += fin
+
+        entradas = []
+        for fila in lineas:
+            entrada = dict.fromkeys(self.CAMPOS, '')
+            entrada.update(zip(self._campos, fila))
+            entrada['Secuencia'] = int(entrada['Secuencia'])
+            entradas.append(entrada)
+        return entradas
+
+    def _escribir_registro(self, entrada):
+        """
+        Append an entry to the log. It must be called while holding the lock of the league.
+        """
+        nuevo = not os.path.exists(self.ruta_registro)
+        with open(self.ruta_registro, 'a', newline='', encoding='utf-8') as archivo:
+            escritor = csv.writer(archivo, lineterminator='\n')
+            if nuevo:
+                escritor.writerow(self.CAMPOS)
+            escritor.writerow([entrada[campo] if entrada[campo] is not None else '' for campo in self.CAMPOS])
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+        # Our own line is already applied, so it does not have to be read back
+        self._posicion = os.path.getsize(self.ruta_registro)
+
+
+def dibujar_clasificacion(ax, df_grafico, ratings=None):
+    """
+    Plot the position of each team by game week on a Matplotlib axis.
+
+    Args:
+        ax (Axes): The axis to draw on.
+        df_grafico (DataFrame): The historical classification, with 'Equipo', 'Jornada' and 'Posicion'.
+        ratings (dict, optional): Rating by team, shown next to its name in the legend.
+
+    Returns:
+        dict: The plotted line of each team.
+    """
+    df_grafico['Posicion'] = df_grafico['Posicion'].apply(lambda x: int(x) if pd.notnull(x) else x)
+
+    # Count the number of teams
+    equipos_cont = sum(1 for _ in df_grafico.groupby('Equipo'))
+
+    # Set up a color palette for the teams
+    color_palette = plt.colormaps['tab20'].colors
+
+    # Plot each team's position by game week
+    lineas = {}
+    for i, (equipo, group) in enumerate(df_grafico.groupby('Equipo')):
+        etiqueta = f"{equipo} ({ratings[equipo]:.0f})" if ratings and equipo in ratings else equipo
+        lineas[equipo], = ax.plot(group['Jornada'], group['Posicion'], marker='o', label=etiqueta,
+                                  color=color_palette[i % len(color_palette)])
+
+    # Configure axis and layout of the graph
+    ax.invert_yaxis()  # Invert the y-axis to have the top position at the top
+    ax.set_yticks(np.arange(1, equipos_cont + 1, 1))
+    ax.set_xticks(np.arange(1, ((equipos_cont - 1) * 2) + 1, 1))
+    ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
+    ax.set_xlabel('Jornada')
+    ax.set_ylabel('Posición')
+    ax.set_title('Evolución de la Clasificación por Jornada')
+    ax.grid(True)
+    ax.set_facecolor('black')
+    return lineas
+
+
+class IndiceRejilla:
+    """
+    A uniform grid over a set of 2-D points, to find the points near a location.
+
+    Each point is stored in the cell that contains it, so a query only looks at the points of
+    the cells within its radius instead of at all the points.
+    """
+
+    def __init__(self, x, y, celda=1.0):
+        """
+        Build the grid.
+
+        Args:
+            x (array-like): X coordinate of every point.
+            y (array-like): Y coordinate of every point.
+            celda (float): Side of the cells, in the units of the coordinates.
+        """
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.celda = celda
+        self.celdas = {}  # Indices of the points by (column, row) of their cell
+        columnas, filas = np.floor(self.x / celda).astype(int), np.floor(self.y / celda).astype(int)
+        for i, clave in enumerate(zip(columnas.tolist(), filas.tolist())):
+            self.celdas.setdefault(clave, []).append(i)
+
+    def candidatos(self, x, y, radio_x, radio_y):
+        """
+        Get the points in the cells that overlap a rectangle around a location.
+
+        Args:
+            x (float): X coordinate of the location.
+            y (float): Y coordinate of the location.
+            radio_x (float): Half width of the rectangle.
+            radio_y (float): Half height of the rectangle.
+
+        Returns:
+            list: Indices of the points, which may be further than the radius.
+        """
+        columnas = range(math.floor((x - radio_x) / self.celda), math.floor((x + radio_x) / self.celda) + 1)
+        filas = range(math.floor((y - radio_y) / self.celda), math.floor((y + radio_y) / self.celda) + 1)
+        return [i for columna in columnas for fila in filas for i in self.celdas.get((columna, fila), ())]
+
+
+class InteraccionClasificacion:
+    """
+    Hover tooltips and click highlighting for the position chart.
+
+    The points of the chart are indexed once in a grid by game week and position. The tooltip and
+    the highlighted line are animated artists: the rest of the figure is saved as a background
+    after every full draw, and on each event only these two artists are drawn on top of it.
+    """
+
+    RADIO = 8  # Distance in pixels from the mouse to a point to select it
+
+    def __init__(self, ax, lineas, df_grafico, puntos=None):
+        """
+        Connect the interaction to a chart drawn with dibujar_clasificacion.
+
+        Args:
+            ax (Axes): The axis of the chart.
+            lineas (dict): The line of each team, as returned by dibujar_clasificacion.
+            df_grafico (DataFrame): The historical classification, with 'Equipo', 'Jornada' and 'Posicion'.
+            puntos (dict, optional): Points by (team, game week), shown in the tooltip.
+        """
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.lineas = lineas
+        self.puntos = puntos or {}
+        self.fondo = None  # The figure without the animated artists, saved after every full draw
+        self.seleccionado = None  # Team whose line is highlighted
+
+        validos = df_grafico.dropna(subset=['Posicion'])
+        self.equipos = validos['Equipo'].tolist()
+        self.indice = IndiceRejilla(validos['Jornada'], validos['Posicion'])
+
+        self.anotacion = ax.annotate('', xy=(0, 0), xytext=(12, 12), textcoords='offset points', animated=True,
+                                     visible=False, bbox=dict(boxstyle='round', fc='white', alpha=0.9))
+        self.resaltado, = ax.plot([], [], linewidth=5, marker='o', markersize=9, animated=True, visible=False)
+
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.canvas.mpl_connect('motion_notify_event', self.on_move)
+        self.canvas.mpl_connect('button_press_event', self.on_click)
+        self.canvas.mpl_connect('figure_leave_event', lambda event: self.mostrar_anotacion(None))
+
+    def punto(self, event):
+        """
+        Find the point of the chart under the mouse.
+
+        Args:
+            event (MouseEvent): The mouse event.
+
+        Returns:
+            int: Index of the nearest point within the radius, or None.
+        """
+        if event.inaxes is not self.ax or event.xdata is None:
+            return None
+        # Radius in data units from the current scale of the axis, which changes when resizing
+        escala = np.abs(np.diff(self.ax.transData.transform([(0, 0), (1, 1)]), axis=0)[0])
+        x, y = self.ax.transData.inverted().transform((event.x, event.y))
+        candidatos = self.indice.candidatos(x, y, self.RADIO / escala[0], self.RADIO / escala[1])
+        if not candidatos:
+            return None
+        pantalla = self.ax.transData.transform(np.column_stack([self.indice.x[candidatos], self.indice.y[candidatos]]))
+        distancias = np.hypot(pantalla[:, 0] - event.x, pantalla[:, 1] - event.y)
+        cercano = int(np.argmin(distancias))
+        return candidatos[cercano] if distancias[cercano] <= self.RADIO else None
+
+    def on_draw(self, event):
+        """
+        Save the background after a full draw and draw the animated artists on top of it.
+        """
+        self.fondo = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self.ax.draw_artist(self.resaltado)
+        self.ax.draw_artist(self.anotacion)
+
+    def on_move(self, event):
+        """
+        Show the tooltip of the point under the mouse, or hide it.
+        """
+        self.mostrar_anotacion(self.punto(event))
+
+    def on_click(self, event):
+        """
+        Highlight the line of the team of the clicked point, or remove the highlight.
+        """
+        punto = self.punto(event)
+        equipo = self.equipos[punto] if punto is not None else None
+        if equipo != self.seleccionado:
+            self.seleccionado = equipo
+            if equipo is not None:
+                linea = self.lineas[equipo]
+                self.resaltado.set_data(linea.get_xdata(), linea.get_ydata())
+                self.resaltado.set_color(linea.get_color())
+            self.resaltado.set_visible(equipo is not None)
+            self.blit()
+
+    def mostrar_anotacion(self, punto):
+        """
+        Show the tooltip of a point.
+
+        Args:
+            punto (int): Index of the point, or None to hide the tooltip.
+        """
+        if punto is None:
+            if self.anotacion.get_visible():
+                self.anotacion.set_visible(False)
+                self.blit()
+            return
+        equipo, jornada, posicion = self.equipos[punto], int(self.indice.x[punto]), int(self.indice.y[punto])
+        texto = f"{equipo}\nJornada {jornada}\nPosición {posicion}"
+        if (equipo, jornada) in self.puntos:
+            texto += f"\n{self.puntos[(equipo, jornada)]} puntos"
+        if not self.anotacion.get_visible() or self.anotacion.get_text() != texto:
+            self.anotacion.xy = (jornada, posicion)
+            self.anotacion.set_text(texto)
+            self.anotacion.set_visible(True)
+            self.blit()
+
+    def blit(self):
+        """
+        Redraw only the animated artists over the saved background.
+        """
+        if self.fondo is None:
+            return
+        self.canvas.restore_region(self.fondo)
+        self.ax.draw_artist(self.resaltado)
+        self.ax.draw_artist(self.anotacion)
+        self.canvas.blit(self.ax.figure.bbox)
+
 
 class VisualizarClasificacionGrafico:
     """
@@ -64,33 +797,268 @@ class VisualizarClasificacionGrafico:
             # Create a Matplotlib figure and axis for the graph
             fig = Figure(figsize=(width / 100, height / 100), dpi=100)
             ax = fig.add_subplot(111)
-            self.df_grafico['Posicion'] = self.df_grafico['Posicion'].apply(lambda x: int(x) if pd.notnull(x) else x)
+            # Show the current ratings in the legend if the scoresheet of the league is available
+            # and the points of every team in the tooltips
+            ratings, puntos, liga = None, None, None
+            ruta_liga = self.file_path.replace('clasificacion.csv', '.csv')
+            if ruta_liga != self.file_path and os.path.isfile(ruta_liga):
+                liga = LigaVersionada(ruta_liga)
+                problemas = validar_resultados(liga.df, liga.jornadas_partidos())
+                # Without readable results and matching team names the chart is shown alone
+                if any(problema.tipo in ('formato', 'nombres') for problema in problemas):
+                    liga = None
+            if liga is not None:
+                ratings = MotorElo.desde_liga(liga, seguir=False).ratings
+                equipos, acumulados, _ = ComparativaTemporadas.historia_liga(liga)
+                puntos = {(equipo, jornada): int(acumulados[i, jornada - 1])
+                          for i, equipo in enumerate(equipos)
+                          for jornada in range(1, acumulados.shape[1] + 1) if not np.isnan(acumulados[i, jornada - 1])}
+
+            lineas = dibujar_clasificacion(ax, self.df_grafico, ratings)
+
+            # Embed the figure in the Tkinter window, with tooltips on hover and highlighting on click
+            canvas = FigureCanvasTkAgg(fig, master=self.master)
+            self.interaccion = InteraccionClasificacion(ax, lineas, self.df_grafico, puntos)
+            canvas.draw()
+            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+
+class VisualizarTemporadas:
+    """
+    A class to compare the points and positions of the teams over several seasons.
+
+    This class creates a new window where the scoresheets of several seasons are loaded once and
+    the curves of a team are plotted against those of the previous seasons.
+    """
+
+    VISTAS = ['Puntos', 'Ritmo', 'Posición', 'Posición media']
+
+    def __init__(self, master):
+        """
+        Initialize the Comparar Temporadas window.
+
+        Args:
+            master (tk.Tk or tk.Toplevel): The parent window for this interface.
+        """
+        self.master = tk.Toplevel(master)  # Create a new top-level window
+        self.master.title("Comparar Temporadas")  # Set the window title
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)  # Define the close protocol
 
-            # Count the number of teams
-            equipos_cont = sum(1 for _ in self.df_grafico.groupby('Equipo'))
+        self.comparativa = None  # Initialize the aligned seasons as None
+        self.viewTemporadas()  # Set up the interface for comparing the seasons
+
+    def on_close(self):
+        """
+        Handle the close event of the window.
 
-            # Set up a color palette for the teams
-            color_palette = plt.colormaps['tab20'].colors
+        This method brings back the main application window and closes the current window.
+        """
+        self.master.master.deiconify()  # Restore the main application window
+        self.master.destroy()  # Close the current window
 
-            # Plot each team's position by game week
-            for i, (equipo, group) in enumerate(self.df_grafico.groupby('Equipo')):
-                ax.plot(group['Jornada'], group['Posicion'], marker='o', label=equipo, color=color_palette[i % len(color_palette)])
+    def viewTemporadas(self):
+        """
+        Set up the comparison interface.
 
-            # Configure axis and layout of the graph
-            ax.invert_yaxis()  # Invert the y-axis to have the top position at the top
-            ax.set_yticks(np.arange(1, equipos_cont + 1, 1))
-            ax.set_xticks(np.arange(1, ((equipos_cont - 1) * 2) + 1, 1))
-            ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
-            ax.set_xlabel('Jornada')
+        This method asks for the scoresheets of the seasons, loads them and creates the selectors
+        of team and view, the graph and the pace table of the last season.
+        """
+        # Open file dialog to choose the CSV files, seasons are ordered by file name
+        file_paths = filedialog.askopenfilenames(filetypes=[("CSV files", "*.csv")])
+        file_paths = sorted(file_path for file_path in file_paths if not es_archivo_auxiliar(file_path))
+        if not file_paths:
+            self.on_close()
+            return
+        self.comparativa = ComparativaTemporadas.desde_archivos(file_paths)
+
+        # Selectors of the team and of the view
+        marco = tk.Frame(self.master)
+        marco.pack(side=tk.TOP, fill=tk.X)
+        tk.Label(marco, text="Equipo:").pack(side=tk.LEFT, padx=10, pady=10)
+        self.combo_equipo = ttk.Combobox(marco, values=self.comparativa.equipos, state='readonly')
+        self.combo_equipo.current(0)
+        self.combo_equipo.pack(side=tk.LEFT, padx=10, pady=10)
+        tk.Label(marco, text="Vista:").pack(side=tk.LEFT, padx=10, pady=10)
+        self.combo_vista = ttk.Combobox(marco, values=self.VISTAS, state='readonly')
+        self.combo_vista.current(0)
+        self.combo_vista.pack(side=tk.LEFT, padx=10, pady=10)
+        for combo in (self.combo_equipo, self.combo_vista):
+            combo.bind('<<ComboboxSelected>>', lambda event: self.dibujar())
+
+        # Pace of every team in the last season against the previous ones
+        texto = tk.Text(self.master, height=12, font=('Courier', 10))
+        texto.pack(side=tk.BOTTOM, fill=tk.X)
+        jornada = int(self.comparativa.jugadas()[-1])
+        texto.insert(tk.END, f"{self.comparativa.temporadas[-1]}, jornada {jornada}, frente a las temporadas "
+                             f"anteriores:\n{self.comparativa.ritmo().to_string(index=False)}")
+        texto.config(state=tk.DISABLED)
+
+        # Create a Matplotlib figure, it is redrawn from the loaded seasons on every selection
+        self.fig = Figure(figsize=(10, 6), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.master)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.dibujar()
+
+    def dibujar(self):
+        """
+        Plot the selected view of the selected team.
+        """
+        equipo, vista = self.combo_equipo.get(), self.combo_vista.get()
+        comparativa = self.comparativa
+        self.fig.clear()
+        ax = self.fig.add_subplot(111)
+
+        if vista in ('Puntos', 'Posición'):
+            # One curve per season, the last one highlighted
+            serie = comparativa.serie(equipo, 'puntos' if vista == 'Puntos' else 'posiciones')
+            for i, temporada in enumerate(serie.columns):
+                ultima = i == len(serie.columns) - 1
+                ax.plot(serie.index, serie[temporada], marker='o' if ultima else None, label=temporada,
+                        linewidth=3 if ultima else 1, alpha=1 if ultima else 0.6)
+            ax.set_ylabel(vista)
+            if vista == 'Posición':
+                ax.invert_yaxis()
+        elif vista == 'Ritmo':
+            # Points of the last season within the range of the previous ones
+            serie = comparativa.serie(equipo, 'puntos')
+            actual, previas = serie.iloc[:, -1], serie.iloc[:, :-1]
+            if not previas.empty:
+                ax.fill_between(serie.index, previas.min(axis=1), previas.max(axis=1), alpha=0.3,
+                                label='Mejor y peor anteriores')
+                ax.plot(serie.index, previas.mean(axis=1), linestyle='--', label='Media anteriores')
+            ax.plot(serie.index, actual, marker='o', linewidth=3, label=serie.columns[-1])
+            ax.set_ylabel('Puntos')
+        else:
+            # Average position of the team over all the seasons and its range
+            serie = comparativa.serie(equipo, 'posiciones')
+            ax.fill_between(serie.index, serie.min(axis=1), serie.max(axis=1), alpha=0.3, label='Mejor y peor')
+            ax.plot(serie.index, serie.mean(axis=1), marker='o', label='Media')
             ax.set_ylabel('Posición')
-            ax.set_title('Evolución de la Clasificación por Jornada')
-            ax.grid(True)
-            ax.set_facecolor('black')
+            ax.invert_yaxis()
+
+        ax.set_xlabel('Jornada')
+        ax.set_title(f"{equipo}: {vista.lower()} por jornada")
+        ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
+        ax.grid(True)
+        self.fig.tight_layout()
+        self.canvas.draw()
+
+
+class VisualizarJornada:
+    """
+    A class to examine how the results of each game week moved the standings.
+
+    This class creates a new window with the results of a game week, the movement and the gaps of
+    both teams after each of them, and the standings after the game week.
+    """
+
+    def __init__(self, master):
+        """
+        Initialize the Analizar Jornada window.
+
+        Args:
+            master (tk.Tk or tk.Toplevel): The parent window for this interface.
+        """
+        self.master = tk.Toplevel(master)  # Create a new top-level window
+        self.master.title("Analizar Jornada")  # Set the window title
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)  # Define the close protocol
+
+        self.impacto = None  # Initialize the effect of the game weeks as None
+        self.viewJornada()  # Set up the interface for examining the game weeks
+
+    def on_close(self):
+        """
+        Handle the close event of the window.
+
+        This method brings back the main application window and closes the current window.
+        """
+        self.master.master.deiconify()  # Restore the main application window
+        self.master.destroy()  # Close the current window
+
+    def viewJornada(self):
+        """
+        Set up the game week interface.
+
+        This method asks for the scoresheet, computes the effect of every game week once and
+        creates the game week selector and the tables of results and standings.
+        """
+        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+        if not file_path:
+            self.on_close()
+            return
+        liga = LigaVersionada(file_path)
+        if not comprobar_liga(liga):
+            self.on_close()
+            return
+        self.impacto = ImpactoJornadas(HistoricoJornadas.desde_liga(liga, seguir=False))
+        if not self.impacto.jornadas:
+            messagebox.showinfo("Analizar Jornada", "La liga no tiene resultados con jornada.")
+            self.on_close()
+            return
+
+        # Game week selector, with buttons for the previous and the next one
+        marco = tk.Frame(self.master)
+        marco.pack(side=tk.TOP, fill=tk.X)
+        tk.Button(marco, text="◀", command=lambda: self.mover(-1)).pack(side=tk.LEFT, padx=10, pady=10)
+        tk.Label(marco, text="Jornada:").pack(side=tk.LEFT, pady=10)
+        self.combo_jornada = ttk.Combobox(marco, values=list(range(1, self.impacto.jornadas + 1)), state='readonly',
+                                          width=5)
+        self.combo_jornada.current(self.impacto.jornadas - 1)
+        self.combo_jornada.bind('<<ComboboxSelected>>', lambda event: self.mostrar())
+        self.combo_jornada.pack(side=tk.LEFT, padx=10, pady=10)
+        tk.Button(marco, text="▶", command=lambda: self.mover(1)).pack(side=tk.LEFT, padx=10, pady=10)
+
+        tablas = self.impacto.jornada(1)
+        self.arbol_resultados = self.crear_arbol(list(tablas[1].columns), height=10)
+        self.arbol_clasificacion = self.crear_arbol(['POS'] + list(tablas[0].columns), height=len(self.impacto.equipos))
+        self.mostrar()
+
+    def crear_arbol(self, columnas, height):
+        """
+        Create a table with one column per field.
+
+        Args:
+            columnas (list): The names of the columns.
+            height (int): Number of visible rows.
+
+        Returns:
+            ttk.Treeview: The table, packed in the window.
+        """
+        arbol = ttk.Treeview(self.master, columns=columnas, show='headings', height=height)
+        for columna in columnas:
+            arbol.heading(columna, text=columna)
+            arbol.column(columna, width=90, anchor=tk.CENTER)
+        for etiqueta, color in TablaClasificacion.COLORES.items():
+            arbol.tag_configure(etiqueta, background=color)
+        arbol.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=5)
+        return arbol
+
+    def mover(self, paso):
+        """
+        Show the previous or the next game week.
+
+        Args:
+            paso (int): -1 for the previous game week, 1 for the next one.
+        """
+        jornada = int(self.combo_jornada.get()) + paso
+        if 1 <= jornada <= self.impacto.jornadas:
+            self.combo_jornada.set(jornada)
+            self.mostrar()
+
+    def mostrar(self):
+        """
+        Fill the tables with the selected game week, from the effects computed when loading.
+        """
+        equipos, resultados = self.impacto.jornada(int(self.combo_jornada.get()))
+        for arbol, tabla in ((self.arbol_resultados, resultados), (self.arbol_clasificacion, equipos.reset_index())):
+            arbol.delete(*arbol.get_children())
+            for fila in tabla.itertuples(index=False):
+                valores = ['' if pd.isna(valor) else valor for valor in fila]
+                # Colour the teams of the standings that moved up or down
+                movimiento = getattr(fila, 'MOV', pd.NA)
+                etiquetas = () if pd.isna(movimiento) or not movimiento else ('sube',) if movimiento > 0 else ('baja',)
+                arbol.insert('', tk.END, values=valores, tags=etiquetas)
 
-            # Embed the figure in the Tkinter window
-            canvas = FigureCanvasTkAgg(fig, master=self.master)
-            canvas.draw()
-            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
 class CrearLiga:
     """
@@ -171,6 +1139,10 @@ class CrearLiga:
 
             self.df_liga.to_csv(liga_file_name)  # Save the league DataFrame to CSV
             self.historica.to_csv(historica_file_name)  # Save the standings DataFrame to CSV
+
+            # Remove the log of a previous league with the same name, it would be replayed on the new one
+            if os.path.exists(ruta_registro(liga_file_name)):
+                os.remove(ruta_registro(liga_file_name))
         else:
             messagebox.showwarning("Advertencia", "Por favor, introduce un nombre para el archivo de la liga.")
 
@@ -195,7 +1167,12 @@ class ActualizarResultados:
         self.master.protocol("WM_DELETE_WINDOW", self.on_close)  # Define the close protocol
 
         self.file_name = ""  # Initialize the file name as an empty string
+        self.liga = None  # Initialize the versioned league as None
         self.df = None  # Initialize the DataFrame as None
+        self.elo = None  # Initialize the rating engine as None
+        self.matrices = None  # Initialize the standings and head-to-head matrices as None
+        self.deshechos = []  # Result changes that can be undone, the last one at the end
+        self.rehechos = []  # Undone result changes that can be redone, the last one at the end
 
         self.setup_widgets()  # Set up the interface widgets
 
@@ -219,7 +1196,13 @@ class ActualizarResultados:
         self.file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if self.file_path:
             self.file_name = self.file_path.split('/')[-1].replace('.csv', '')  # Extract the file name
-            self.df = pd.read_csv(self.file_path, index_col=0)  # Load the CSV file into a pandas DataFrame
+            self.liga = LigaVersionada(self.file_path)  # Load the CSV file and its logged updates
+            self.df = self.liga.df
+            if not comprobar_liga(self.liga):
+                self.on_close()
+                return
+            self.elo = MotorElo.desde_liga(self.liga)  # Ratings kept up to date with every posted result
+            self.matrices = MatricesLiga.desde_liga(self.liga)  # Standings and head-to-head records
 
         # Create and arrange interface widgets
         label_local = tk.Label(self.master, text="Local:")
@@ -241,89 +1224,175 @@ class ActualizarResultados:
         self.entrada_resultado.insert(0, '2-1')  # Default value for the result entry
         self.entrada_resultado.grid(row=2, column=1, padx=10, pady=10)
 
-        self.boton_actualizar = tk.Button(self.master, text="Actualizar", command=self.updateCSV)
-        self.boton_actualizar.grid(row=3, column=0, columnspan=2, padx=30, pady=30)
+        label_jornada = tk.Label(self.master, text="Jornada:")
+        label_jornada.grid(row=3, column=0, pady=10)
+
+        # An empty game week means the first one in which neither team has played yet
+        jornadas = list(range(1, (len(self.df.index) - 1) * 2 + 1))
+        self.combo_jornada = ttk.Combobox(self.master, values=jornadas)
+        self.combo_jornada.grid(row=3, column=1, padx=10, pady=10)
+
+        self.boton_actualizar = tk.Button(self.master, text="Actualizar", command=self.updateCSV)
+        self.boton_actualizar.grid(row=4, column=0, columnspan=2, padx=30, pady=30)
 
         self.nombre_archivo_label = tk.Label(self.master, text=f"Archivo: {self.file_name}")
-        self.nombre_archivo_label.grid(row=4, column=0, columnspan=2, sticky='w')
+        self.nombre_archivo_label.grid(row=5, column=0, columnspan=2, sticky='w')
+
+        self.elo_label = tk.Label(self.master, text="")  # Rating change of the last posted result
+        self.elo_label.grid(row=6, column=0, columnspan=2, sticky='w')
+
+        # Buttons to undo and redo the result changes of this session
+        marco_deshacer = tk.Frame(self.master)
+        marco_deshacer.grid(row=7, column=0, columnspan=2, pady=10)
+        self.boton_deshacer = tk.Button(marco_deshacer, text="Deshacer", command=self.deshacer, state=tk.DISABLED)
+        self.boton_deshacer.pack(side=tk.LEFT, padx=10)
+        self.boton_rehacer = tk.Button(marco_deshacer, text="Rehacer", command=self.rehacer, state=tk.DISABLED)
+        self.boton_rehacer.pack(side=tk.LEFT, padx=10)
+        self.master.bind('<Control-z>', lambda event: self.deshacer())
+        self.master.bind('<Control-y>', lambda event: self.rehacer())
 
     def updateCSV(self):
         """
         Update the results in the CSV file.
 
-        This method reads the selected match results and updates them in the DataFrame,
-        and then writes the updated DataFrame back to the CSV file.
+        This method reads the selected match result and posts it to the log of the league,
+        merging the results posted meanwhile by other users. The result is rejected if another
+        user posted a different score for the same match.
         """
         local = self.combo_local.get()  # Get the home team
         visitante = self.combo_visitante.get()  # Get the away team
         resultado = self.entrada_resultado.get()  # Get the match result
+        jornada = self.combo_jornada.get().strip() or None  # Get the game week, if given
+
+        if jornada is not None and not jornada.isdigit():
+            messagebox.showwarning("Advertencia", "La jornada debe ser un número.")
+            return
+
+        # An empty result removes the match, any other must be a valid score
+        if resultado.strip() and re.match(PATRON_RESULTADO, resultado) is None:
+            messagebox.showwarning("Advertencia", "El resultado debe tener el formato X-Y.")
+            return
+        if resultado.strip() and max(goles_resultado(resultado)) > GOLES_MAXIMOS:
+            messagebox.showwarning("Advertencia", f"Un equipo no puede marcar más de {GOLES_MAXIMOS} goles.")
+            return
+
+        # Post the result if the necessary data is present
+        if self.liga is not None and local and visitante:
+            entrada = self.publicar(local, visitante, resultado, jornada)
+            if entrada is False:
+                return
+            self.entrada_resultado.delete(0, tk.END)  # Clear the result entry field
 
-        # Update the DataFrame and save it to the CSV file if the necessary data is present
-        if self.df is not None and local and visitante:
-            if self.df[visitante].dtype != 'object':
-                self.df[visitante] = self.df[visitante].astype('object')
+            # A new change can be undone, and the changes undone before can no longer be redone
+            if entrada is not None:
+                self.deshechos.append(entrada)
+                self.rehechos.clear()
+                self.actualizar_botones()
 
-            self.df.at[local, visitante] = str(resultado)
-            self.df.to_csv(self.file_path)
-            self.entrada_resultado.delete(0, tk.END)  # Clear the result entry field
+    def publicar(self, local, visitante, resultado, jornada, esperado=None):
+        """
+        Post a result to the league and show its effect on the ratings and points of both teams.
+
+        Args:
+            local (str): Home team.
+            visitante (str): Away team.
+            resultado (str): Score in 'X-Y' format, or an empty string to remove the result.
+            jornada (int): Game week of the match, or None.
+            esperado (str, optional): Score the match must still have, see LigaVersionada.publicar.
+
+        Returns:
+            dict: The log entry written, None if the match already had that result, or False if
+                another user posted a different score for the same match or changed the expected one.
+        """
+        ratings = self.elo.rating(local), self.elo.rating(visitante)
+        try:
+            entrada = self.liga.publicar(local, visitante, resultado, jornada, esperado)
+        except ConflictoResultado as error:
+            messagebox.showerror("Conflicto", str(error))
+            return False
+
+        # Show how the ratings and points of both teams moved
+        puntos = self.matrices.puntos
+        self.elo_label.config(text=f"ELO: {local} {self.elo.rating(local):.0f} "
+                                   f"({self.elo.rating(local) - ratings[0]:+.0f}), "
+                                   f"{visitante} {self.elo.rating(visitante):.0f} "
+                                   f"({self.elo.rating(visitante) - ratings[1]:+.0f}) | "
+                                   f"PTS: {local} {puntos[self.matrices.indices[local]]}, "
+                                   f"{visitante} {puntos[self.matrices.indices[visitante]]}")
+        return entrada
+
+    def deshacer(self):
+        """
+        Undo the last result change of the session.
+
+        The previous score is posted again as a new change, so the scoresheet, the standings,
+        the head-to-head records and the ratings are reversed incrementally, and the other users
+        see it too. It is rejected if another user changed that match afterwards.
+        """
+        if not self.deshechos:
+            return
+        entrada = self.deshechos[-1]
+        if self.publicar(entrada['Local'], entrada['Visitante'], entrada['Anterior'],
+                         entrada['JornadaAnterior'], esperado=entrada['Resultado']) is False:
+            return
+        self.rehechos.append(self.deshechos.pop())
+        self.actualizar_botones()
+
+    def rehacer(self):
+        """
+        Redo the last undone result change. It is rejected if another user changed that match
+        after it was undone.
+        """
+        if not self.rehechos:
+            return
+        entrada = self.rehechos[-1]
+        if self.publicar(entrada['Local'], entrada['Visitante'], entrada['Resultado'],
+                         entrada['Jornada'], esperado=entrada['Anterior']) is False:
+            return
+        self.deshechos.append(self.rehechos.pop())
+        self.actualizar_botones()
+
+    def actualizar_botones(self):
+        """
+        Enable the undo and redo buttons only when there is something to undo or redo.
+        """
+        self.boton_deshacer.config(state=tk.NORMAL if self.deshechos else tk.DISABLED)
+        self.boton_rehacer.config(state=tk.NORMAL if self.rehechos else tk.DISABLED)
 
 
-class VisualizarClasificacion:
+class Clasificacion:
     """
-    A class for visualizing and managing the league classification.
+    A class to compute the league classification from a scoresheet.
 
-    This class creates a window for viewing and updating the league standings based on match results.
-    It provides functionalities to create and update the classification and handle tie-breaking scenarios.
+    This class holds the standings calculation and the tie-breaking rules without any interface,
+    so the same logic can be used by the classification window and by headless services.
     """
 
-    def __init__(self, master):
+    def __init__(self, df=None):
         """
-        Initialize the Visualizar Clasificacion window.
+        Initialize the classification and compute it if a scoresheet is given.
 
         Args:
-            master (tk.Tk or tk.Toplevel): The parent window for this interface.
+            df (DataFrame, optional): The N x N scoresheet with results in 'X-Y' format.
         """
-        self.master = tk.Toplevel(master)  # Create a new top-level window
-        self.master.title("Visualizar Clasificacion")  # Set the window title
-        self.master.protocol("WM_DELETE_WINDOW", self.on_close)  # Define the close protocol
-
         # Initialize data structures for classification
-        self.df = None
+        self.df = df
         self.clasificacion = None
-        self.file_path = ""
-        self.file_name = ""
         self.rows = 0
         self.df_empates = None
         self.df_empates_par = None
         self.df_empates_grupo = None
 
-        # Create and update the classification view
-        self.createClasificacion()
-        self.updateClasificacion()
-
-    def on_close(self):
-        """
-        Handle the close event of the window.
-
-        This method brings back the main application window and closes the current window.
-        """
-        self.master.master.deiconify()  # Restore the main application window
-        self.master.destroy()  # Close the current window
+        if self.df is not None:
+            self.iniciarClasificacion()
+            self.calcularClasificacion()
 
-    def createClasificacion(self):
+    def iniciarClasificacion(self):
         """
-        Create the initial league classification structure.
+        Initialize the classification DataFrame for the teams of the scoresheet.
 
-        This method sets up the initial DataFrame for the league classification by loading match results from a CSV file.
-        It initializes a DataFrame to store teams' standings based on various statistics like points, goals for, goals against, etc.
+        This method initializes a DataFrame to store teams' standings based on various statistics like points, goals for, goals against, etc.
         """
-        # Open a file dialog to select a CSV file containing match results
-        self.file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
-        if self.file_path:
-            # Extract the file name from the path and load the CSV file into a DataFrame
-            self.file_name = self.file_path.split('/')[-1].replace('.csv', '')
-            self.df = pd.read_csv(self.file_path, index_col=0)
-
         # Determine the number of teams (rows) from the loaded DataFrame
         self.rows = self.df.shape[0]
 
@@ -339,32 +1408,14 @@ class VisualizarClasificacion:
         self.clasificacion.fillna(0, inplace=True)
         self.clasificacion['DIF'] = self.clasificacion['GF'] - self.clasificacion['GC']
 
-    def updateClasificacion(self):
+    def calcularClasificacion(self):
         """
-        Update the league classification with match results.
+        Calculate the league classification from the match results.
 
         This method processes the results of football matches from the loaded DataFrame
         and updates the league standings accordingly. It handles the calculation of points,
-        goals for, goals against, and updates the standings based on match outcomes.
+        goals for, goals against, and the tie-breaking rules between teams on equal points.
         """
-        # Set the window size and position
-        screen_width = self.master.winfo_screenwidth()
-        screen_height = self.master.winfo_screenheight()
-        width = screen_width // 2
-        height = screen_height // 2
-        self.master.geometry(f'{width}x{height}')
-        x_left = (screen_width - width) // 2
-        y_top = (screen_height - height) // 2
-        self.master.geometry(f'+{x_left}+{y_top}')
-
-        # Create and position the text widget for displaying the classification
-        self.texto_clasificacion = tk.Text(self.master, height=height, width=width, wrap='none')
-        self.texto_clasificacion.place(x=10, y=10, width=width - 20, height=height - 60)
-
-        # Create and position the 'Guardar clasificacion' button
-        self.boton_historica = tk.Button(self.master, text="Guardar clasificacion", command=self.guardar_historica)
-        self.boton_historica.place(x=10, y=height - 50, width=width - 20, height=30)
-
         # Process match results to update team standings
         self.equipos = self.clasificacion['EQUIPO'].tolist()
         self.combinaciones = list(itertools.combinations(self.equipos, 2))
@@ -456,14 +1507,6 @@ class VisualizarClasificacion:
             self.desempate_par()  # Handle tie-breaking for pairs of teams
             self.desempate_grupos()  # Handle tie-breaking for groups of teams
 
-        # If a file path is set, display the updated classification in the text widget
-        if self.file_path:
-            self.file_name = self.file_path.split('/')[-1].replace('.csv', '')
-            self.texto_clasificacion.config(state=tk.NORMAL)
-            self.texto_clasificacion.delete('1.0', tk.END)
-            self.texto_clasificacion.insert(tk.END, self.clasificacion.to_string())
-            self.texto_clasificacion.config(state=tk.DISABLED)
-
     def crear_dataframe_empates(self):
         """
         Create DataFrames to manage teams with tied points.
@@ -803,47 +1846,2349 @@ class VisualizarClasificacion:
                     else:
                         self.clasificacion.at[posicion, columna] = equipo_stats[columna]
 
-    def updateGA(self, equipo1, equipo2, average):
-        # Check if the goal average is positive
-        if average > 0:
-            # Find the indices of the two teams in the main classification
-            indice_1 = self.clasificacion[self.clasificacion['EQUIPO'] == equipo1].index[0]
-            indice_2 = self.clasificacion[self.clasificacion['EQUIPO'] == equipo2].index[0]
-            # Check if the team with higher goal average should be moved up in the classification
-            if indice_1 < indice_2:
-                return
-            # Swap the positions of the two teams in the classification
-            a, b = self.clasificacion.iloc[indice_1 - 1].copy(), self.clasificacion.iloc[indice_2 - 1].copy()
-            self.clasificacion.iloc[indice_1 - 1], self.clasificacion.iloc[indice_2 - 1] = b, a
+    def updateGA(self, equipo1, equipo2, average):
+        # Check if the goal average is positive
+        if average > 0:
+            # Find the indices of the two teams in the main classification
+            indice_1 = self.clasificacion[self.clasificacion['EQUIPO'] == equipo1].index[0]
+            indice_2 = self.clasificacion[self.clasificacion['EQUIPO'] == equipo2].index[0]
+            # Check if the team with higher goal average should be moved up in the classification
+            if indice_1 < indice_2:
+                return
+            # Swap the positions of the two teams in the classification
+            a, b = self.clasificacion.iloc[indice_1 - 1].copy(), self.clasificacion.iloc[indice_2 - 1].copy()
+            self.clasificacion.iloc[indice_1 - 1], self.clasificacion.iloc[indice_2 - 1] = b, a
+
+        # Check if the goal average is negative
+        elif average < 0:
+            # Find the indices of the two teams in the main classification
+            indice_2 = self.clasificacion[self.clasificacion['EQUIPO'] == equipo1].index[0]
+            indice_1 = self.clasificacion[self.clasificacion['EQUIPO'] == equipo2].index[0]
+            # Check if the team with higher goal average should be moved up in the classification
+            if indice_1 < indice_2:
+                return
+            # Swap the positions of the two teams in the classification
+            a, b = self.clasificacion.iloc[indice_1 - 1].copy(), self.clasificacion.iloc[indice_2 - 1].copy()
+            self.clasificacion.iloc[indice_1 - 1], self.clasificacion.iloc[indice_2 - 1] = b, a
+
+        # Handle the case when goal average is zero
+        else:
+            self.equiposTemp = self.par['EQUIPO'].tolist()
+            self.par = self.par.sort_values(by=['PTS', 'DIF', 'GF', 'EQUIPO'],
+                                            ascending=[False, False, False, True])
+            posicons_empatades = []
+            for i in self.equiposTemp:
+                posicion = self.clasificacion.index[self.clasificacion['EQUIPO'] == i].tolist()[0]
+                posicons_empatades.append(posicion)
+            equipos_reordenados = self.par['EQUIPO'].tolist()
+            for i, posicion in enumerate(posicons_empatades):
+                equipo = equipos_reordenados[i]
+                equipo_stats = self.par[self.par['EQUIPO'] == equipo].iloc[0]
+                # Update each statistic for the team in the main classification
+                for columna in ['EQUIPO', 'PJ', 'PG', 'PE', 'PP', 'GF', 'GC', 'DIF', 'PTS']:
+                    self.clasificacion.at[posicion, columna] = equipo_stats[columna]
+
+
+PATRON_RESULTADO = r'^\s*(\d+)\s*-\s*(\d+)\s*$'  # A result in 'X-Y' format
+GOLES_MAXIMOS = 30  # Goals above this value in a match are considered a typing mistake
+
+ProblemaResultado = namedtuple('ProblemaResultado', ['tipo', 'local', 'visitante', 'mensaje'])
+
+
+def validar_resultados(df, jornadas=None, goles_maximos=GOLES_MAXIMOS):
+    """
+    Check a whole scoresheet in one vectorized pass and report every problem found.
+
+    The checks are: results not in 'X-Y' format, goals above the maximum, results on the
+    diagonal, team names that differ between rows and columns, are repeated or are not
+    written in upper case without surrounding spaces (they would not match in the head-to-head
+    records), teams with more matches than a double round-robin allows and, when the game
+    weeks are given, teams with more than one match in the same game week and pairs of teams
+    with both matches in the same game week, likely one match entered in both orientations.
+
+    Args:
+        df (DataFrame): The N x N scoresheet.
+        jornadas (dict, optional): Game week by (local, visitante) pair.
+        goles_maximos (int): Maximum number of goals of a team in a match.
+
+    Returns:
+        list: ProblemaResultado tuples with the type of problem, the row and column of the cell
+            (None when the problem is not about a single cell) and a description.
+    """
+    problemas = []
+    equipos_filas, equipos_columnas = df.index.astype(str), df.columns.astype(str)
+
+    # Team names of the rows and columns
+    for equipo in equipos_filas.difference(equipos_columnas):
+        problemas.append(ProblemaResultado('nombres', equipo, None, f"{equipo} está en las filas pero no en las columnas"))
+    for equipo in equipos_columnas.difference(equipos_filas):
+        problemas.append(ProblemaResultado('nombres', None, equipo, f"{equipo} está en las columnas pero no en las filas"))
+    for equipo in equipos_filas[equipos_filas.duplicated()].unique():
+        problemas.append(ProblemaResultado('nombres', equipo, None, f"{equipo} está repetido en las filas"))
+    for equipo in equipos_columnas[equipos_columnas.duplicated()].unique():
+        problemas.append(ProblemaResultado('nombres', None, equipo, f"{equipo} está repetido en las columnas"))
+    normalizados = equipos_filas.str.strip().str.upper()
+    for equipo in equipos_filas[normalizados != equipos_filas]:
+        problemas.append(ProblemaResultado('nombres', equipo, None,
+                                           f"{equipo!r} debería escribirse {equipo.strip().upper()!r}"))
+
+    # Every non-empty cell as one row of a long table
+    presentes = df.notna().to_numpy()
+    filas, columnas = np.nonzero(presentes)
+    celdas = pd.DataFrame({'local': equipos_filas[filas], 'visitante': equipos_columnas[columnas],
+                           'valor': pd.Series(df.to_numpy()[filas, columnas]).astype(str)})
+    goles = celdas['valor'].str.extract(PATRON_RESULTADO).astype(float)
+    formato = goles[0].isna()
+    fuera = ~formato & ((goles[0] > goles_maximos) | (goles[1] > goles_maximos))
+    diagonal = (celdas['local'] == celdas['visitante']).to_numpy()
+
+    for local, visitante, valor in celdas.loc[formato, ['local', 'visitante', 'valor']].itertuples(index=False):
+        problemas.append(ProblemaResultado('formato', local, visitante, f"{valor!r} no tiene el formato X-Y"))
+    for local, visitante, valor in celdas.loc[fuera, ['local', 'visitante', 'valor']].itertuples(index=False):
+        problemas.append(ProblemaResultado('goles', local, visitante, f"{valor} supera los {goles_maximos} goles"))
+    for local, visitante, valor in celdas.loc[diagonal, ['local', 'visitante', 'valor']].itertuples(index=False):
+        problemas.append(ProblemaResultado('diagonal', local, visitante, f"{local} no puede jugar contra sí mismo ({valor})"))
+
+    # Matches played by each team, counting it as home and away team
+    jugados = pd.concat([celdas['local'], celdas['visitante']]).value_counts()
+    maximo = (len(df.index) - 1) * 2
+    for equipo, partidos in jugados[jugados > maximo].items():
+        problemas.append(ProblemaResultado('partidos', equipo, None,
+                                           f"{equipo} tiene {partidos} partidos y el máximo es {maximo}"))
+
+    # Teams with more than one match in the same game week
+    if jornadas:
+        celdas['jornada'] = [jornadas.get(partido) for partido in zip(df.index[filas], df.columns[columnas])]
+        por_jornada = pd.concat([celdas[['local', 'jornada']].rename(columns={'local': 'equipo'}),
+                                 celdas[['visitante', 'jornada']].rename(columns={'visitante': 'equipo'})]).dropna()
+        repetidos = por_jornada.value_counts()
+        for (equipo, jornada), partidos in repetidos[repetidos > 1].items():
+            problemas.append(ProblemaResultado('jornada', equipo, None,
+                                               f"{equipo} tiene {partidos} partidos en la jornada {int(jornada)}"))
+
+        # Both cells of a pair in the same game week are one match entered in both orientations.
+        # The head-to-head records would count it as the two legs of the pair
+        con_jornada = celdas.dropna(subset=['jornada'])
+        dobles = con_jornada.merge(con_jornada.rename(columns={'local': 'visitante', 'visitante': 'local'}),
+                                   on=['local', 'visitante', 'jornada'], suffixes=('', '_inverso'))
+        dobles = dobles[dobles['local'] < dobles['visitante']]
+        for local, visitante, valor, jornada, inverso in dobles[['local', 'visitante', 'valor', 'jornada',
+                                                                'valor_inverso']].itertuples(index=False):
+            problemas.append(ProblemaResultado(
+                'orientacion', local, visitante,
+                f"{local} - {visitante} ({valor}) y {visitante} - {local} ({inverso}) son de la jornada "
+                f"{int(jornada)}: puede ser el mismo partido en las dos orientaciones"))
+    return problemas
+
+
+def informe_validacion(problemas):
+    """
+    Format the problems found in a scoresheet as a readable report.
+
+    Args:
+        problemas (list): ProblemaResultado tuples.
+
+    Returns:
+        str: One line per problem, with its type and cell coordinates.
+    """
+    lineas = []
+    for problema in problemas:
+        celda = ', '.join(str(parte) for parte in (problema.local, problema.visitante) if parte is not None)
+        lineas.append(f"[{problema.tipo}] ({celda}): {problema.mensaje}")
+    return '\n'.join(lineas)
+
+
+def comprobar_liga(liga):
+    """
+    Validate a loaded league and warn the user about the problems found.
+
+    Args:
+        liga (LigaVersionada): The loaded league.
+
+    Returns:
+        bool: False if some result cannot be read and the league cannot be used, True otherwise.
+    """
+    problemas = validar_resultados(liga.df, liga.jornadas_partidos())
+    if not problemas:
+        return True
+
+    # Show the first problems only, the report of a badly damaged file could fill the screen
+    informe = informe_validacion(problemas[:20])
+    if len(problemas) > 20:
+        informe += f"\n... y {len(problemas) - 20} problemas más"
+    if any(problema.tipo == 'formato' for problema in problemas):
+        messagebox.showerror("Resultados no válidos", f"No se puede abrir la liga:\n{informe}")
+        return False
+    messagebox.showwarning("Advertencia", f"Se han encontrado problemas en la liga:\n{informe}")
+    return True
+
+
+def goles_resultado(resultado):
+    """
+    Split a result in 'X-Y' format into the goals of each team.
+
+    Args:
+        resultado (str): The result.
+
+    Returns:
+        tuple: Goals of the home team and goals of the away team.
+    """
+    goles_local, goles_visitante = map(int, str(resultado).split("-"))
+    return goles_local, goles_visitante
+
+
+class EstadisticasLiga:
+    """
+    Materialized statistics of a league, kept up to date one result at a time.
+
+    It keeps the home-only and away-only tables, the form over the last five matches, the current
+    unbeaten and winless streaks and the clean sheets of every team. Posting a result only
+    updates the two teams involved, and every view is read in O(teams).
+    """
+
+    COLUMNAS = ['PJ', 'PG', 'PE', 'PP', 'GF', 'GC', 'PTS']
+
+    def __init__(self, equipos):
+        """
+        Initialize empty statistics.
+
+        Args:
+            equipos (list): Names of the teams.
+        """
+        self.equipos = list(equipos)
+        self.indices = {equipo: i for i, equipo in enumerate(self.equipos)}
+        self.local = np.zeros((len(self.equipos), len(self.COLUMNAS)), dtype=int)  # Home-only totals
+        self.visitante = np.zeros((len(self.equipos), len(self.COLUMNAS)), dtype=int)  # Away-only totals
+        self.porterias = np.zeros(len(self.equipos), dtype=int)  # Matches without conceding
+        self.forma = [''] * len(self.equipos)  # Last five outcomes, oldest first
+        self.invicto = np.zeros(len(self.equipos), dtype=int)  # Current run of matches without losing
+        self.sin_ganar = np.zeros(len(self.equipos), dtype=int)  # Current run of matches without winning
+        self.resultados = {}  # (local, visitante) -> (goles_local, goles_visitante, jornada)
+        self.partidos = {equipo: set() for equipo in self.equipos}  # Matches counted for each team
+
+    @classmethod
+    def desde_liga(cls, liga, seguir=True):
+        """
+        Build the statistics of a versioned league and keep them updated with its new results.
+
+        Args:
+            liga (LigaVersionada): The league.
+            seguir (bool): Whether to follow the results applied by liga.refrescar afterwards.
+
+        Returns:
+            EstadisticasLiga: The statistics.
+        """
+        estadisticas = cls(liga.df.index)
+        for (local, visitante), jornada in liga.jornadas_partidos().items():
+            estadisticas.fijar(local, visitante, liga.df.at[local, visitante], jornada)
+        if seguir:
+            liga.suscribir(estadisticas.aplicar_entrada)
+        return estadisticas
+
+    def aplicar_entrada(self, entrada):
+        """
+        Apply an entry of the log of result updates.
+
+        Args:
+            entrada (dict): The log entry.
+        """
+        jornada = int(entrada['Jornada']) if entrada['Jornada'] else None
+        self.fijar(entrada['Local'], entrada['Visitante'], entrada['Resultado'] or None, jornada)
+
+    def fijar(self, local, visitante, resultado, jornada=None):
+        """
+        Set, change or remove the result of a match.
+
+        Args:
+            local (str): Home team.
+            visitante (str): Away team.
+            resultado (str): Score in 'X-Y' format, or None to remove the result.
+            jornada (int, optional): Game week of the match, used to order the form and streaks.
+                By default, after every other match.
+        """
+        partido = (local, visitante)
+        if partido in self.resultados:
+            self._sumar(partido, *self.resultados.pop(partido)[:2], signo=-1)
+            self.partidos[local].discard(partido)
+            self.partidos[visitante].discard(partido)
+
+        if resultado is not None and pd.notna(resultado):
+            goles_local, goles_visitante = goles_resultado(resultado)
+            if jornada is None:
+                jornada = max((datos[2] for datos in self.resultados.values()), default=0) + 1
+            self.resultados[partido] = (goles_local, goles_visitante, jornada)
+            self._sumar(partido, goles_local, goles_visitante, signo=1)
+            self.partidos[local].add(partido)
+            self.partidos[visitante].add(partido)
+
+        self._actualizar_rachas(local)
+        self._actualizar_rachas(visitante)
+
+    def _sumar(self, partido, goles_local, goles_visitante, signo):
+        """
+        Add (signo=1) or subtract (signo=-1) a result to the home and away totals.
+        """
+        local, visitante = self.indices[partido[0]], self.indices[partido[1]]
+        victoria_local, empate = goles_local > goles_visitante, goles_local == goles_visitante
+        victoria_visitante = goles_local < goles_visitante
+        self.local[local] += signo * np.array([1, victoria_local, empate, victoria_visitante,
+                                               goles_local, goles_visitante, 3 * victoria_local + empate])
+        self.visitante[visitante] += signo * np.array([1, victoria_visitante, empate, victoria_local,
+                                                       goles_visitante, goles_local, 3 * victoria_visitante + empate])
+        self.porterias[local] += signo * (goles_visitante == 0)
+        self.porterias[visitante] += signo * (goles_local == 0)
+
+    def _actualizar_rachas(self, equipo):
+        """
+        Recompute the form and the current streaks of a team from its own matches.
+        """
+        desenlaces = []
+        for partido in sorted(self.partidos[equipo], key=lambda partido: self.resultados[partido][2]):
+            goles_local, goles_visitante, _ = self.resultados[partido]
+            propios, ajenos = (goles_local, goles_visitante) if partido[0] == equipo else (goles_visitante, goles_local)
+            desenlaces.append('G' if propios > ajenos else 'E' if propios == ajenos else 'P')
+
+        indice = self.indices[equipo]
+        self.forma[indice] = ''.join(desenlaces[-5:])
+        self.invicto[indice] = self._racha(desenlaces, 'GE')
+        self.sin_ganar[indice] = self._racha(desenlaces, 'EP')
+
+    @staticmethod
+    def _racha(desenlaces, validos):
+        """
+        Count the outcomes at the end of a sequence that are all among the valid ones.
+        """
+        racha = 0
+        for desenlace in reversed(desenlaces):
+            if desenlace not in validos:
+                break
+            racha += 1
+        return racha
+
+    def _tabla(self, totales):
+        """
+        Build a ranked table from a matrix of totals.
+        """
+        tabla = pd.DataFrame(totales, columns=self.COLUMNAS)
+        tabla.insert(0, 'EQUIPO', self.equipos)
+        tabla.insert(7, 'DIF', tabla['GF'] - tabla['GC'])
+        tabla = tabla.sort_values(by=['PTS', 'DIF', 'GF', 'EQUIPO'], ascending=[False, False, False, True])
+        tabla.index = range(1, len(tabla) + 1)
+        return tabla
+
+    def tabla_local(self):
+        """
+        Get the table with home matches only.
+        """
+        return self._tabla(self.local)
+
+    def tabla_visitante(self):
+        """
+        Get the table with away matches only.
+        """
+        return self._tabla(self.visitante)
+
+    def forma_rachas(self):
+        """
+        Get the form, the current streaks and the clean sheets of every team.
+        """
+        return pd.DataFrame({'EQUIPO': self.equipos, 'FORMA': self.forma, 'INVICTO': self.invicto,
+                             'SIN_GANAR': self.sin_ganar, 'PORTERIA_CERO': self.porterias},
+                            index=range(1, len(self.equipos) + 1))
+
+
+class MatricesLiga:
+    """
+    The results of a league as team x team matrices of goals and game weeks.
+
+    The matrices are built once from the scoresheet and updated in O(1) per result. Standings
+    for any subset of teams and range of game weeks are computed by masking them, without
+    scanning the scoresheet again, and ranked with the same tie-breaking rules as the
+    Clasificacion class.
+    """
+
+    COLUMNAS = ['EQUIPO', 'PJ', 'PG', 'PE', 'PP', 'GF', 'GC', 'DIF', 'PTS']
+
+    def __init__(self, df, jornadas=None, puntos_victoria=3, puntos_empate=1):
+        """
+        Build the matrices of a scoresheet.
+
+        Args:
+            df (DataFrame): The N x N scoresheet with results in 'X-Y' format.
+            jornadas (dict, optional): Game week by (local, visitante) pair. Matches without one
+                are only included in queries without a game week range.
+            puntos_victoria (int): Points for a win.
+            puntos_empate (int): Points for a draw.
+        """
+        self.equipos = list(df.index)
+        self.indices = {equipo: i for i, equipo in enumerate(self.equipos)}
+        self.puntos_victoria = puntos_victoria
+        self.puntos_empate = puntos_empate
+
+        n = len(self.equipos)
+        self.goles_local = np.zeros((n, n), dtype=int)  # Goals of the row team playing at home
+        self.goles_visitante = np.zeros((n, n), dtype=int)  # Goals of the column team playing away
+        self.jugado = np.zeros((n, n), dtype=bool)  # Whether the match has a result
+        self.jornada = np.zeros((n, n), dtype=int)  # Game week of the match, 0 if unknown
+        self.puntos = np.zeros(n, dtype=int)  # Points of every team over all its matches
+
+        jornadas = jornadas or {}
+        for local, visitante in partidos_jugados(df):
+            self.fijar(local, visitante, df.at[local, visitante], jornadas.get((local, visitante)))
+
+    @classmethod
+    def desde_liga(cls, liga, seguir=True, **reglas):
+        """
+        Build the matrices of a versioned league and keep them updated with its new results.
+
+        Args:
+            liga (LigaVersionada): The league.
+            seguir (bool): Whether to follow the results applied by liga.refrescar afterwards.
+            **reglas: Points for a win and for a draw, see the constructor.
+
+        Returns:
+            MatricesLiga: The matrices.
+        """
+        matrices = cls(liga.df, liga.jornadas_partidos(), **reglas)
+        if seguir:
+            liga.suscribir(matrices.aplicar_entrada)
+        return matrices
+
+    def aplicar_entrada(self, entrada):
+        """
+        Apply an entry of the log of result updates.
+
+        Args:
+            entrada (dict): The log entry.
+        """
+        jornada = int(entrada['Jornada']) if entrada['Jornada'] else None
+        self.fijar(entrada['Local'], entrada['Visitante'], entrada['Resultado'] or None, jornada)
+
+    def fijar(self, local, visitante, resultado, jornada=None):
+        """
+        Set, change or remove the result of a match.
+
+        Args:
+            local (str): Home team.
+            visitante (str): Away team.
+            resultado (str): Score in 'X-Y' format, or None to remove the result.
+            jornada (int, optional): Game week of the match.
+        """
+        i, j = self.indices[local], self.indices[visitante]
+        if self.jugado[i, j]:
+            self._sumar_puntos(i, j, signo=-1)
+        if resultado is None or pd.isna(resultado):
+            self.jugado[i, j] = False
+            self.goles_local[i, j] = self.goles_visitante[i, j] = self.jornada[i, j] = 0
+            return
+        self.goles_local[i, j], self.goles_visitante[i, j] = goles_resultado(resultado)
+        self.jugado[i, j] = True
+        self.jornada[i, j] = jornada or 0
+        self._sumar_puntos(i, j, signo=1)
+
+    def _sumar_puntos(self, i, j, signo):
+        """
+        Add (signo=1) or subtract (signo=-1) the points of the result of a match to both teams.
+        """
+        goles_local, goles_visitante = self.goles_local[i, j], self.goles_visitante[i, j]
+        if goles_local == goles_visitante:
+            self.puntos[i] += signo * self.puntos_empate
+            self.puntos[j] += signo * self.puntos_empate
+        else:
+            self.puntos[i if goles_local > goles_visitante else j] += signo * self.puntos_victoria
+
+    def mascara(self, equipos=None, jornadas=None, excluir=None):
+        """
+        Select the played matches of a query.
+
+        Args:
+            equipos (list, optional): Only matches between these teams.
+            jornadas (tuple, optional): (first, last) game weeks, both included.
+            excluir (list, optional): Leave out the matches against these teams.
+
+        Returns:
+            ndarray: Boolean team x team matrix of the selected matches.
+        """
+        mascara = self.jugado.copy()
+        if equipos is not None:
+            seleccion = self._seleccion(equipos)
+            mascara &= seleccion[:, None] & seleccion[None, :]
+        if excluir:
+            excluidos = self._seleccion(excluir)
+            mascara &= ~(excluidos[:, None] | excluidos[None, :])
+        if jornadas is not None:
+            desde, hasta = jornadas
+            mascara &= (self.jornada >= desde) & (self.jornada <= hasta)
+        return mascara
+
+    def totales(self, mascara):
+        """
+        Compute the totals of every team over the selected matches.
+
+        Args:
+            mascara (ndarray): Boolean team x team matrix of the selected matches.
+
+        Returns:
+            dict: Arrays of PJ, PG, PE, PP, GF, GC, DIF and PTS indexed like the teams.
+        """
+        goles_local = np.where(mascara, self.goles_local, 0)
+        goles_visitante = np.where(mascara, self.goles_visitante, 0)
+        gana_local = mascara & (self.goles_local > self.goles_visitante)
+        empate = mascara & (self.goles_local == self.goles_visitante)
+        gana_visitante = mascara & (self.goles_local < self.goles_visitante)
+
+        totales = {
+            'PJ': mascara.sum(axis=1) + mascara.sum(axis=0),
+            'PG': gana_local.sum(axis=1) + gana_visitante.sum(axis=0),
+            'PE': empate.sum(axis=1) + empate.sum(axis=0),
+            'PP': gana_visitante.sum(axis=1) + gana_local.sum(axis=0),
+            'GF': goles_local.sum(axis=1) + goles_visitante.sum(axis=0),
+            'GC': goles_visitante.sum(axis=1) + goles_local.sum(axis=0),
+        }
+        totales['DIF'] = totales['GF'] - totales['GC']
+        totales['PTS'] = self.puntos_victoria * totales['PG'] + self.puntos_empate * totales['PE']
+        return totales
+
+    def consultar(self, equipos=None, jornadas=None, excluir=None):
+        """
+        Compute the ranked table of a subset of teams and/or range of game weeks.
+
+        Examples are the mini-league among the top six, the table over game weeks 10 to 20,
+        or the table without the matches against the relegated teams.
+
+        Args:
+            equipos (list, optional): Only these teams, and only their matches between them.
+            jornadas (tuple, optional): (first, last) game weeks, both included.
+            excluir (list, optional): Leave out these teams and the matches against them.
+
+        Returns:
+            DataFrame: The table, with the same columns as the Clasificacion class.
+        """
+        mascara = self.mascara(equipos, jornadas, excluir)
+        seleccion = self._seleccion(equipos) if equipos is not None else np.ones(len(self.equipos), dtype=bool)
+        if excluir:
+            seleccion &= ~self._seleccion(excluir)
+        totales = self.totales(mascara)
+        orden = self.ordenar(np.flatnonzero(seleccion), totales, mascara)
+
+        tabla = pd.DataFrame({columna: totales[columna][orden] for columna in self.COLUMNAS[1:]})
+        tabla.insert(0, 'EQUIPO', [self.equipos[i] for i in orden])
+        tabla.index = range(1, len(tabla) + 1)
+        return tabla
+
+    def clasificar(self, jornadas=None):
+        """
+        Compute the full league table, optionally up to a game week.
+
+        Args:
+            jornadas (tuple, optional): (first, last) game weeks, both included.
+
+        Returns:
+            DataFrame: The table, with the same columns as the Clasificacion class.
+        """
+        return self.consultar(jornadas=jornadas)
+
+    def ordenar(self, indices, totales, mascara):
+        """
+        Rank teams by points and break the ties with the rules of the Clasificacion class.
+
+        Two teams on equal points are ranked by the goal average of their two matches if both
+        were played and it is not zero, and otherwise by goal difference, goals for and name.
+        Three or more teams are ranked by a mini-league among them when every pair that met
+        played both matches, and otherwise by goal difference, goals for and name.
+
+        Args:
+            indices (ndarray): Indices of the teams to rank.
+            totales (dict): Totals of every team, as returned by totales().
+            mascara (ndarray): The selected matches, used for the head-to-head records.
+
+        Returns:
+            list: The indices in ranking order.
+        """
+        puntos = totales['PTS']
+        orden = []
+        for valor in sorted(set(puntos[indices].tolist()), reverse=True):
+            grupo = [i for i in indices if puntos[i] == valor]
+            if len(grupo) == 2:
+                orden.extend(self._desempate_par(grupo, totales, mascara))
+            elif len(grupo) >= 3:
+                orden.extend(self._desempate_grupo(grupo, totales, mascara))
+            else:
+                orden.extend(grupo)
+        return orden
+
+    def _criterio_general(self, totales):
+        """
+        Sort key by goal difference, goals for and team name.
+        """
+        return lambda i: (-totales['DIF'][i], -totales['GF'][i], self.equipos[i])
+
+    def _desempate_par(self, grupo, totales, mascara):
+        """
+        Rank two teams on equal points.
+        """
+        a, b = grupo
+        if mascara[a, b] and mascara[b, a]:
+            average = (self.goles_local[a, b] - self.goles_visitante[a, b]
+                       + self.goles_visitante[b, a] - self.goles_local[b, a])
+            if average != 0:
+                return [a, b] if average > 0 else [b, a]
+        return sorted(grupo, key=self._criterio_general(totales))
+
+    def _desempate_grupo(self, grupo, totales, mascara):
+        """
+        Rank three or more teams on equal points.
+        """
+        seleccion = np.zeros(len(self.equipos), dtype=bool)
+        seleccion[grupo] = True
+        entre_ellos = mascara & seleccion[:, None] & seleccion[None, :]
+
+        # The mini-league only applies if every pair that met played both matches
+        encuentros = entre_ellos.astype(int) + entre_ellos.T.astype(int)
+        if np.any(encuentros == 1):
+            return sorted(grupo, key=self._criterio_general(totales))
+
+        mini = self.totales(entre_ellos)
+        return sorted(grupo, key=lambda i: (-mini['PTS'][i], -mini['DIF'][i],
+                                            -totales['DIF'][i], -totales['GF'][i], self.equipos[i]))
+
+    def _seleccion(self, equipos):
+        """
+        Boolean vector selecting the given teams.
+        """
+        seleccion = np.zeros(len(self.equipos), dtype=bool)
+        seleccion[[self.indices[equipo] for equipo in equipos]] = True
+        return seleccion
+
+
+FilaClasificacion = namedtuple('FilaClasificacion', MatricesLiga.COLUMNAS)
+
+
+class HistoricoJornadas:
+    """
+    The full standings after every game week, as immutable snapshots.
+
+    Each snapshot is a tuple of team rows in ranking order. A team row that did not change since
+    the previous game week is the same object in both snapshots, so the memory used grows with
+    what changes in each round instead of with full tables. The standings as of any game week
+    are a single lookup. When a result is posted, only the snapshots from its game week onwards
+    are rebuilt, the next time they are read.
+    """
+
+    def __init__(self, matrices, total=None):
+        """
+        Initialize the snapshots of a league.
+
+        Args:
+            matrices (MatricesLiga): The matrices of the league. Matches without game week are ignored.
+            total (int, optional): Number of game weeks. By default, the last game week with results.
+        """
+        self.matrices = matrices
+        self.total = total or int(matrices.jornada.max(initial=0))
+        self._jornadas = []  # Snapshot of each game week, the first one at index 0
+        self._pendiente = 1  # First game week whose snapshot has to be rebuilt
+
+    @classmethod
+    def desde_liga(cls, liga, seguir=True, **reglas):
+        """
+        Build the snapshots of a versioned league and keep them updated with its new results.
+
+        Args:
+            liga (LigaVersionada): The league.
+            seguir (bool): Whether to follow the results applied by liga.refrescar afterwards.
+            **reglas: Points for a win and for a draw, see MatricesLiga.
+
+        Returns:
+            HistoricoJornadas: The snapshots.
+        """
+        matrices = MatricesLiga(liga.df, liga.jornadas_partidos(), **reglas)
+        historico = cls(matrices, total=max((len(liga.df.index) - 1) * 2, int(matrices.jornada.max(initial=0))))
+        if seguir:
+            liga.suscribir(historico.aplicar_entrada)
+        return historico
+
+    def aplicar_entrada(self, entrada):
+        """
+        Apply an entry of the log of result updates to the matrices and invalidate the
+        snapshots from the game week it affects.
+
+        Args:
+            entrada (dict): The log entry.
+        """
+        i, j = self.matrices.indices[entrada['Local']], self.matrices.indices[entrada['Visitante']]
+        anterior = self.matrices.jornada[i, j] if self.matrices.jugado[i, j] else 0
+        self.matrices.aplicar_entrada(entrada)
+        nueva = self.matrices.jornada[i, j] if self.matrices.jugado[i, j] else 0
+
+        afectadas = [int(jornada) for jornada in (anterior, nueva) if jornada]
+        if afectadas:
+            self._pendiente = min(self._pendiente, min(afectadas))
+            self.total = max(self.total, max(afectadas))
+
+    def como_en(self, jornada):
+        """
+        Get the standings as they were after a game week.
+
+        Args:
+            jornada (int): The game week, from 1 to the number of game weeks.
+
+        Returns:
+            tuple: FilaClasificacion rows in ranking order.
+        """
+        if not 1 <= jornada <= self.total:
+            raise IndexError(f"La jornada debe estar entre 1 y {self.total}")
+        if self._pendiente <= self.total:
+            self._actualizar()
+        return self._jornadas[jornada - 1]
+
+    def tabla(self, jornada):
+        """
+        Get the standings after a game week as a DataFrame.
+
+        Args:
+            jornada (int): The game week.
+
+        Returns:
+            DataFrame: The table, with the same columns as the Clasificacion class.
+        """
+        tabla = pd.DataFrame(self.como_en(jornada), columns=FilaClasificacion._fields)
+        tabla.index = range(1, len(tabla) + 1)
+        return tabla
+
+    def historica(self):
+        """
+        Get the position of every team after every game week.
+
+        Returns:
+            DataFrame: Rows with 'Equipo', 'Jornada' and 'Posicion', like the historical classification file.
+        """
+        filas = [(fila.EQUIPO, jornada, posicion)
+                 for jornada in range(1, self.total + 1)
+                 for posicion, fila in enumerate(self.como_en(jornada), start=1)]
+        return pd.DataFrame(filas, columns=['Equipo', 'Jornada', 'Posicion'])
+
+    def _actualizar(self):
+        """
+        Rebuild the snapshots from the first invalidated game week onwards.
+        """
+        del self._jornadas[self._pendiente - 1:]
+        anteriores = {fila.EQUIPO: fila for fila in self._jornadas[-1]} if self._jornadas else {}
+        todos = np.arange(len(self.matrices.equipos))
+
+        for jornada in range(len(self._jornadas) + 1, self.total + 1):
+            mascara = self.matrices.mascara(jornadas=(1, jornada))
+            totales = self.matrices.totales(mascara)
+            filas = []
+            for i in self.matrices.ordenar(todos, totales, mascara):
+                fila = FilaClasificacion(self.matrices.equipos[i],
+                                         *(int(totales[columna][i]) for columna in FilaClasificacion._fields[1:]))
+                # Share the row of the previous game week when the team's figures did not change
+                previa = anteriores.get(fila.EQUIPO)
+                filas.append(previa if previa == fila else fila)
+            self._jornadas.append(tuple(filas))
+            anteriores = {fila.EQUIPO: fila for fila in filas}
+
+        self._pendiente = self.total + 1
+
+
+class ImpactoJornadas:
+    """
+    The effect of every game week on the standings.
+
+    The position and points of every team after every game week are read once from the snapshots
+    of HistoricoJornadas into team x game week arrays, and the movements and the gaps to the
+    leader and to the relegation line are computed on them for all the game weeks at once. The
+    tables of a game week are then slices of these arrays, built the first time they are asked for.
+    """
+
+    def __init__(self, historico, descensos=3):
+        """
+        Compute the effect of the game weeks with results.
+
+        Args:
+            historico (HistoricoJornadas): The snapshots of the league.
+            descensos (int): Number of relegation places.
+        """
+        matrices = historico.matrices
+        self.matrices = matrices
+        self.equipos = matrices.equipos
+        self.jornadas = int(matrices.jornada.max(initial=0))  # Last game week with results
+        n = len(self.equipos)
+
+        # Column 0 is the start of the season, before any game week
+        self.posiciones = np.full((n, self.jornadas + 1), np.nan)
+        self.puntos = np.zeros((n, self.jornadas + 1))
+        for jornada in range(1, self.jornadas + 1):
+            for posicion, fila in enumerate(historico.como_en(jornada), start=1):
+                self.posiciones[matrices.indices[fila.EQUIPO], jornada] = posicion
+                self.puntos[matrices.indices[fila.EQUIPO], jornada] = fila.PTS
+
+        # Teams are ranked by points first, so the points of position k are the k-th highest
+        ordenados = -np.sort(-self.puntos, axis=0)
+        self.movimientos = self.posiciones[:, :-1] - self.posiciones[:, 1:]  # Places gained in each game week
+        self.ganados = np.diff(self.puntos, axis=1)  # Points won in each game week
+        self.lider = ordenados[0] - self.puntos  # Points behind the leader
+        # Points above the first relegation place, or behind the last safe place for the relegated teams
+        self.descenso = np.full(self.puntos.shape, np.nan)
+        if 0 < descensos < n:
+            salvacion, descenso = ordenados[n - descensos - 1], ordenados[n - descensos]
+            self.descenso = np.where(self.posiciones <= n - descensos, self.puntos - descenso, self.puntos - salvacion)
+        self._tablas = {}  # (standings, results) of the game weeks already asked for
+
+    def jornada(self, jornada):
+        """
+        Get the standings and the results of a game week with their effect.
+
+        Args:
+            jornada (int): The game week, from 1 to the last one with results.
+
+        Returns:
+            tuple: The standings after the game week, with the position before it ('ANTES'), the
+                places gained ('MOV'), the points won ('GANADOS') and the points behind the leader
+                ('LIDER') and above the relegation line ('DESCENSO'); and the results of the game
+                week with the same figures for the home and away team.
+        """
+        if not 1 <= jornada <= self.jornadas:
+            raise IndexError(f"La jornada debe estar entre 1 y {self.jornadas}")
+        if jornada not in self._tablas:
+            columnas = {'POS': self.posiciones[:, jornada], 'ANTES': self.posiciones[:, jornada - 1],
+                        'MOV': self.movimientos[:, jornada - 1], 'PTS': self.puntos[:, jornada],
+                        'GANADOS': self.ganados[:, jornada - 1], 'LIDER': self.lider[:, jornada],
+                        'DESCENSO': self.descenso[:, jornada]}
+            equipos = pd.DataFrame({nombre: pd.array(valores, dtype='Int64') for nombre, valores in columnas.items()})
+            equipos.insert(1, 'EQUIPO', self.equipos)
+
+            local, visitante = np.nonzero(self.matrices.jugado & (self.matrices.jornada == jornada))
+            resultados = pd.DataFrame({
+                'LOCAL': [self.equipos[i] for i in local],
+                'RESULTADO': [f"{self.matrices.goles_local[i, j]}-{self.matrices.goles_visitante[i, j]}"
+                              for i, j in zip(local, visitante)],
+                'VISITANTE': [self.equipos[j] for j in visitante]})
+            for lado, indices in (('LOCAL', local), ('VISITANTE', visitante)):
+                for nombre in ('POS', 'MOV', 'LIDER', 'DESCENSO'):
+                    resultados[f"{nombre}_{lado}"] = equipos[nombre].to_numpy()[indices]
+
+            equipos = equipos.sort_values(by='POS').set_index('POS')
+            resultados = resultados.sort_values(by='POS_LOCAL').reset_index(drop=True)
+            self._tablas[jornada] = (equipos, resultados)
+        return self._tablas[jornada]
+
+
+def _equipos_hoja(n):
+    return [f"E{i:02d}" for i in range(n)]
+
+
+def hoja_aleatoria(rng, n):
+    """
+    Scoresheet with a random share of played matches and random scores.
+    """
+    jugados = rng.random((n, n)) < rng.random()
+    goles = rng.integers(0, 5, size=(n, n, 2))
+    marcadores = np.char.add(np.char.add(goles[..., 0].astype(str), '-'), goles[..., 1].astype(str)).astype(object)
+    celdas = np.where(jugados, marcadores, np.nan)
+    np.fill_diagonal(celdas, np.nan)
+    return pd.DataFrame(celdas, index=_equipos_hoja(n), columns=_equipos_hoja(n))
+
+
+def hoja_empates(rng, n):
+    """
+    Scoresheet where most teams end on equal points: only a few scores, mostly draws.
+    """
+    df = hoja_aleatoria(rng, n)
+    marcadores = np.array(['0-0', '1-1', '2-2', '1-0', '0-1'])
+    sorteo = marcadores[rng.choice(len(marcadores), size=(n, n), p=[0.3, 0.3, 0.2, 0.1, 0.1])]
+    return df.where(df.isna(), sorteo)
+
+
+def hoja_vacia(rng, n):
+    """
+    Scoresheet without any result.
+    """
+    return pd.DataFrame(np.nan, index=_equipos_hoja(n), columns=_equipos_hoja(n), dtype=object)
+
+
+def hoja_solo_ida(rng, n):
+    """
+    Scoresheet where every pair of teams that met played only one of its two matches.
+    """
+    df = hoja_empates(rng, n) if rng.random() < 0.5 else hoja_aleatoria(rng, n)
+    ida = np.triu(rng.random((n, n)) < 0.5, 1)
+    ida = ida | np.tril(~ida.T, -1)  # Exactly one of (i, j) and (j, i)
+    return df.where(ida)
+
+
+def hoja_triple(rng, n):
+    """
+    Scoresheet with circular results among groups of three teams, so that they end tied.
+    """
+    df = hoja_empates(rng, n)
+    orden = rng.permutation(n)
+    for inicio in range(0, n - 2, 3):
+        a, b, c = (df.index[i] for i in orden[inicio:inicio + 3])
+        ambos = rng.random() < 0.7  # Sometimes only one leg of each pair
+        for ganador, perdedor in [(a, b), (b, c), (c, a)]:
+            df.at[ganador, perdedor] = f"{rng.integers(1, 3)}-0"
+            df.at[perdedor, ganador] = f"{rng.integers(0, 2)}-{rng.integers(0, 2)}" if ambos else np.nan
+    return df
+
+
+GENERADORES_HOJAS = {'aleatoria': hoja_aleatoria, 'empates': hoja_empates, 'vacia': hoja_vacia,
+                     'solo_ida': hoja_solo_ida, 'triple': hoja_triple}
+
+
+def motor_legado(df):
+    """
+    Reference standings: the Clasificacion class, the rules of the classification window.
+    """
+    return Clasificacion(df).clasificacion
+
+
+def motor_matrices(df):
+    """
+    Standings computed with the matrices of the MatricesLiga class.
+    """
+    return MatricesLiga(df).clasificar()
+
+
+def _primera_diferencia(esperado, obtenido):
+    """
+    Find the first row where two standings tables differ.
+
+    Returns:
+        int: Position of the first different row, or None if the tables are equal.
+    """
+    columnas = list(esperado.columns)
+    if list(obtenido.columns) != columnas or len(obtenido) != len(esperado):
+        return 1
+    esperado = esperado.reset_index(drop=True).astype(str)
+    obtenido = obtenido.reset_index(drop=True).astype(str)
+    distintas = np.flatnonzero((esperado.to_numpy() != obtenido.to_numpy()).any(axis=1))
+    return int(distintas[0]) + 1 if len(distintas) else None
+
+
+def verificar_motor(motor, referencia=motor_legado, casos=200, equipos=(2, 12), semilla=0, generadores=None):
+    """
+    Compare a standings engine with a reference one on generated scoresheets.
+
+    Every case draws a number of teams and a scoresheet from one of the generators, in turn, and
+    both engines compute its table. The run stops at the first case where the tables differ. The
+    time spent by each engine is measured in the same run, per generator. Each case is generated
+    from (semilla, case number), so a divergence can be reproduced alone.
+
+    Args:
+        motor (callable): Engine under test, computing the table of a scoresheet.
+        referencia (callable): Engine taken as correct. By default, the Clasificacion class.
+        casos (int): Number of scoresheets.
+        equipos (tuple): Minimum and maximum number of teams.
+        semilla (int): Seed of the generators.
+        generadores (list, optional): Names of the generators in GENERADORES_HOJAS. By default, all.
+
+    Returns:
+        dict: Number of cases run, seconds spent by each engine per generator, and the first
+            divergence (generator, case, scoresheet, both tables and first different position),
+            or None under 'divergencia'.
+    """
+    generadores = generadores or list(GENERADORES_HOJAS)
+    tiempos = {nombre: {'referencia': 0.0, 'motor': 0.0, 'casos': 0} for nombre in generadores}
+    informe = {'casos': 0, 'tiempos': tiempos, 'divergencia': None}
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)  # Raised by the fillna calls of Clasificacion
+        for caso in range(casos):
+            nombre = generadores[caso % len(generadores)]
+            rng = np.random.default_rng([semilla, caso])
+            df = GENERADORES_HOJAS[nombre](rng, int(rng.integers(equipos[0], equipos[1] + 1)))
+
+            tablas = []
+            for clave, funcion in [('referencia', referencia), ('motor', motor)]:
+                inicio = time.perf_counter()
+                try:
+                    tablas.append(funcion(df.copy()))
+                except Exception as error:
+                    tablas.append(pd.DataFrame({'ERROR': [repr(error)]}))
+                tiempos[nombre][clave] += time.perf_counter() - inicio
+            tiempos[nombre]['casos'] += 1
+            informe['casos'] += 1
+
+            posicion = _primera_diferencia(*tablas)
+            if posicion is not None:
+                informe['divergencia'] = {'generador': nombre, 'caso': caso, 'hoja': df, 'esperado': tablas[0],
+                                          'obtenido': tablas[1], 'posicion': posicion}
+                break
+    return informe
+
+
+class PresupuestoAgotado(Exception):
+    """
+    Raised when the exact search of ObjetivosMatematicos visits too many outcomes.
+    """
+
+
+class ObjetivosMatematicos:
+    """
+    Decide which positions every team has mathematically secured or lost.
+
+    For a team and a position, the status is "asegurado" if the team finishes in that position
+    or better whatever the results of the unplayed matches, "eliminado" if it cannot finish
+    there with any results, and "posible" otherwise. Tie-breakers are not taken into account:
+    a team finishing level on points with another counts as able to finish above and below it,
+    so "asegurado" and "eliminado" hold under any tie-breaking rules.
+
+    The outcomes are never enumerated. Each question is first answered with simple bounds on
+    the points every team can still reach, then with a max-flow relaxation in which every
+    unplayed match hands out a fixed number of points, and only when those do not decide it,
+    with a depth-first search over the results that uses the relaxation to prune whole branches.
+    """
+
+    def __init__(self, matrices, presupuesto=1000):
+        """
+        Prepare the calculation for the current results of a league.
+
+        Args:
+            matrices (MatricesLiga): The results and points rules of the league.
+            presupuesto (int): Maximum number of outcomes visited by the exact search of one
+                question. Questions not decided within it are answered as "posible".
+        """
+        self.equipos = matrices.equipos
+        self.victoria = matrices.puntos_victoria
+        self.empate = matrices.puntos_empate
+        self.presupuesto = presupuesto
+        self.puntos = [int(puntos) for puntos in matrices.totales(matrices.jugado)['PTS']]
+
+        pendiente = ~matrices.jugado
+        np.fill_diagonal(pendiente, False)
+        self.pendientes = [(int(local), int(visitante)) for local, visitante in zip(*np.nonzero(pendiente))]
+        self._nodos = 0
+
+    def estado(self, equipo, puesto):
+        """
+        Get whether a team is sure to finish, may finish or cannot finish in a position or better.
+
+        Args:
+            equipo (str): The team.
+            puesto (int): The position, 1 being the leader.
+
+        Returns:
+            str: "asegurado", "posible" or "eliminado".
+        """
+        x = self.equipos.index(equipo)
+        propios = [partido for partido in self.pendientes if x in partido]
+        otros = [partido for partido in self.pendientes if x not in partido]
+        rivales = [i for i in range(len(self.equipos)) if i != x]
+
+        try:
+            # Best case: the team wins every match left, and at most puesto - 1 teams may pass it
+            maximo = self.puntos[x] + self.victoria * len(propios)
+            topes = {i: maximo - self.puntos[i] for i in rivales}
+            if not self._sin_superar(dict.fromkeys(rivales, 0), topes, otros, puesto - 1):
+                return 'eliminado'
+
+            # Worst case: the team loses every match left, and at least puesto teams must reach it
+            ganados = dict.fromkeys(rivales, 0)
+            for partido in propios:
+                ganados[partido[0] if partido[1] == x else partido[1]] += self.victoria
+            objetivos = {i: self.puntos[x] - self.puntos[i] for i in rivales}
+            if not self._alcanzan(ganados, objetivos, otros, puesto):
+                return 'asegurado'
+        except PresupuestoAgotado:
+            pass
+        return 'posible'
+
+    def tabla(self, puestos=None):
+        """
+        Get the status of every team for several positions.
+
+        Args:
+            puestos (list, optional): The positions. By default, the title and the last position
+                above the three relegation places.
+
+        Returns:
+            DataFrame: One row per team, in the order of the current points, with a 'TOP k' column
+                per position.
+        """
+        n = len(self.equipos)
+        puestos = puestos or ([1, n - 3] if n > 4 else [1])
+        orden = sorted(range(n), key=lambda i: -self.puntos[i])
+        tabla = pd.DataFrame({'EQUIPO': [self.equipos[i] for i in orden], 'PTS': [self.puntos[i] for i in orden]})
+        for puesto in puestos:
+            tabla[f"TOP {puesto}"] = [self.estado(self.equipos[i], puesto) for i in orden]
+        tabla.index = range(1, n + 1)
+        return tabla
+
+    def _sin_superar(self, ganados, topes, partidos, permitidos):
+        """
+        Check whether the matches can be played so that at most some teams gain more than their limit.
+
+        The other teams have to stay within their limit. Given the set of teams that do, the
+        rest should win all their matches against it, so only the matches inside the set matter.
+        Sets are built starting from the teams with more room, and a set whose matches cannot be
+        split within the limits even in the relaxation is not extended, as a larger set would be
+        harder to keep within them.
+        """
+        holguras = {i: topes[i] - ganados[i] for i in ganados}
+        restantes = self._restantes(ganados, partidos)
+        seguros = [i for i in holguras if self.victoria * restantes[i] <= holguras[i]]  # Cannot pass their limit
+        faltan = len(ganados) - permitidos - len(seguros)
+        if faltan <= 0:
+            return True
+        # The safe teams win their matches against the set, so they are left out of it
+        candidatos = sorted((i for i in holguras if 0 <= holguras[i] < self.victoria * restantes[i]),
+                            key=lambda i: self.victoria * restantes[i] - holguras[i])
+        return self._buscar_conjunto(
+            candidatos, faltan,
+            lambda conjunto: self._reparto_minimo({i: holguras[i] for i in conjunto}, self._internos(conjunto, partidos)),
+            lambda conjunto: self._todos_sin_superar({i: holguras[i] for i in conjunto}, self._internos(conjunto, partidos)))
+
+    def _alcanzan(self, ganados, objetivos, partidos, necesarios):
+        """
+        Check whether the matches can be played so that at least some teams reach their target.
+
+        Given the set of teams that reach it, the rest should lose all their matches against it,
+        so only the matches inside the set matter. Sets are built like in _sin_superar, starting
+        from the teams with more margin.
+        """
+        demandas = {i: objetivos[i] - ganados[i] for i in ganados}
+        restantes = self._restantes(ganados, partidos)
+        faltan = necesarios - sum(demanda <= 0 for demanda in demandas.values())
+        if faltan <= 0:
+            return True
+        # The teams that already reached their target lose their matches against the set
+        candidatos = sorted((i for i in demandas if 0 < demandas[i] <= self.victoria * restantes[i]),
+                            key=lambda i: demandas[i] - self.victoria * restantes[i])
+
+        def pendientes(conjunto):
+            # Points still needed once the matches against teams outside the set are won
+            internos = self._internos(conjunto, partidos)
+            return {i: demandas[i] - self.victoria * (restantes[i] - sum(i in partido for partido in internos))
+                    for i in conjunto}, internos
+
+        return self._buscar_conjunto(candidatos, faltan, lambda conjunto: self._reparto_maximo(*pendientes(conjunto)),
+                                     lambda conjunto: self._todos_alcanzan(*pendientes(conjunto)))
+
+    def _buscar_conjunto(self, candidatos, tamano, relajacion, exacto):
+        """
+        Search a set of teams of a given size for which an exact check holds.
+
+        Both checks become harder as the set grows. When there are few sets, they are tried
+        whole, from the first candidates on. Otherwise the sets are built one team at a time,
+        and a set that fails the relaxation is not extended.
+
+        Args:
+            candidatos (list): The teams, the most promising first.
+            tamano (int): Size of the set.
+            relajacion (callable): Necessary condition on a set.
+            exacto (callable): Exact check on a set of the full size.
+
+        Returns:
+            bool: Whether such a set exists.
+        """
+        self._nodos = self.presupuesto
+        if len(candidatos) < tamano:
+            return False
+        if math.comb(len(candidatos), tamano) <= self.presupuesto:
+            for conjunto in itertools.combinations(candidatos, tamano):
+                self._gastar()
+                if relajacion(conjunto) and exacto(conjunto):
+                    return True
+            return False
+
+        def elegir(elegidos, inicio):
+            if len(elegidos) == tamano:
+                return exacto(elegidos)
+            for posicion in range(inicio, len(candidatos) - (tamano - len(elegidos)) + 1):
+                conjunto = elegidos + [candidatos[posicion]]
+                self._gastar()
+                if relajacion(conjunto) and elegir(conjunto, posicion + 1):
+                    return True
+            return False
+
+        return elegir([], 0)
+
+    def _todos_sin_superar(self, holguras, partidos):
+        """
+        Check whether the matches can be played without any team gaining more than its slack.
+        """
+        holguras = dict(holguras)
+        # The matches of the teams with the least room per match go first, where results are forced
+        restantes = self._restantes(holguras, partidos)
+        partidos = sorted(partidos, key=lambda partido: min(holguras[i] / restantes[i] for i in partido))
+
+        def opciones(a, b, restos):
+            resultados = [(self.victoria, 0), (self.empate, self.empate), (0, self.victoria)]
+            if restos[a] < restos[b]:
+                resultados.reverse()  # The team with more room wins first
+            return [(puntos_a, puntos_b) for puntos_a, puntos_b in resultados
+                    if puntos_a <= restos[a] and puntos_b <= restos[b]]
+
+        def buscar(k):
+            self._gastar()
+            if k == len(partidos):
+                return True
+            if not self._reparto_minimo(holguras, partidos[k:]):
+                return False
+            # Enough if every match left can have a winner that still stays within its slack
+            cupos = {i: max(holgura, 0) // self.victoria for i, holgura in holguras.items()}
+            if self._flujo(cupos, partidos[k:], 1) == len(partidos) - k:
+                return True
+            a, b = partidos[k]
+            for puntos_a, puntos_b in opciones(a, b, holguras):
+                holguras[a] -= puntos_a
+                holguras[b] -= puntos_b
+                encontrado = buscar(k + 1)
+                holguras[a] += puntos_a
+                holguras[b] += puntos_b
+                if encontrado:
+                    return True
+            return False
+
+        # Greedy attempt first, taking the first result allowed in every match
+        voraz = dict(holguras)
+        for a, b in partidos:
+            permitidos = opciones(a, b, voraz)
+            if not permitidos:
+                return buscar(0)
+            voraz[a] -= permitidos[0][0]
+            voraz[b] -= permitidos[0][1]
+        return True
+
+    def _todos_alcanzan(self, demandas, partidos):
+        """
+        Check whether the matches can be played so that every team gains at least its demand.
+        """
+        demandas = dict(demandas)
+        # The matches of the teams that need the most points per match go first, where results are forced
+        restantes = self._restantes(demandas, partidos)
+        partidos = sorted(partidos, key=lambda partido: -max(demandas[i] / restantes[i] for i in partido))
+
+        def opciones(a, b, restos):
+            resultados = [(self.victoria, 0), (0, self.victoria), (self.empate, self.empate)]
+            if restos[a] < restos[b]:
+                resultados[:2] = resultados[1::-1]  # The team that needs more points wins first
+            return resultados
+
+        def buscar(k):
+            self._gastar()
+            if k == len(partidos):
+                return all(demanda <= 0 for demanda in demandas.values())
+            if not self._reparto_maximo(demandas, partidos[k:]):
+                return False
+            # Enough if the matches left can give every team the wins it needs
+            cupos = {i: -(-max(demanda, 0) // self.victoria) for i, demanda in demandas.items()}
+            if self._flujo(cupos, partidos[k:], 1) == sum(cupos.values()):
+                return True
+            a, b = partidos[k]
+            for puntos_a, puntos_b in opciones(a, b, demandas):
+                demandas[a] -= puntos_a
+                demandas[b] -= puntos_b
+                encontrado = buscar(k + 1)
+                demandas[a] += puntos_a
+                demandas[b] += puntos_b
+                if encontrado:
+                    return True
+            return False
+
+        # Greedy attempt first, taking the first result in every match
+        voraz = dict(demandas)
+        for a, b in partidos:
+            puntos_a, puntos_b = opciones(a, b, voraz)[0]
+            voraz[a] -= puntos_a
+            voraz[b] -= puntos_b
+        return all(demanda <= 0 for demanda in voraz.values()) or buscar(0)
+
+    def _gastar(self):
+        """
+        Count one step of the exact search, giving up when the budget runs out.
+        """
+        self._nodos -= 1
+        if self._nodos < 0:
+            raise PresupuestoAgotado
+
+    @staticmethod
+    def _restantes(ganados, partidos):
+        """
+        Count the matches left of every team.
+        """
+        restantes = dict.fromkeys(ganados, 0)
+        for local, visitante in partidos:
+            restantes[local] += 1
+            restantes[visitante] += 1
+        return restantes
+
+    @staticmethod
+    def _internos(conjunto, partidos):
+        """
+        Get the matches between two teams of a set.
+        """
+        conjunto = set(conjunto)
+        return [(a, b) for a, b in partidos if a in conjunto and b in conjunto]
+
+    def _reparto_minimo(self, holguras, partidos):
+        """
+        Relaxation: can every match hand out its minimum number of points without any team passing its slack?
+
+        A win gives the winner at least that minimum and a draw gives each team its share of it,
+        so if no such split exists, no outcome keeps every team within its slack.
+        """
+        minimo = min(self.victoria, 2 * self.empate)
+        if minimo == 0 or not partidos:
+            return all(holgura >= 0 for holgura in holguras.values())
+        return self._cota_derrotas(holguras, partidos) and \
+            self._flujo(holguras, partidos, minimo) == minimo * len(partidos)
+
+    def _cota_derrotas(self, holguras, partidos):
+        """
+        Bound on the points handed out when wins are worth more than two draws.
+
+        A team with little slack has to lose most of its matches, and every defeat gives the
+        winner the full points of a win, more than the relaxation counts. The bound is checked
+        for the teams with the least slack, adding one team at a time, and the matches among them.
+        """
+        if self.empate == 0 or self.victoria <= 2 * self.empate:
+            return True
+        dentro = set()
+        for equipo in sorted(holguras, key=holguras.get):
+            dentro.add(equipo)
+            internos = [(a, b) for a, b in partidos if a in dentro and b in dentro]
+            restantes = self._restantes(dentro, internos)
+            derrotas = sum(max(0, restantes[i] - holguras[i] // self.empate) for i in dentro)
+            puntos = 2 * self.empate * len(internos) + (self.victoria - 2 * self.empate) * min(derrotas, len(internos))
+            if puntos > sum(holguras[i] for i in dentro):
+                return False
+        return True
+
+    def _reparto_maximo(self, demandas, partidos):
+        """
+        Relaxation: can the matches, handing out the points of a win each, cover every team's demand?
+
+        No real result hands out more than the points of a win or of two draws, so if the demands
+        cannot be covered this way, no outcome lets every team reach its target.
+        """
+        demandas = {i: max(demanda, 0) for i, demanda in demandas.items()}
+        if sum(demandas.values()) > max(self.victoria, 2 * self.empate) * len(partidos):
+            return False
+        return self._cota_victorias(demandas, partidos) and self._cota_sobrantes(demandas, partidos) and self._flujo(demandas, partidos, max(self.victoria, 2 * self.empate)) == sum(demandas.values())
+
+    def _cota_victorias(self, demandas, partidos):
+        """
+        Bound on the wins needed when a team must win most of its matches to reach its demand.
+
+        Matches that are not won give at most the points of a draw, so every team needs a
+        minimum number of wins, and two teams cannot both win the match between them. The bound
+        is checked for the teams that need the most points, adding one team at a time, counting
+        only the wins that must come from the matches among them.
+        """
+        if self.victoria <= self.empate:
+            return True
+        restantes = self._restantes(demandas, partidos)
+        necesarias = {i: max(0, -(-(demandas[i] - self.empate * restantes[i]) // (self.victoria - self.empate)))
+                      for i in demandas}
+        dentro = set()
+        for equipo in sorted(demandas, key=demandas.get, reverse=True):
+            dentro.add(equipo)
+            internos = [(a, b) for a, b in partidos if a in dentro and b in dentro]
+            internos_equipo = self._restantes(dentro, internos)
+            victorias = sum(max(0, necesarias[i] - (restantes[i] - internos_equipo[i])) for i in dentro)
+            if victorias > len(internos):
+                return False
+        return True
+
+    def _cota_sobrantes(self, demandas, partidos):
+        """
+        Bound on the points that can be wasted when the demands almost use up every point left.
+
+        Every match hands out the points of a win, less what is lost when it is drawn. The points
+        a team gets above its demand and its share of the points lost in its draws add up to what
+        is left over, and every team wastes a minimum that depends on its demand, like a demand of
+        4 that takes two wins or a win and a draw.
+        """
+        if self.victoria <= 2 * self.empate:
+            return True
+        restantes = self._restantes(demandas, partidos)
+        perdida = self.victoria - 2 * self.empate  # Points lost in a draw
+        minimo = 0  # Twice the points wasted, to keep halves exact
+        for i, demanda in demandas.items():
+            desperdicios = []
+            for empates in range(min(restantes[i], self.victoria) + 1):
+                victorias = max(0, -(-(demanda - self.empate * empates) // self.victoria))
+                if victorias + empates <= restantes[i]:
+                    sobrante = self.victoria * victorias + self.empate * empates - demanda
+                    desperdicios.append(2 * sobrante + perdida * empates)
+            if not desperdicios:
+                return False
+            minimo += min(desperdicios)
+        return minimo <= 2 * (self.victoria * len(partidos) - sum(demandas.values()))
+
+    @staticmethod
+    def _flujo(capacidades, partidos, unidades):
+        """
+        Maximum flow from the matches, with some units each, to the teams, with a capacity each.
+
+        The flow is first assigned greedily to the team with more capacity left, and then
+        augmented along paths that move units from one team of a match to the other.
+        """
+        restante = dict(capacidades)
+        asignado = []  # Units of each match given to its first team and to its second team
+        for a, b in partidos:
+            primero, segundo = (a, b) if restante[a] >= restante[b] else (b, a)
+            unidades_primero = min(unidades, max(restante[primero], 0))
+            unidades_segundo = min(unidades - unidades_primero, max(restante[segundo], 0))
+            restante[primero] -= unidades_primero
+            restante[segundo] -= unidades_segundo
+            asignado.append([unidades_primero, unidades_segundo] if primero == a else [unidades_segundo, unidades_primero])
+
+        # Matches of each team, to move units between the teams of a match
+        por_equipo = {i: [] for i in capacidades}
+        for k, (a, b) in enumerate(partidos):
+            por_equipo[a].append((k, 0))
+            por_equipo[b].append((k, 1))
+
+        for k, (a, b) in enumerate(partidos):
+            while sum(asignado[k]) < unidades:
+                # Search a team with room, starting from the teams of this match
+                previo = {}
+                cola = []
+                for lado, equipo in enumerate((a, b)):
+                    if equipo not in previo:
+                        previo[equipo] = (k, lado, None)
+                        cola.append(equipo)
+                destino = None
+                while cola and destino is None:
+                    equipo = cola.pop(0)
+                    if restante[equipo] > 0:
+                        destino = equipo
+                        break
+                    # Move units received by this team from another match to the other team of it
+                    for m, lado in por_equipo[equipo]:
+                        otro = partidos[m][1 - lado]
+                        if asignado[m][lado] > 0 and otro not in previo:
+                            previo[otro] = (m, 1 - lado, equipo)
+                            cola.append(otro)
+                if destino is None:
+                    break
+                # Apply the path: one unit enters the destination and every step moves one unit
+                restante[destino] -= 1
+                equipo = destino
+                while True:
+                    m, lado, anterior = previo[equipo]
+                    asignado[m][lado] += 1
+                    if anterior is None:
+                        break
+                    asignado[m][1 - lado] -= 1
+                    equipo = anterior
+        return sum(sum(unidades_partido) for unidades_partido in asignado)
+
+
+def _clasificar_grupo(tarea):
+    """
+    Compute the standings of one group of a container. It runs in a worker process.
+
+    Args:
+        tarea (tuple): Path of the container and name of the group.
+
+    Returns:
+        tuple: Name of the group and its table.
+    """
+    ruta, nombre = tarea
+    return nombre, ContenedorGrupos(ruta).clasificacion(nombre)
+
+
+class ContenedorGrupos:
+    """
+    A league file holding many groups, each with its own teams, scoresheet, game weeks and rules.
+
+    The container is a zip archive with an index ("grupos.json") and, for each group, the members
+    "<grupo>/resultados.csv", "<grupo>/jornadas.csv" and "<grupo>/reglas.json". Zip archives
+    allow reading the members of one group without reading the others, and the standings of
+    all the groups are computed in parallel, one group per task.
+    """
+
+    INDICE = 'grupos.json'
+    REGLAS = {'puntos_victoria': 3, 'puntos_empate': 1}
+
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta (str): Path of the container file.
+        """
+        self.ruta = ruta
+        self.ruta_bloqueo = ruta + '.lock'
+
+    def grupos(self):
+        """
+        List the groups of the container.
+
+        Returns:
+            list: Names of the groups.
+        """
+        if not os.path.exists(self.ruta):
+            return []
+        with zipfile.ZipFile(self.ruta) as archivo:
+            return json.loads(archivo.read(self.INDICE))['grupos']
+
+    def leer_grupo(self, nombre):
+        """
+        Read one group without reading the others.
+
+        Args:
+            nombre (str): Name of the group.
+
+        Returns:
+            tuple: Scoresheet DataFrame, game week by (local, visitante) pair and rules.
+        """
+        with zipfile.ZipFile(self.ruta) as archivo:
+            try:
+                df = pd.read_csv(io.BytesIO(archivo.read(f"{nombre}/resultados.csv")), index_col=0).astype(object)
+            except KeyError:
+                raise KeyError(f"El grupo {nombre} no existe") from None
+            jornadas = pd.read_csv(io.BytesIO(archivo.read(f"{nombre}/jornadas.csv")))
+            reglas = json.loads(archivo.read(f"{nombre}/reglas.json"))
+        jornadas = {(local, visitante): int(jornada)
+                    for local, visitante, jornada in jornadas[['Local', 'Visitante', 'Jornada']].itertuples(index=False)}
+        return df, jornadas, reglas
+
+    def guardar_grupo(self, nombre, df, jornadas=None, reglas=None):
+        """
+        Add a group to the container or replace it.
+
+        Args:
+            nombre (str): Name of the group.
+            df (DataFrame): The N x N scoresheet.
+            jornadas (dict, optional): Game week by (local, visitante) pair. By default, it is inferred.
+            reglas (dict, optional): Points for a win and for a draw. By default, 3 and 1.
+        """
+        self.guardar_grupos({nombre: (df, jornadas, reglas)})
+
+    def guardar_grupos(self, grupos):
+        """
+        Add several groups to the container or replace them, in a single rewrite.
+
+        The container is rewritten to a temporary file and replaced atomically, under a lock.
+        Writing the groups together copies the other groups once, instead of once per group.
+
+        Args:
+            grupos (dict): (df, jornadas, reglas) by group name, as the arguments of guardar_grupo.
+        """
+        miembros = {}
+        for nombre, (df, jornadas, reglas) in grupos.items():
+            if not nombre or '/' in nombre or nombre == self.INDICE:
+                raise ValueError(f"Nombre de grupo no válido: {nombre!r}")
+            jornadas = inferir_jornadas(df, jornadas or {})
+            reglas = {**self.REGLAS, **(reglas or {})}
+            miembros.update({
+                f"{nombre}/resultados.csv": df.to_csv(),
+                f"{nombre}/jornadas.csv": pd.DataFrame([(local, visitante, jornada) for (local, visitante), jornada
+                                                        in jornadas.items()],
+                                                       columns=['Local', 'Visitante', 'Jornada']).to_csv(index=False),
+                f"{nombre}/reglas.json": json.dumps(reglas),
+            })
+
+        with BloqueoArchivo(self.ruta_bloqueo):
+            indice = self.grupos()
+            indice.extend(nombre for nombre in grupos if nombre not in indice)
+            temporal = self.ruta + '.tmp'
+            with zipfile.ZipFile(temporal, 'w', zipfile.ZIP_DEFLATED) as nuevo:
+                # Copy the other groups as they are
+                if os.path.exists(self.ruta):
+                    with zipfile.ZipFile(self.ruta) as actual:
+                        for info in actual.infolist():
+                            if info.filename != self.INDICE and info.filename.split('/')[0] not in grupos:
+                                nuevo.writestr(info, actual.read(info))
+                for miembro, contenido in miembros.items():
+                    nuevo.writestr(miembro, contenido)
+                nuevo.writestr(self.INDICE, json.dumps({'grupos': indice}, ensure_ascii=False))
+            os.replace(temporal, self.ruta)
+
+    def importar_liga(self, file_path, nombre=None, reglas=None):
+        """
+        Add a league file, with its logged results and game weeks, as a group of the container.
+
+        Args:
+            file_path (str): Path of the scoresheet CSV file.
+            nombre (str, optional): Name of the group. By default, the file name.
+            reglas (dict, optional): Points for a win and for a draw.
+
+        Raises:
+            ValueError: If the scoresheet does not pass the validation.
+        """
+        nombre = nombre or os.path.basename(file_path).replace('.csv', '')
+        self.importar_ligas({nombre: file_path}, reglas)
+
+    def importar_ligas(self, file_paths, reglas=None):
+        """
+        Add several league files as groups of the container, writing it once.
+
+        Every league is validated before writing, so either all of them are added or none.
+
+        Args:
+            file_paths (list or dict): Paths of the scoresheet CSV files, named after the files,
+                or paths by group name.
+            reglas (dict, optional): Points for a win and for a draw, for all the groups.
+
+        Raises:
+            ValueError: If a scoresheet does not pass the validation.
+        """
+        if not isinstance(file_paths, dict):
+            file_paths = {os.path.basename(file_path).replace('.csv', ''): file_path for file_path in file_paths}
+        grupos = {}
+        for nombre, file_path in file_paths.items():
+            liga = LigaVersionada(file_path)
+            jornadas = liga.jornadas_partidos()
+            problemas = validar_resultados(liga.df, jornadas)
+            if problemas:
+                raise ValueError(f"{file_path} no es válido:\n{informe_validacion(problemas)}")
+            grupos[nombre] = (liga.df, jornadas, reglas)
+        self.guardar_grupos(grupos)
+
+    def matrices(self, nombre):
+        """
+        Build the result matrices of one group with its own rules.
+
+        Args:
+            nombre (str): Name of the group.
+
+        Returns:
+            MatricesLiga: The matrices.
+        """
+        df, jornadas, reglas = self.leer_grupo(nombre)
+        return MatricesLiga(df, jornadas, **reglas)
+
+    def clasificacion(self, nombre):
+        """
+        Compute the standings of one group.
+
+        Args:
+            nombre (str): Name of the group.
+
+        Returns:
+            DataFrame: The table, with the same columns as the Clasificacion class.
+        """
+        return self.matrices(nombre).clasificar()
+
+    def clasificaciones(self, procesos=None):
+        """
+        Compute the standings of every group in parallel.
+
+        Args:
+            procesos (int, optional): Number of worker processes. By default, one per CPU.
+
+        Returns:
+            dict: Table by group name, in the order of the index.
+        """
+        grupos = self.grupos()
+        procesos = procesos or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            tablas = dict(executor.map(_clasificar_grupo, [(self.ruta, nombre) for nombre in grupos],
+                                       chunksize=max(1, len(grupos) // (procesos * 4))))
+        return {nombre: tablas[nombre] for nombre in grupos}
+
+
+def _multiplicador_goles(diferencia):
+    """
+    Weight of a result by its goal difference, as in the World Football Elo ratings.
+
+    Args:
+        diferencia (ndarray or int): Absolute goal difference.
+
+    Returns:
+        ndarray or float: 1 for draws and one-goal wins, 1.5 for two goals, (11 + N) / 8 for more.
+    """
+    diferencia = np.asarray(diferencia)
+    return np.where(diferencia <= 1, 1.0, np.where(diferencia == 2, 1.5, (11 + diferencia) / 8))
+
+
+class MotorElo:
+    """
+    Elo power ratings of the teams, updated in O(1) per match.
+
+    The expected result of a match depends on the rating difference plus a home advantage, and
+    the ratings move by K times the difference between the actual and the expected result,
+    weighted by the goal difference.
+    """
+
+    def __init__(self, k=20, ventaja_local=100, inicial=1500):
+        """
+        Initialize the engine.
+
+        Args:
+            k (float): K-factor, how much a single match moves the ratings.
+            ventaja_local (float): Rating points added to the home team when computing the expectation.
+            inicial (float): Rating of a team without matches.
+        """
+        self.k = k
+        self.ventaja_local = ventaja_local
+        self.inicial = inicial
+        self.ratings = {}
+        self.partidos = {}  # (local, visitante) -> (jornada, goles_local, goles_visitante)
+        self._ultimo = None  # (partido, delta) of the last rated match, while it can be reverted
+        self._controles = {}  # Game week -> ratings before its matches, from the last recalculation
+        self._por_jornada = Counter()  # Number of rated matches of every game week
+        self._ultima_jornada = 0  # Last game week with rated matches
+
+    @classmethod
+    def desde_liga(cls, liga, seguir=True, **parametros):
+        """
+        Rate the matches of a versioned league in game week order and follow its new results.
+
+        Args:
+            liga (LigaVersionada): The league.
+            seguir (bool): Whether to follow the results applied by liga.refrescar afterwards.
+            **parametros: K-factor, home advantage and initial rating, see the constructor.
+
+        Returns:
+            MotorElo: The engine.
+        """
+        motor = cls(**parametros)
+        for equipo in liga.df.index:
+            motor.ratings[equipo] = motor.inicial
+        for (local, visitante), jornada in liga.jornadas_partidos().items():
+            motor._poner((local, visitante), (jornada, *goles_resultado(liga.df.at[local, visitante])))
+        motor.recalcular()
+        if seguir:
+            liga.suscribir(motor.aplicar_entrada)
+        return motor
+
+    def esperado(self, local, visitante):
+        """
+        Expected result of the home team, between 0 (loss) and 1 (win).
+        """
+        diferencia = self.ratings.get(visitante, self.inicial) - self.ratings.get(local, self.inicial) - self.ventaja_local
+        return 1 / (1 + 10 ** (diferencia / 400))
+
+    def actualizar(self, local, visitante, goles_local, goles_visitante):
+        """
+        Update the ratings of two teams with the result of their match.
+
+        Args:
+            local (str): Home team.
+            visitante (str): Away team.
+            goles_local (int): Goals of the home team.
+            goles_visitante (int): Goals of the away team.
+
+        Returns:
+            float: Rating points won by the home team and lost by the away team.
+        """
+        resultado = 1.0 if goles_local > goles_visitante else 0.5 if goles_local == goles_visitante else 0.0
+        delta = self.k * float(_multiplicador_goles(abs(goles_local - goles_visitante))) * (resultado - self.esperado(local, visitante))
+        self.ratings[local] = self.ratings.get(local, self.inicial) + delta
+        self.ratings[visitante] = self.ratings.get(visitante, self.inicial) - delta
+        return delta
+
+    def aplicar_entrada(self, entrada):
+        """
+        Apply an entry of the log of result updates.
+
+        A new result of the latest game week is rated in O(1), and removing the last rated result,
+        as an undo does, reverts its update in O(1). Any other change, like a result of an earlier
+        game week posted late, alters the ratings of the later game weeks, so they are rated again
+        from the changed game week. Either way the ratings are the same as rating every match in
+        game week order.
+
+        Args:
+            entrada (dict): The log entry.
+        """
+        partido = (entrada['Local'], entrada['Visitante'])
+        nuevo = partido not in self.partidos
+        anterior = self.partidos[partido][0] if not nuevo else None
+        if not entrada['Resultado'] and self._ultimo is not None and self._ultimo[0] == partido:
+            delta = self._ultimo[1]
+            self.ratings[partido[0]] -= delta
+            self.ratings[partido[1]] += delta
+            self._quitar(partido)
+            self._ultimo = None
+            return
+
+        self._quitar(partido)
+        ultima_jornada = self._ultima_jornada  # Of the other matches
+        if entrada['Resultado']:
+            jornada = int(entrada['Jornada']) if entrada['Jornada'] else ultima_jornada + 1
+            self._poner(partido, (jornada, *goles_resultado(entrada['Resultado'])))
+
+        if nuevo and entrada['Resultado'] and self.partidos[partido][0] >= ultima_jornada:
+            jornada = self.partidos[partido][0]
+            self._controles = {otra: ratings for otra, ratings in self._controles.items() if otra <= jornada}
+            self._ultimo = (partido, self.actualizar(*partido, *self.partidos[partido][1:]))
+        else:
+            cambiadas = [jornada for jornada in (anterior, self.partidos.get(partido, (None,))[0]) if jornada is not None]
+            if cambiadas:  # Removing a result that was never rated changes nothing
+                self.recalcular(min(cambiadas))
+
+    def _poner(self, partido, datos):
+        """
+        Add a match to the known matches, keeping the last game week with matches.
+        """
+        self.partidos[partido] = datos
+        self._por_jornada[datos[0]] += 1
+        self._ultima_jornada = max(self._ultima_jornada, datos[0])
+
+    def _quitar(self, partido):
+        """
+        Remove a match from the known matches, if it is one, keeping the last game week with matches.
+        """
+        if partido not in self.partidos:
+            return
+        jornada = self.partidos.pop(partido)[0]
+        self._por_jornada[jornada] -= 1
+        if not self._por_jornada[jornada]:
+            del self._por_jornada[jornada]
+            if jornada == self._ultima_jornada:
+                self._ultima_jornada = max(self._por_jornada, default=0)
+
+    def recalcular(self, desde=None):
+        """
+        Rate again the known matches in game week order.
+
+        The ratings before each game week are kept, so a change in a game week only rates again
+        the matches from that game week onwards.
+
+        Args:
+            desde (int, optional): First game week whose matches changed. By default, every
+                match is rated again starting from the initial ratings.
+        """
+        inicio = max((jornada for jornada in self._controles if jornada <= desde), default=None) \
+            if desde is not None else None
+        iniciales = dict.fromkeys(self.ratings, self.inicial)
+        if inicio is None:
+            self.ratings, self._controles = iniciales, {}
+        else:
+            self.ratings = {**iniciales, **self._controles[inicio]}
+            self._controles = {jornada: ratings for jornada, ratings in self._controles.items() if jornada < inicio}
+        self._ultimo = None
+
+        for partido, datos in sorted(self.partidos.items(), key=lambda item: item[1][0]):
+            if inicio is not None and datos[0] < inicio:
+                continue
+            if datos[0] not in self._controles:
+                self._controles[datos[0]] = dict(self.ratings)
+            self.actualizar(*partido, *datos[1:])
+
+    def rating(self, equipo):
+        """
+        Get the current rating of a team.
+        """
+        return self.ratings.get(equipo, self.inicial)
+
+
+def ajustar_elo(temporadas, ks=(10, 20, 30, 40), ventajas=(0, 50, 100, 150), inicial=1500, regresion=0.0):
+    """
+    Rate several seasons for every combination of K-factor and home advantage at once.
+
+    The ratings of all the combinations are kept in one array and updated together. The matches
+    of the same game week involve different teams, so each game week is applied as a single
+    vectorized step. Seasons are rated in order, carrying the ratings over.
+
+    Args:
+        temporadas (list): DataFrames with 'Jornada', 'Local', 'Visitante', 'GolesLocal' and
+            'GolesVisitante', one per season, in chronological order.
+        ks (iterable): K-factors to try.
+        ventajas (iterable): Home advantages to try.
+        inicial (float): Rating of a team without matches.
+        regresion (float): Fraction of the distance to the initial rating removed between seasons.
+
+    Returns:
+        tuple: DataFrame with the Brier score of each combination, best first, and the final
+            ratings of the best combination by team.
+    """
+    rejilla = np.array(list(itertools.product(ks, ventajas)), dtype=float)
+    k, ventaja = rejilla[:, 0:1], rejilla[:, 1:2]
+    equipos = sorted(set().union(*(set(t['Local']) | set(t['Visitante']) for t in temporadas)))
+    indices = {equipo: i for i, equipo in enumerate(equipos)}
+    ratings = np.full((len(rejilla), len(equipos)), float(inicial))
+    error = np.zeros(len(rejilla))
+    total = 0
+
+    for temporada in temporadas:
+        ratings = ratings - regresion * (ratings - inicial)
+        for _, jornada in temporada.groupby('Jornada', sort=True):
+            local = jornada['Local'].map(indices).to_numpy()
+            visitante = jornada['Visitante'].map(indices).to_numpy()
+            goles_local = jornada['GolesLocal'].to_numpy()
+            goles_visitante = jornada['GolesVisitante'].to_numpy()
+
+            # A team playing twice in a game week would need two sequential steps
+            pasos = [np.arange(len(local))]
+            if len(set(local) | set(visitante)) < 2 * len(local):
+                pasos = [[i] for i in range(len(local))]
+
+            for paso in pasos:
+                esperado = 1 / (1 + 10 ** ((ratings[:, visitante[paso]] - ratings[:, local[paso]] - ventaja) / 400))
+                resultado = np.sign(goles_local[paso] - goles_visitante[paso]) * 0.5 + 0.5
+                delta = k * _multiplicador_goles(np.abs(goles_local[paso] - goles_visitante[paso])) * (resultado - esperado)
+                np.add.at(ratings, (slice(None), local[paso]), delta)
+                np.add.at(ratings, (slice(None), visitante[paso]), -delta)
+                error += ((resultado - esperado) ** 2).sum(axis=1)
+                total += len(paso)
+
+    resultados = pd.DataFrame({'K': rejilla[:, 0], 'VENTAJA': rejilla[:, 1], 'BRIER': error / max(total, 1)})
+    mejor = int(resultados['BRIER'].idxmin())
+    resultados = resultados.sort_values(by='BRIER').reset_index(drop=True)
+    return resultados, dict(zip(equipos, ratings[mejor].tolist()))
+
+
+def partidos_temporada(file_path):
+    """
+    List the matches of a league file in the format used by ajustar_elo.
+
+    Args:
+        file_path (str): Path of the scoresheet CSV file.
+
+    Returns:
+        DataFrame: 'Jornada', 'Local', 'Visitante', 'GolesLocal' and 'GolesVisitante' for every result.
+    """
+    liga = LigaVersionada(file_path)
+    filas = [(jornada, local, visitante, *goles_resultado(liga.df.at[local, visitante]))
+             for (local, visitante), jornada in liga.jornadas_partidos().items()]
+    return pd.DataFrame(filas, columns=['Jornada', 'Local', 'Visitante', 'GolesLocal', 'GolesVisitante'])
+
+
+class ComparativaTemporadas:
+    """
+    The points and positions of many seasons as aligned season x team x game week arrays.
+
+    Each season is loaded once. Teams are aligned by name over the union of the teams of all
+    the seasons, and game weeks by number. A team that did not play a season, and the game weeks
+    after the last one with results or beyond the length of a season, are NaN. Comparisons are
+    computed on the arrays for all the seasons at once.
+    """
+
+    def __init__(self, temporadas):
+        """
+        Align the histories of several seasons.
+
+        Args:
+            temporadas (dict): By season name, in chronological order, a tuple with the list of
+                teams and the team x game week arrays of accumulated points and of positions.
+        """
+        self.temporadas = list(temporadas)
+        self.equipos = sorted(set().union(*(equipos for equipos, _, _ in temporadas.values())))
+        self.indices = {equipo: i for i, equipo in enumerate(self.equipos)}
+        total = max((puntos.shape[1] for _, puntos, _ in temporadas.values()), default=0)
+
+        forma = (len(self.temporadas), len(self.equipos), total)
+        self.puntos = np.full(forma, np.nan)  # Accumulated points after each game week
+        self.posiciones = np.full(forma, np.nan)  # Position after each game week
+        for s, (equipos, puntos, posiciones) in enumerate(temporadas.values()):
+            filas = [self.indices[equipo] for equipo in equipos]
+            self.puntos[s, filas, :puntos.shape[1]] = puntos
+            self.posiciones[s, filas, :posiciones.shape[1]] = posiciones
+
+    @classmethod
+    def desde_archivos(cls, file_paths, **reglas):
+        """
+        Load the histories of several league files.
+
+        Args:
+            file_paths (list): Paths of the scoresheet CSV files, one per season, in chronological order.
+            **reglas: Points for a win and for a draw, see MatricesLiga.
+
+        Returns:
+            ComparativaTemporadas: The aligned histories, with the file names as season names.
+        """
+        temporadas = {}
+        for file_path in file_paths:
+            nombre = os.path.basename(file_path).replace('.csv', '')
+            temporadas[nombre] = cls.historia_liga(LigaVersionada(file_path), **reglas)
+        return cls(temporadas)
+
+    @staticmethod
+    def historia_liga(liga, **reglas):
+        """
+        Compute the accumulated points and the position of every team after every game week.
+
+        Args:
+            liga (LigaVersionada): The league.
+            **reglas: Points for a win and for a draw, see MatricesLiga.
+
+        Returns:
+            tuple: The teams, and the team x game week arrays of points and positions. Game weeks
+                after the last one with results are NaN.
+        """
+        historico = HistoricoJornadas.desde_liga(liga, seguir=False, **reglas)
+        matrices = historico.matrices
+        n, jugadas = len(matrices.equipos), int(matrices.jornada.max(initial=0))
+
+        # Points won by each team in each game week, from the home and away side of every match
+        local, visitante = np.nonzero(matrices.jugado & (matrices.jornada > 0))
+        jornada = matrices.jornada[local, visitante] - 1
+        goles_local = matrices.goles_local[local, visitante]
+        goles_visitante = matrices.goles_visitante[local, visitante]
+        empate = np.where(goles_local == goles_visitante, matrices.puntos_empate, 0)
+        ganados = np.zeros((n, historico.total))
+        np.add.at(ganados, (local, jornada), np.where(goles_local > goles_visitante, matrices.puntos_victoria, empate))
+        np.add.at(ganados, (visitante, jornada), np.where(goles_local < goles_visitante, matrices.puntos_victoria, empate))
+        puntos = ganados.cumsum(axis=1)
+
+        posiciones = np.full((n, historico.total), np.nan)
+        if jugadas:
+            historica = historico.historica()
+            historica = historica[historica['Jornada'] <= jugadas]
+            posiciones[historica['Equipo'].map(matrices.indices).to_numpy(), historica['Jornada'].to_numpy() - 1] = \
+                historica['Posicion'].to_numpy()
+        puntos[:, jugadas:] = np.nan
+        return matrices.equipos, puntos, posiciones
+
+    def jugadas(self):
+        """
+        Get the last game week with results of every season.
+
+        Returns:
+            ndarray: The game week of each season, 0 if it has no results.
+        """
+        con_datos = ~np.isnan(self.puntos).all(axis=1)
+        return np.where(con_datos.any(axis=1), con_datos.shape[1] - np.argmax(con_datos[:, ::-1], axis=1), 0)
+
+    def serie(self, equipo, magnitud='puntos'):
+        """
+        Get the curve of a team in every season.
+
+        Args:
+            equipo (str): The team.
+            magnitud (str): 'puntos' or 'posiciones'.
+
+        Returns:
+            DataFrame: One column per season and one row per game week, starting at 1.
+        """
+        valores = getattr(self, magnitud)[:, self.indices[equipo], :]
+        return pd.DataFrame(valores.T, index=range(1, valores.shape[1] + 1), columns=self.temporadas)
+
+    def ritmo(self, temporada=-1, referencias=None):
+        """
+        Compare the points of every team after the last game week of a season with their points
+        after the same game week of other seasons.
+
+        Args:
+            temporada (int): Index of the season, by default the last one.
+            referencias (list, optional): Indices of the seasons to compare with, by default all
+                the previous ones.
+
+        Returns:
+            DataFrame: For every team of the season, its points, the mean, best and worst points
+                of the references, the difference with the mean and the number of references in
+                which the team played. Teams are sorted by difference.
+        """
+        temporada = range(len(self.temporadas))[temporada]
+        if referencias is None:
+            referencias = list(range(temporada))
+        jornada = int(self.jugadas()[temporada])
+        if not jornada:
+            return pd.DataFrame(columns=['EQUIPO', 'PTS', 'MEDIA', 'MEJOR', 'PEOR', 'DIF', 'TEMPORADAS'])
+
+        actuales = self.puntos[temporada, :, jornada - 1]
+        previos = self.puntos[referencias, :, jornada - 1]
+        if not len(previos):
+            previos = np.full((1, len(self.equipos)), np.nan)  # Without references the comparison is NaN
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # Teams without references give NaN
+            tabla = pd.DataFrame({'EQUIPO': self.equipos, 'PTS': actuales, 'MEDIA': np.nanmean(previos, axis=0),
+                                  'MEJOR': np.nanmax(previos, axis=0), 'PEOR': np.nanmin(previos, axis=0)})
+        tabla['DIF'] = tabla['PTS'] - tabla['MEDIA']
+        tabla['TEMPORADAS'] = (~np.isnan(previos)).sum(axis=0)
+        tabla = tabla[~np.isnan(actuales)].sort_values(by=['DIF', 'PTS'], ascending=False, na_position='last')
+        return tabla.reset_index(drop=True).round(2)
+
+    def rachas(self, longitud=5):
+        """
+        Find the best and worst runs of consecutive game weeks of every team in every season.
+
+        Args:
+            longitud (int): Number of game weeks of a run.
+
+        Returns:
+            DataFrame: For every season and team, the most and fewest points won in a run and the
+                first game week of each run. Seasons shorter than a run are left out.
+        """
+        # Points of every window of game weeks, from the difference of the accumulated points
+        acumulados = np.concatenate([np.zeros(self.puntos.shape[:2] + (1,)), self.puntos], axis=2)
+        ventanas = acumulados[:, :, longitud:] - acumulados[:, :, :-longitud]
+        validas = ~np.isnan(ventanas)
+        if not validas.any():
+            return pd.DataFrame(columns=['TEMPORADA', 'EQUIPO', 'MEJOR', 'DESDE_MEJOR', 'PEOR', 'DESDE_PEOR'])
+
+        temporada, equipo = np.nonzero(validas.any(axis=2))
+        mejor = np.where(validas, ventanas, -np.inf)[temporada, equipo]
+        peor = np.where(validas, ventanas, np.inf)[temporada, equipo]
+        return pd.DataFrame({'TEMPORADA': [self.temporadas[s] for s in temporada],
+                             'EQUIPO': [self.equipos[e] for e in equipo],
+                             'MEJOR': mejor.max(axis=1).astype(int), 'DESDE_MEJOR': mejor.argmax(axis=1) + 1,
+                             'PEOR': peor.min(axis=1).astype(int), 'DESDE_PEOR': peor.argmin(axis=1) + 1})
+
+    def posicion_media(self, referencias=None):
+        """
+        Compute the average position of every team after every game week.
+
+        Args:
+            referencias (list, optional): Indices of the seasons to average, by default all of them.
+
+        Returns:
+            DataFrame: One row per team and one column per game week, starting at 1. Teams without
+                any position are left out.
+        """
+        posiciones = self.posiciones if referencias is None else self.posiciones[referencias]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # Game weeks that no season reached give NaN
+            medias = np.nanmean(posiciones, axis=0)
+        tabla = pd.DataFrame(medias, index=self.equipos, columns=range(1, medias.shape[1] + 1))
+        return tabla.dropna(how='all').round(2)
+
+
+class TablaClasificacion:
+    """
+    A standings table that only redraws the rows that changed.
+
+    The table is a Treeview with one row per team. Each update is compared with the rows shown:
+    only the teams whose values or position changed are rewritten, and only the rows out of place
+    are moved, so the cost of a redraw depends on the number of changes and not on the size of
+    the league. A team that went up or down since the previous update is shown with an arrow and
+    a colour.
+    """
+
+    COLORES = {'sube': '#d4f4cc', 'baja': '#f8d3cf'}  # Background of the rows that moved
+
+    def __init__(self, master, columnas):
+        """
+        Create the table.
+
+        Args:
+            master (tk.Widget): The parent widget.
+            columnas (list): Columns of the standings, 'EQUIPO' among them.
+        """
+        self.columnas = list(columnas)
+        self.arbol = ttk.Treeview(master, columns=['POS', 'MOV'] + self.columnas, show='headings')
+        for columna in ['POS', 'MOV'] + self.columnas:
+            self.arbol.heading(columna, text=columna)
+            self.arbol.column(columna, width=140 if columna == 'EQUIPO' else 50,
+                              anchor='w' if columna == 'EQUIPO' else 'center', stretch=columna == 'EQUIPO')
+        for etiqueta, color in self.COLORES.items():
+            self.arbol.tag_configure(etiqueta, background=color)
+
+        self.filas = {}  # Team -> (position, movement, values) shown
+
+    def cambios(self, tabla):
+        """
+        Compare a new table with the rows shown.
+
+        Args:
+            tabla (DataFrame): The standings, indexed by position.
+
+        Returns:
+            tuple: Rows to draw, as a dictionary of team -> (position, movement, values), and
+                teams no longer in the table.
+        """
+        nuevas = {}
+        for posicion, fila in zip(tabla.index, tabla[self.columnas].itertuples(index=False)):
+            valores = tuple(fila)
+            equipo = valores[self.columnas.index('EQUIPO')]
+            anterior = self.filas.get(equipo)
+            movimiento = anterior[0] - posicion if anterior else 0
+            if anterior != (posicion, movimiento, valores):
+                nuevas[equipo] = (posicion, movimiento, valores)
+        retirados = set(self.filas) - set(tabla['EQUIPO'])
+        return nuevas, retirados
+
+    def actualizar(self, tabla):
+        """
+        Show a new table, redrawing only the rows that changed.
+
+        Args:
+            tabla (DataFrame): The standings, indexed by position.
+
+        Returns:
+            int: Number of rows redrawn.
+        """
+        nuevas, retirados = self.cambios(tabla)
+        for equipo in retirados:
+            self.arbol.delete(equipo)
+            del self.filas[equipo]
+
+        for equipo, (posicion, movimiento, valores) in nuevas.items():
+            flecha = f"▲{movimiento}" if movimiento > 0 else f"▼{-movimiento}" if movimiento < 0 else ''
+            etiquetas = ('sube',) if movimiento > 0 else ('baja',) if movimiento < 0 else ()
+            if equipo not in self.filas:
+                self.arbol.insert('', 'end', iid=equipo)
+            self.arbol.item(equipo, values=(posicion, flecha, *valores), tags=etiquetas)
+            self.filas[equipo] = (posicion, movimiento, valores)
+
+        # Walk the new order and move only the rows that are not in their place. Unchanged rows
+        # are moved too when the rows around them changed places
+        hijos = list(self.arbol.get_children())
+        for indice, equipo in enumerate(tabla['EQUIPO']):
+            if hijos[indice] != equipo:
+                # Detached first, so the index is counted without the row itself
+                self.arbol.detach(equipo)
+                self.arbol.move(equipo, '', indice)
+                hijos.remove(equipo)
+                hijos.insert(indice, equipo)
+        return len(nuevas)
+
+
+class VisualizarClasificacion(Clasificacion):
+    """
+    A class for visualizing and managing the league classification.
+
+    This class creates a window for viewing and updating the league standings based on match results.
+    The calculation and tie-breaking rules are inherited from the Clasificacion class. The
+    window checks every few seconds for results posted by other users and updates the table.
+    """
+
+    INTERVALO_SONDEO = 2000  # Milliseconds between two checks for new results
+
+    def __init__(self, master):
+        """
+        Initialize the Visualizar Clasificacion window.
+
+        Args:
+            master (tk.Tk or tk.Toplevel): The parent window for this interface.
+        """
+        super().__init__()
+        self.master = tk.Toplevel(master)  # Create a new top-level window
+        self.master.title("Visualizar Clasificacion")  # Set the window title
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)  # Define the close protocol
+
+        self.file_path = ""
+        self.file_name = ""
+        self.liga = None
+        self.estadisticas = None
+        self.elo = None
+        self.matrices = None
+        self.tabla = None  # Standings table widget
+        self.sondeo = None  # Scheduled check for results posted by other users
+
+        # Create and update the classification view, unless the results cannot be read
+        if self.createClasificacion() is not False:
+            self.updateClasificacion()
+
+    def on_close(self):
+        """
+        Handle the close event of the window.
+
+        This method brings back the main application window and closes the current window.
+        """
+        if self.sondeo is not None:
+            self.master.after_cancel(self.sondeo)  # Stop checking for new results
+        self.master.master.deiconify()  # Restore the main application window
+        self.master.destroy()  # Close the current window
+
+    def createClasificacion(self):
+        """
+        Create the initial league classification structure.
+
+        This method sets up the initial DataFrame for the league classification by loading match results from a CSV file.
+
+        Returns:
+            bool: False if the results of the file cannot be read and the window was closed.
+        """
+        # Open a file dialog to select a CSV file containing match results
+        self.file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+        if self.file_path:
+            # Extract the file name from the path and load the CSV file into a DataFrame
+            self.file_name = self.file_path.split('/')[-1].replace('.csv', '')
+            self.liga = LigaVersionada(self.file_path)
+            self.df = self.liga.df
+            if not comprobar_liga(self.liga):
+                self.on_close()
+                return False
+
+            # Build the home/away tables, form, streaks and ratings, kept up to date with every new result
+            self.estadisticas = EstadisticasLiga.desde_liga(self.liga)
+            self.elo = MotorElo.desde_liga(self.liga)
+            self.matrices = MatricesLiga.desde_liga(self.liga)
+
+        self.iniciarClasificacion()
+
+    def updateClasificacion(self):
+        """
+        Update the league classification with match results.
+
+        This method sets up the classification window, calculates the standings from the
+        loaded DataFrame and displays them.
+        """
+        # Set the window size and position
+        screen_width = self.master.winfo_screenwidth()
+        screen_height = self.master.winfo_screenheight()
+        width = screen_width // 2
+        height = screen_height // 2
+        self.master.geometry(f'{width}x{height}')
+        x_left = (screen_width - width) // 2
+        y_top = (screen_height - height) // 2
+        self.master.geometry(f'+{x_left}+{y_top}')
+
+        # Create and position the tabs for the classification and the derived statistics
+        self.pestanas = ttk.Notebook(self.master)
+        self.pestanas.place(x=10, y=10, width=width - 20, height=height - 60)
+
+        # Create the table for the classification and the text widgets for the statistics
+        self.tabla = TablaClasificacion(self.pestanas, MatricesLiga.COLUMNAS + ['ELO'])
+        self.pestanas.add(self.tabla.arbol, text="General")
+        self.textos_estadisticas = {}
+        for pestana in ["Local", "Visitante", "Forma y rachas", "Objetivos"]:
+            self.textos_estadisticas[pestana] = tk.Text(self.pestanas, height=height, width=width, wrap='none')
+            self.pestanas.add(self.textos_estadisticas[pestana], text=pestana)
+        self.pendientes = set()  # Statistics tabs whose data changed since they were last shown
+        self.pestanas.bind('<<NotebookTabChanged>>', lambda event: self.mostrarEstadisticas())
+
+        # Create and position the 'Guardar clasificacion' button
+        self.boton_historica = tk.Button(self.master, text="Guardar clasificacion", command=self.guardar_historica)
+        self.boton_historica.place(x=10, y=height - 50, width=width - 20, height=30)
+
+        # Calculate the standings and apply the tie-breaking rules
+        self.calcularClasificacion()
+
+        # If a file path is set, display the updated classification and keep it up to date
+        if self.file_path:
+            self.file_name = self.file_path.split('/')[-1].replace('.csv', '')
+            self.mostrarClasificacion()
+            self.mostrarEstadisticas(self.textos_estadisticas)
+            self.sondeo = self.master.after(self.INTERVALO_SONDEO, self.sondear)
+
+    def mostrarClasificacion(self):
+        """
+        Display the classification, with the rating of each team next to its standings.
+
+        Only the rows that changed since the last display are redrawn.
+        """
+        elo = self.clasificacion['EQUIPO'].map(lambda equipo: round(self.elo.rating(equipo)))
+        self.tabla.actualizar(self.clasificacion.assign(ELO=elo))
+
+    def sondear(self):
+        """
+        Apply the results posted by other users since the last check and show the changes.
+
+        The statistics, ratings and matrices follow the new results incrementally, and the
+        classification is ranked again from the matrices, with the same rules. Of the statistics
+        tabs, only the one shown is rendered again.
+        """
+        if self.liga.refrescar():
+            self.clasificacion = self.matrices.clasificar()
+            self.mostrarClasificacion()
+            self.mostrarEstadisticas(self.textos_estadisticas)
+        self.sondeo = self.master.after(self.INTERVALO_SONDEO, self.sondear)
+
+    def mostrarEstadisticas(self, cambiadas=()):
+        """
+        Display the home-only and away-only tables, the form, the streaks and the positions
+        secured or lost by every team in their tabs.
 
-        # Check if the goal average is negative
-        elif average < 0:
-            # Find the indices of the two teams in the main classification
-            indice_2 = self.clasificacion[self.clasificacion['EQUIPO'] == equipo1].index[0]
-            indice_1 = self.clasificacion[self.clasificacion['EQUIPO'] == equipo2].index[0]
-            # Check if the team with higher goal average should be moved up in the classification
-            if indice_1 < indice_2:
-                return
-            # Swap the positions of the two teams in the classification
-            a, b = self.clasificacion.iloc[indice_1 - 1].copy(), self.clasificacion.iloc[indice_2 - 1].copy()
-            self.clasificacion.iloc[indice_1 - 1], self.clasificacion.iloc[indice_2 - 1] = b, a
+        A tab is only rendered while it is shown. The tabs whose data changed while hidden are
+        rendered when they are selected, so the positions secured or lost, the most expensive
+        of them, are not computed again for every new result.
 
-        # Handle the case when goal average is zero
-        else:
-            self.equiposTemp = self.par['EQUIPO'].tolist()
-            self.par = self.par.sort_values(by=['PTS', 'DIF', 'GF', 'EQUIPO'],
-                                            ascending=[False, False, False, True])
-            posicons_empatades = []
-            for i in self.equiposTemp:
-                posicion = self.clasificacion.index[self.clasificacion['EQUIPO'] == i].tolist()[0]
-                posicons_empatades.append(posicion)
-            equipos_reordenados = self.par['EQUIPO'].tolist()
-            for i, posicion in enumerate(posicons_empatades):
-                equipo = equipos_reordenados[i]
-                equipo_stats = self.par[self.par['EQUIPO'] == equipo].iloc[0]
-                # Update each statistic for the team in the main classification
-                for columna in ['EQUIPO', 'PJ', 'PG', 'PE', 'PP', 'GF', 'GC', 'DIF', 'PTS']:
-                    self.clasificacion.at[posicion, columna] = equipo_stats[columna]
+        Args:
+            cambiadas (iterable): Tabs whose data changed since they were last shown.
+        """
+        self.pendientes.update(cambiadas)
+        pestana = self.pestanas.tab(self.pestanas.select(), 'text')
+        if pestana not in self.pendientes:
+            return
+        self.pendientes.discard(pestana)
+
+        tablas = {"Local": self.estadisticas.tabla_local,
+                  "Visitante": self.estadisticas.tabla_visitante,
+                  "Forma y rachas": self.estadisticas.forma_rachas,
+                  "Objetivos": lambda: ObjetivosMatematicos(self.matrices).tabla()}
+        texto = self.textos_estadisticas[pestana]
+        texto.config(state=tk.NORMAL)
+        texto.delete('1.0', tk.END)
+        texto.insert(tk.END, tablas[pestana]().to_string())
+        texto.config(state=tk.DISABLED)
 
 
     def guardar_historica(self):
@@ -942,7 +4287,7 @@ class VisualizarLiga:
         if file_path:
             file_name = file_path.split('/')[-1].replace('.csv', '')  # Extract the file name
 
-            df = pd.read_csv(file_path, index_col=0)  # Load the CSV file into a pandas DataFrame
+            df = LigaVersionada(file_path).df  # Load the CSV file and its logged updates into a pandas DataFrame
 
             # Update the text widget with the DataFrame's content
             self.texto_df.config(state=tk.NORMAL)
@@ -955,6 +4300,1078 @@ class VisualizarLiga:
             self.nombre_archivo_label.pack()
 
 
+def _valor_json(valor):
+    """
+    Convert NumPy and pandas values into plain Python values for JSON serialization.
+    """
+    if isinstance(valor, np.integer):
+        return int(valor)
+    if isinstance(valor, np.floating):
+        return None if np.isnan(valor) else float(valor)
+    if valor is pd.NA or valor is pd.NaT:
+        return None
+    raise TypeError(f"Valor no serializable: {valor!r}")
+
+
+def _registros_json(df):
+    """
+    Convert a DataFrame into a list of records, replacing missing values by None.
+    """
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def documentos_liga(file_path):
+    """
+    Compute the JSON documents exposed for a league.
+
+    Args:
+        file_path (str): Path of the scoresheet CSV file.
+
+    Returns:
+        tuple: Documents for the standings, scoresheet, head-to-head records, position history
+            and home/away tables, form and streaks, and the standings after every game week.
+    """
+    liga = LigaVersionada(file_path)
+    df = liga.df
+    motor = Clasificacion(df)
+
+    # Standings with their position as an explicit field
+    clasificacion = motor.clasificacion.copy()
+    clasificacion.insert(0, 'POS', clasificacion.index)
+
+    # Scoresheet as a nested mapping local -> visitante -> resultado
+    resultados = {local: {visitante: (df.at[local, visitante] if pd.notna(df.at[local, visitante]) else None)
+                          for visitante in df.columns}
+                  for local in df.index}
+
+    # Position history if the league has one
+    historica = []
+    if os.path.isfile(ruta_historica(file_path)):
+        historica = _registros_json(pd.read_csv(ruta_historica(file_path)))
+
+    # The league is read once, so the derived data does not follow it
+    estadisticas = EstadisticasLiga.desde_liga(liga, seguir=False)
+    historico = HistoricoJornadas.desde_liga(liga, seguir=False)
+    if historico.total:
+        historico.como_en(historico.total)  # Build every snapshot before serving them
+
+    documentos = {
+        'clasificacion': _registros_json(clasificacion),
+        'resultados': {'equipos': list(df.index), 'resultados': resultados},
+        'enfrentamientos': _registros_json(motor.ga),
+        'historica': historica,
+        'estadisticas': {'local': _registros_json(estadisticas.tabla_local()),
+                         'visitante': _registros_json(estadisticas.tabla_visitante()),
+                         'forma': _registros_json(estadisticas.forma_rachas())},
+    }
+    return documentos, historico
+
+
+class SnapshotLiga:
+    """
+    An immutable snapshot of the JSON documents of a league.
+
+    Each document is serialized once when the snapshot is built, together with its ETag,
+    so readers only copy bytes and never recompute the standings.
+    """
+
+    __slots__ = ('firma', 'recursos', 'matrices', 'historico')
+
+    def __init__(self, firma, documentos, matrices, historico):
+        """
+        Serialize the documents of the snapshot.
+
+        Args:
+            firma (tuple): Signature of the league files the snapshot was built from.
+            documentos (dict): Documents by resource name.
+            matrices (MatricesLiga): Matrices of the league, used for the standings queries.
+                They must not be modified once the snapshot is built.
+            historico (HistoricoJornadas): Standings after every game week, already built.
+        """
+        recursos = {}
+        for nombre, documento in documentos.items():
+            cuerpo = json.dumps(documento, ensure_ascii=False, default=_valor_json).encode('utf-8')
+            etag = '"' + hashlib.sha1(cuerpo).hexdigest() + '"'
+            recursos[nombre] = (cuerpo, etag)
+        object.__setattr__(self, 'firma', firma)
+        object.__setattr__(self, 'recursos', MappingProxyType(recursos))
+        object.__setattr__(self, 'matrices', matrices)
+        object.__setattr__(self, 'historico', historico)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("SnapshotLiga es inmutable")
+
+
+class CacheClasificaciones:
+    """
+    A cache of league snapshots that recomputes a league only when its files change.
+
+    The files are checked at most once per interval, and while a league is being recomputed
+    the other readers keep being served the previous snapshot.
+    """
+
+    def __init__(self, directorio, intervalo=0.5):
+        """
+        Initialize the cache.
+
+        Args:
+            directorio (str): Directory containing the league CSV files.
+            intervalo (float): Minimum number of seconds between two checks of the same league.
+        """
+        self.directorio = directorio
+        self.intervalo = intervalo
+        self._entradas = {}  # file_path -> [snapshot, last check]
+        self._bloqueos = {}  # file_path -> lock used while recomputing
+        self._bloqueo = threading.Lock()
+
+    def ligas(self):
+        """
+        List the leagues available in the directory.
+
+        Returns:
+            list: League names, i.e. scoresheet file names without the .csv extension.
+        """
+        return sorted(nombre[:-len('.csv')] for nombre in os.listdir(self.directorio)
+                      if nombre.endswith('.csv') and not es_archivo_auxiliar(os.path.join(self.directorio, nombre)))
+
+    def ruta(self, nombre):
+        """
+        Get the path of the scoresheet of a league, or None if it does not exist.
+        """
+        if nombre != os.path.basename(nombre) or es_archivo_auxiliar(os.path.join(self.directorio, nombre)):
+            return None
+        file_path = os.path.join(self.directorio, f"{nombre}.csv")
+        return file_path if os.path.isfile(file_path) else None
+
+    def obtener(self, nombre):
+        """
+        Get the current snapshot of a league.
+
+        Args:
+            nombre (str): Name of the league.
+
+        Returns:
+            SnapshotLiga: The snapshot, or None if the league does not exist.
+        """
+        file_path = self.ruta(nombre)
+        if file_path is None:
+            return None
+
+        ahora = time.monotonic()
+        entrada = self._entradas.get(file_path)
+        if entrada is not None and ahora - entrada[1] < self.intervalo:
+            return entrada[0]
+
+        firma = firma_archivos(archivos_liga(file_path))
+        if entrada is not None and entrada[0].firma == firma:
+            entrada[1] = ahora
+            return entrada[0]
+
+        with self._bloqueo:
+            bloqueo = self._bloqueos.setdefault(file_path, threading.Lock())
+
+        # Only one reader recomputes; the others keep the previous snapshot if there is one
+        if not bloqueo.acquire(blocking=entrada is None):
+            return entrada[0]
+        try:
+            entrada = self._entradas.get(file_path)
+            if entrada is None or entrada[0].firma != firma:
+                documentos, historico = documentos_liga(file_path)
+                entrada = [SnapshotLiga(firma, documentos, historico.matrices, historico), ahora]
+                self._entradas[file_path] = entrada
+            return entrada[0]
+        finally:
+            bloqueo.release()
+
+
+class ManejadorClasificaciones(BaseHTTPRequestHandler):
+    """
+    HTTP request handler serving league snapshots as read-only JSON.
+
+    Routes:
+        /ligas: List of available leagues.
+        /ligas/<liga>/<recurso>: One of 'clasificacion', 'resultados', 'enfrentamientos', 'historica'
+            or 'estadisticas'. The standings as of a game week are served with 'clasificacion?jornada=N'.
+        /ligas/<liga>/consulta: Standings of a subset, with the optional parameters 'equipos' and
+            'excluir' (comma-separated teams) and 'desde' and 'hasta' (game weeks).
+    """
+
+    protocol_version = 'HTTP/1.1'  # Keep connections alive for polling clients
+
+    def do_GET(self):
+        """
+        Handle a GET request.
+        """
+        partes = [parte for parte in urlparse(self.path).path.split('/') if parte]
+        cache = self.server.cache
+
+        if partes == ['ligas']:
+            cuerpo = json.dumps({'ligas': cache.ligas()}, ensure_ascii=False).encode('utf-8')
+            self.enviar(200, cuerpo)
+            return
+
+        if len(partes) != 3 or partes[0] != 'ligas':
+            self.enviar_error(404, "Ruta no encontrada")
+            return
+
+        try:
+            snapshot = cache.obtener(partes[1])
+        except Exception as error:
+            self.enviar_error(500, f"No se ha podido calcular la liga: {error}")
+            return
+        parametros = parse_qs(urlparse(self.path).query)
+        if snapshot is not None and partes[2] == 'clasificacion' and 'jornada' in parametros:
+            try:
+                tabla = snapshot.historico.tabla(int(parametros['jornada'][0]))
+            except (IndexError, ValueError) as error:
+                self.enviar_error(400, f"Jornada no válida: {error}")
+                return
+            tabla.insert(0, 'POS', tabla.index)
+            cuerpo = json.dumps(_registros_json(tabla), ensure_ascii=False, default=_valor_json).encode('utf-8')
+            etag = '"' + hashlib.sha1(cuerpo).hexdigest() + '"'
+        elif snapshot is not None and partes[2] == 'consulta':
+            try:
+                cuerpo = self.consultar(snapshot.matrices, parametros)
+            except (KeyError, ValueError) as error:
+                self.enviar_error(400, f"Consulta no válida: {error}")
+                return
+            etag = '"' + hashlib.sha1(cuerpo).hexdigest() + '"'
+        elif snapshot is None or partes[2] not in snapshot.recursos:
+            self.enviar_error(404, "Liga o recurso no encontrado")
+            return
+        else:
+            cuerpo, etag = snapshot.recursos[partes[2]]
+        if etag in [valor.strip() for valor in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.enviar(200, cuerpo, etag)
+
+    def consultar(self, matrices, parametros):
+        """
+        Compute a standings query from the matrices of a snapshot.
+
+        Args:
+            matrices (MatricesLiga): The matrices of the league.
+            parametros (dict): Query string parameters.
+
+        Returns:
+            bytes: The table as JSON.
+        """
+        def lista(nombre):
+            return parametros[nombre][0].split(',') if nombre in parametros else None
+
+        jornadas = None
+        if 'desde' in parametros or 'hasta' in parametros:
+            jornadas = (int(parametros.get('desde', ['1'])[0]),
+                        int(parametros.get('hasta', [str(matrices.jornada.max())])[0]))
+        tabla = matrices.consultar(lista('equipos'), jornadas, lista('excluir'))
+        tabla.insert(0, 'POS', tabla.index)
+        return json.dumps(_registros_json(tabla), ensure_ascii=False, default=_valor_json).encode('utf-8')
+
+    def enviar(self, estado, cuerpo, etag=None):
+        """
+        Send a JSON response.
+        """
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.send_header('Cache-Control', 'no-cache')
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def enviar_error(self, estado, mensaje):
+        """
+        Send a JSON error response.
+        """
+        self.enviar(estado, json.dumps({'error': mensaje}, ensure_ascii=False).encode('utf-8'))
+
+    def log_message(self, format, *args):
+        # Polling dashboards would flood the console with one line per request
+        pass
+
+
+class ServidorClasificaciones(ThreadingHTTPServer):
+    """
+    Threaded HTTP server sharing one snapshot cache between all request threads.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256  # Allow hundreds of readers connecting at once
+
+    def __init__(self, direccion, directorio, intervalo=0.5):
+        super().__init__(direccion, ManejadorClasificaciones)
+        self.cache = CacheClasificaciones(directorio, intervalo)
+
+
+def servir_clasificaciones(directorio='.', host='127.0.0.1', puerto=8000):
+    """
+    Start the local read-only HTTP service for the leagues of a directory.
+
+    Args:
+        directorio (str): Directory containing the league CSV files.
+        host (str): Address to listen on.
+        puerto (int): Port to listen on.
+    """
+    servidor = ServidorClasificaciones((host, puerto), directorio)
+
+    # Precompute the snapshots of every league before accepting requests
+    for liga in servidor.cache.ligas():
+        try:
+            servidor.cache.obtener(liga)
+        except Exception as error:
+            print(f"No se ha podido calcular la liga {liga}: {error}")
+
+    print(f"Sirviendo clasificaciones de {os.path.abspath(directorio)} en http://{host}:{puerto}/ligas")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+def resultados_hasta_jornada(df, jornadas, jornada):
+    """
+    Get a copy of a scoresheet with only the results of the game weeks up to a given one.
+
+    Args:
+        df (DataFrame): The N x N scoresheet.
+        jornadas (dict): Game week by (local, visitante) pair.
+        jornada (int): Last game week to keep.
+
+    Returns:
+        DataFrame: The partial scoresheet.
+    """
+    parcial = pd.DataFrame(index=df.index, columns=df.columns, dtype=object)
+    for (local, visitante), jornada_partido in jornadas.items():
+        if jornada_partido <= jornada:
+            parcial.at[local, visitante] = df.at[local, visitante]
+    return parcial
+
+
+def _huella(*partes):
+    """
+    Compute a hash of the inputs of an exported file, to skip it when they have not changed.
+    """
+    return hashlib.sha1(json.dumps(partes, ensure_ascii=False, default=_valor_json).encode('utf-8')).hexdigest()
+
+
+def _exportar_tabla(tarea):
+    """
+    Compute and write the standings of one game week. It runs in a worker process.
+
+    Args:
+        tarea (dict): Output directory, game week, partial scoresheet and table formats.
+
+    Returns:
+        dict: Position by team.
+    """
+    clasificacion = Clasificacion(tarea['df']).clasificacion
+    base = os.path.join(tarea['directorio'], f"jornada_{tarea['jornada']:02d}")
+    if 'csv' in tarea['formatos']:
+        clasificacion.to_csv(base + '.csv', index_label='POS')
+    if 'html' in tarea['formatos']:
+        clasificacion.to_html(base + '.html', index_names=False)
+    if 'json' in tarea['formatos']:
+        tabla = clasificacion.copy()
+        tabla.insert(0, 'POS', tabla.index)
+        with open(base + '.json', 'w', encoding='utf-8') as archivo:
+            json.dump(_registros_json(tabla), archivo, ensure_ascii=False, default=_valor_json)
+    return {equipo: int(posicion) for posicion, equipo in clasificacion['EQUIPO'].items()}
+
+
+def _exportar_grafico(tarea):
+    """
+    Render the position chart up to one game week off-screen. It runs in a worker process.
+
+    Args:
+        tarea (dict): Output path and position history records.
+    """
+    fig = Figure(figsize=(16, 9), dpi=100)
+    FigureCanvasAgg(fig)  # Off-screen canvas, no window is created
+    ax = fig.add_subplot(111)
+    dibujar_clasificacion(ax, pd.DataFrame(tarea['historica'], columns=['Equipo', 'Jornada', 'Posicion']))
+    fig.tight_layout()
+    fig.savefig(tarea['ruta'])
+
+
+def _ejecutar_acotado(executor, funcion, tareas, limite):
+    """
+    Run tasks in a pool keeping at most a given number of them queued.
+
+    Args:
+        executor (Executor): The pool of workers.
+        funcion (callable): Function applied to the argument of each task in a worker.
+        tareas (iterable): (contexto, argumento) pairs. The context stays in this process.
+            They are only generated when there is room in the queue.
+        limite (int): Maximum number of tasks submitted and not finished.
+
+    Yields:
+        tuple: The context of each task together with its result, in completion order.
+    """
+    pendientes = {}
+    for contexto, argumento in tareas:
+        if len(pendientes) >= limite:
+            terminados, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                yield pendientes.pop(futuro), futuro.result()
+        pendientes[executor.submit(funcion, argumento)] = contexto
+    for futuro in as_completed(list(pendientes)):
+        yield pendientes.pop(futuro), futuro.result()
+
+
+def exportar_jornadas(file_paths, salida, procesos=None, formatos=('csv', 'html', 'json')):
+    """
+    Export the standings table and the position chart of every game week of several leagues.
+
+    The standings of each game week are computed by replaying the results up to that week.
+    Tables and charts are produced in a pool of processes, and the files whose inputs did not
+    change since the previous export are skipped, using a manifest kept in the output directory.
+
+    Args:
+        file_paths (list): Paths of the scoresheet CSV files.
+        salida (str): Output directory. Each league gets its own subdirectory.
+        procesos (int, optional): Number of worker processes. By default, one per CPU.
+        formatos (tuple): Table formats among 'csv', 'html' and 'json'.
+
+    Returns:
+        dict: Number of files written and skipped.
+    """
+    procesos = procesos or os.cpu_count()
+    limite = procesos * 2
+    resumen = {'escritos': 0, 'omitidos': 0}
+
+    # Load every league and its manifest from the previous export
+    ligas = []
+    for file_path in file_paths:
+        nombre = os.path.basename(file_path).replace('.csv', '')
+        directorio = os.path.join(salida, nombre)
+        os.makedirs(directorio, exist_ok=True)
+        ruta_manifiesto = os.path.join(directorio, 'manifiesto.json')
+        manifiesto = {}
+        if os.path.isfile(ruta_manifiesto):
+            with open(ruta_manifiesto, encoding='utf-8') as archivo:
+                manifiesto = json.load(archivo)
+        liga = LigaVersionada(file_path)
+        jornadas = liga.jornadas_partidos()
+        ligas.append({'directorio': directorio, 'manifiesto': manifiesto, 'ruta_manifiesto': ruta_manifiesto,
+                      'df': liga.df, 'jornadas': jornadas, 'total': max(jornadas.values(), default=0),
+                      'posiciones': {}})
+
+    def existen(rutas):
+        return all(os.path.isfile(ruta) for ruta in rutas)
+
+    def tareas_tablas():
+        for liga in ligas:
+            for jornada in range(1, liga['total'] + 1):
+                df = resultados_hasta_jornada(liga['df'], liga['jornadas'], jornada)
+                huella = _huella(list(df.index), df.where(df.notna(), '').values.tolist(), formatos)
+                clave = f"tabla_{jornada:02d}"
+                base = os.path.join(liga['directorio'], f"jornada_{jornada:02d}")
+                anterior = liga['manifiesto'].get(clave)
+                if anterior and anterior['huella'] == huella and existen(f"{base}.{formato}" for formato in formatos):
+                    liga['posiciones'][jornada] = anterior['posiciones']
+                    resumen['omitidos'] += 1
+                    continue
+                yield ((liga, clave, huella, jornada),
+                       {'directorio': liga['directorio'], 'jornada': jornada, 'df': df, 'formatos': formatos})
+
+    def tareas_graficos():
+        for liga in ligas:
+            historica = []
+            for jornada in range(1, liga['total'] + 1):
+                historica.extend([equipo, jornada, posicion]
+                                 for equipo, posicion in liga['posiciones'][jornada].items())
+                huella = _huella(historica)
+                clave = f"grafico_{jornada:02d}"
+                ruta = os.path.join(liga['directorio'], f"jornada_{jornada:02d}.png")
+                anterior = liga['manifiesto'].get(clave)
+                if anterior and anterior['huella'] == huella and existen([ruta]):
+                    resumen['omitidos'] += 1
+                    continue
+                yield (liga, clave, huella), {'ruta': ruta, 'historica': list(historica)}
+
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        # The tables go first, the charts need the positions of every previous game week
+        for (liga, clave, huella, jornada), posiciones in _ejecutar_acotado(executor, _exportar_tabla,
+                                                                             tareas_tablas(), limite):
+            liga['posiciones'][jornada] = posiciones
+            liga['manifiesto'][clave] = {'huella': huella, 'posiciones': posiciones}
+            resumen['escritos'] += 1
+
+        for (liga, clave, huella), _ in _ejecutar_acotado(executor, _exportar_grafico, tareas_graficos(), limite):
+            liga['manifiesto'][clave] = {'huella': huella}
+            resumen['escritos'] += 1
+
+    for liga in ligas:
+        with open(liga['ruta_manifiesto'], 'w', encoding='utf-8') as archivo:
+            json.dump(liga['manifiesto'], archivo, ensure_ascii=False, indent=1)
+    return resumen
+
+
+COLUMNAS_ARCHIVO = {'fecha': 'Fecha', 'date': 'Fecha', 'temporada': 'Temporada', 'season': 'Temporada',
+                    'competicion': 'Competicion', 'competition': 'Competicion', 'local': 'Local', 'home': 'Local',
+                    'visitante': 'Visitante', 'away': 'Visitante', 'resultado': 'Resultado', 'score': 'Resultado'}
+
+
+def _normalizar_partidos(bloque):
+    """
+    Rename the columns of a block of a match archive and clean its team names and scores.
+
+    Args:
+        bloque (DataFrame): Rows of the archive, read as text.
+
+    Returns:
+        DataFrame: Columns 'Competicion', 'Temporada', 'Fecha', 'Local', 'Visitante' and 'Resultado'.
+    """
+    bloque = bloque.rename(columns=lambda columna: COLUMNAS_ARCHIVO.get(columna.strip().lower(), columna))
+    if 'Competicion' not in bloque.columns:
+        bloque['Competicion'] = 'liga'  # An archive of a single competition
+    faltan = {'Temporada', 'Fecha', 'Local', 'Visitante', 'Resultado'}.difference(bloque.columns)
+    if faltan:
+        raise ValueError(f"Faltan las columnas {', '.join(sorted(faltan))} en el archivo de partidos")
+
+    bloque = bloque[['Competicion', 'Temporada', 'Fecha', 'Local', 'Visitante', 'Resultado']].fillna('')
+    for columna in ['Local', 'Visitante']:
+        bloque[columna] = bloque[columna].str.strip().str.upper()
+    bloque['Resultado'] = bloque['Resultado'].str.strip()
+    return bloque
+
+
+def _nombre_temporada(competicion, temporada):
+    """
+    Get a name usable as a file name for a season of a competition.
+    """
+    return re.sub(r'[^\w.-]+', '_', f"{competicion}_{temporada}").strip('_')
+
+
+def _construir_temporada(tarea):
+    """
+    Build the league files of one season from its matches. It runs in a worker process.
+
+    The matches are taken in date order and each one is given the first game week in which
+    neither team has played yet. The scoresheet, the log of results with their game weeks and
+    the historical classification are written next to each other. A season without any valid
+    match is only reported.
+
+    Args:
+        tarea (dict): Path of the partition with the matches of the season, path of the scoresheet
+            and format of the dates, None to read them day first unless they are in ISO format.
+
+    Returns:
+        dict: Number of matches written and report of the problems found.
+    """
+    partidos = pd.read_csv(tarea['particion'], dtype=str, keep_default_na=False)
+    if tarea['formato_fecha']:
+        partidos['Orden'] = pd.to_datetime(partidos['Fecha'], format=tarea['formato_fecha'], errors='coerce')
+    else:
+        partidos['Orden'] = pd.to_datetime(partidos['Fecha'], format='mixed', dayfirst=True, errors='coerce')
+    partidos = partidos.sort_values('Orden', kind='stable')
+    problemas = []
+    for fila in partidos[partidos['Orden'].isna()].itertuples():
+        problemas.append(ProblemaResultado('fecha', fila.Local, fila.Visitante,
+                                           f"la fecha {fila.Fecha!r} no se puede leer, el partido va al final"))
+
+    # Scores that cannot be read are left out, a repeated match keeps its last result
+    goles = partidos['Resultado'].str.extract(PATRON_RESULTADO)
+    validos = goles[0].notna()
+    for fila in partidos[~validos].itertuples():
+        problemas.append(ProblemaResultado('formato', fila.Local, fila.Visitante,
+                                           f"{fila.Resultado!r} del {fila.Fecha} no tiene el formato X-Y"))
+    partidos = partidos[validos].assign(Resultado=goles[0][validos] + '-' + goles[1][validos])
+    repetidos = partidos.duplicated(['Local', 'Visitante'], keep='last')
+    for fila in partidos[repetidos].itertuples():
+        problemas.append(ProblemaResultado('repetido', fila.Local, fila.Visitante,
+                                           f"el partido del {fila.Fecha} se repite más tarde"))
+    partidos = partidos[~repetidos]
+    if partidos.empty:
+        problemas.append(ProblemaResultado('vacia', None, None, "la temporada no tiene partidos válidos, "
+                                                                "no se ha creado la liga"))
+        return {'partidos': 0, 'problemas': informe_validacion(problemas).splitlines()}
+
+    # Game weeks in date order
+    ocupadas = {}
+    jornadas = {}
+    for local, visitante in zip(partidos['Local'], partidos['Visitante']):
+        jornada = 1
+        while jornada in ocupadas.get(local, ()) or jornada in ocupadas.get(visitante, ()):
+            jornada += 1
+        ocupadas.setdefault(local, set()).add(jornada)
+        ocupadas.setdefault(visitante, set()).add(jornada)
+        jornadas[(local, visitante)] = jornada
+
+    equipos = pd.Index(sorted(set(partidos['Local']) | set(partidos['Visitante'])))
+    celdas = np.full((len(equipos), len(equipos)), np.nan, dtype=object)
+    celdas[equipos.get_indexer(partidos['Local']), equipos.get_indexer(partidos['Visitante'])] = partidos['Resultado']
+    df = pd.DataFrame(celdas, index=equipos, columns=equipos)
+    problemas.extend(validar_resultados(df, jornadas))
+
+    df.to_csv(tarea['destino'])
+    with open(ruta_registro(tarea['destino']), 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.writer(archivo, lineterminator='\n')
+        escritor.writerow(LigaVersionada.CAMPOS)
+        for secuencia, (partido, jornada) in enumerate(jornadas.items(), start=1):
+            escritor.writerow([secuencia, *partido, '', df.at[partido], jornada])
+    historico = HistoricoJornadas.desde_liga(LigaVersionada(tarea['destino']), seguir=False)
+    historico.historica().to_csv(ruta_historica(tarea['destino']), index=False)
+    return {'partidos': len(jornadas), 'problemas': informe_validacion(problemas).splitlines()}
+
+
+def ingerir_partidos(archivo, salida, procesos=None, tamano_bloque=100000, formato_fecha=None):
+    """
+    Build one league per season of a competition from a long archive of matches.
+
+    The archive, a CSV file with one match per row ('Fecha', 'Temporada', 'Local', 'Visitante',
+    'Resultado' and optionally 'Competicion'), is read in blocks of rows so that memory does not
+    grow with its size. The rows of each season are appended to a partition file, and then the
+    seasons are built in a pool of processes. The progress is saved after every block and every
+    season in "ingesta.json", so an interrupted run continues where it stopped: the partitions
+    are cut back to their size at the last saved block and the archive is read from there.
+
+    Args:
+        archivo (str): Path of the match archive.
+        salida (str): Output directory for the league files.
+        procesos (int, optional): Number of worker processes. By default, one per CPU.
+        tamano_bloque (int): Number of rows read at once.
+        formato_fecha (str, optional): strftime format of the dates. By default, dates in ISO
+            format are read year first and any other day first, like 12/08/2023.
+
+    Returns:
+        dict: Rows read, seasons built in this run and problems found in each season.
+    """
+    procesos = procesos or os.cpu_count()
+    directorio = os.path.join(salida, 'particiones')
+    ruta_estado = os.path.join(salida, 'ingesta.json')
+    firma = [os.path.abspath(archivo), os.path.getsize(archivo), os.path.getmtime(archivo), formato_fecha]
+    os.makedirs(directorio, exist_ok=True)
+
+    # The saved progress is only valid for the same archive read with the same date format
+    estado = {}
+    if os.path.isfile(ruta_estado):
+        with open(ruta_estado, encoding='utf-8') as entrada:
+            estado = json.load(entrada)
+    if estado.get('firma') != firma:
+        estado = {'firma': firma, 'filas': 0, 'particiones': {}, 'particionado': False, 'temporadas': {}}
+
+    def guardar():
+        temporal = ruta_estado + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as salida_estado:
+            json.dump(estado, salida_estado, ensure_ascii=False, indent=1)
+        os.replace(temporal, ruta_estado)
+
+    if not estado['particionado']:
+        # Drop what was written after the last saved block
+        for nombre in os.listdir(directorio):
+            tamano = estado['particiones'].get(nombre)
+            if tamano is None:
+                os.remove(os.path.join(directorio, nombre))
+            else:
+                with open(os.path.join(directorio, nombre), 'r+b') as particion:
+                    particion.truncate(tamano)
+
+        leidas = estado['filas']
+        bloques = pd.read_csv(archivo, dtype=str, chunksize=tamano_bloque, keep_default_na=False,
+                              skiprows=lambda fila: 0 < fila <= leidas)
+        for bloque in bloques:
+            filas = len(bloque)
+            bloque = _normalizar_partidos(bloque)
+            for (competicion, temporada), partidos in bloque.groupby(['Competicion', 'Temporada'], sort=False):
+                nombre = _nombre_temporada(competicion, temporada) + '.csv'
+                ruta = os.path.join(directorio, nombre)
+                partidos.to_csv(ruta, mode='a', header=nombre not in estado['particiones'], index=False)
+                estado['particiones'][nombre] = os.path.getsize(ruta)
+            estado['filas'] += filas
+            guardar()
+        estado['particionado'] = True
+        guardar()
+
+    # Build the seasons not built yet, saving the progress after each one
+    def tareas():
+        for nombre in sorted(estado['particiones']):
+            if nombre not in estado['temporadas']:
+                yield nombre, {'particion': os.path.join(directorio, nombre), 'destino': os.path.join(salida, nombre),
+                               'formato_fecha': formato_fecha}
+
+    resumen = {'filas': estado['filas'], 'temporadas': 0, 'problemas': {}}
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        for nombre, resultado in _ejecutar_acotado(executor, _construir_temporada, tareas(), procesos * 2):
+            estado['temporadas'][nombre] = resultado
+            guardar()
+            resumen['temporadas'] += 1
+
+    for nombre, resultado in estado['temporadas'].items():
+        if resultado['problemas']:
+            resumen['problemas'][nombre.replace('.csv', '')] = resultado['problemas']
+    return resumen
+
+
+class MarcadorDirecto:
+    """
+    Provisional standings of a league while its matches are being played.
+
+    Scores of a live feed are kept apart from the final results: they are set on a copy of the
+    matrices of the league, and only a match reported as finished is posted to the log of the
+    league. Updates are coalesced by match, so a burst of messages for the same match costs a
+    single change, and the standings are recomputed at most once per interval and written to the
+    file ending with "provisional.json".
+    """
+
+    def __init__(self, liga, intervalo=1.0):
+        """
+        Initialize the provisional standings of a league.
+
+        Args:
+            liga (LigaVersionada): The league. Final results are posted to it.
+            intervalo (float): Minimum seconds between two recomputations of the standings.
+        """
+        self.liga = liga
+        self.intervalo = intervalo
+        self.ruta = ruta_provisional(liga.file_path)
+        self.provisional = MatricesLiga.desde_liga(liga)  # Final results plus the scores in play
+        self.pendientes = {}  # Last message of each match not processed yet, by (local, visitante)
+        self.en_juego = {}  # (local, visitante) -> (resultado, jornada) of the matches in play
+        self.finalizados = []  # Matches posted to the league as finished, in order
+        self.descartados = []  # (message, reason) of the messages that could not be used
+        self.tabla = None  # Last provisional standings
+        self.recalculos = 0  # Number of recomputations of the standings
+        self.suscriptores = []  # Functions called with the standings after every recomputation
+        self._aviso = asyncio.Event()
+        self._fin = False
+
+    def suscribir(self, funcion):
+        """
+        Call a function with the provisional standings after every recomputation.
+
+        Args:
+            funcion (callable): Function that receives the MarcadorDirecto.
+        """
+        self.suscriptores.append(funcion)
+
+    def recibir(self, mensaje):
+        """
+        Queue a message of the feed. A newer message for the same match replaces a queued one.
+
+        Args:
+            mensaje (dict): 'local', 'visitante', 'resultado' in 'X-Y' format, 'estado' ('en_juego'
+                or 'final') and optionally 'jornada'.
+        """
+        try:
+            partido = (mensaje['local'], mensaje['visitante'])
+            if partido[0] not in self.provisional.indices or partido[1] not in self.provisional.indices \
+                    or partido[0] == partido[1]:
+                raise ValueError("equipos desconocidos")
+            if not re.match(PATRON_RESULTADO, str(mensaje['resultado'])):
+                raise ValueError("resultado no válido")
+            if mensaje.get('estado', 'en_juego') not in ('en_juego', 'final'):
+                raise ValueError("estado no válido")
+            jornada = mensaje.get('jornada')
+            if jornada not in (None, '') and (isinstance(jornada, bool) or not str(jornada).strip().isdigit()
+                                              or int(jornada) < 1):
+                raise ValueError("jornada no válida")
+        except (KeyError, TypeError, ValueError) as error:
+            self.descartados.append((mensaje, str(error)))
+            return
+        self.pendientes[partido] = mensaje
+        self._aviso.set()
+
+    def recibir_linea(self, linea):
+        """
+        Queue a line of the feed, holding a message as JSON. Empty lines are ignored.
+
+        Args:
+            linea (str): The line.
+        """
+        if not linea.strip():
+            return
+        try:
+            mensaje = json.loads(linea)
+        except json.JSONDecodeError as error:
+            self.descartados.append((linea.strip(), str(error)))
+            return
+        self.recibir(mensaje)
+
+    async def procesar(self):
+        """
+        Apply the queued messages and recompute the standings until close() is called.
+
+        Messages that arrive while the standings are recomputed, or during the pause after it,
+        are applied together in the next round.
+        """
+        while True:
+            await self._aviso.wait()
+            self._aviso.clear()
+            if self.pendientes:
+                await self.aplicar()
+            if self._fin and not self.pendientes:
+                return
+            await asyncio.sleep(self.intervalo)
+
+    async def aplicar(self):
+        """
+        Apply the queued messages and recompute the provisional standings.
+        """
+        mensajes, self.pendientes = self.pendientes, {}
+        validos = {}
+        for partido, mensaje in mensajes.items():
+            if partido in self.finalizados:
+                continue  # Late messages of a match that already finished
+            if partido not in self.en_juego and pd.notna(self.liga.df.at[partido]):
+                self.descartados.append((mensaje, "el partido ya tiene resultado"))
+                continue
+            validos[partido] = mensaje
+
+        # The game week of a match in play is kept with it, so it is only inferred for new
+        # matches, once per round and away from the event loop
+        sin_jornada = [partido for partido, mensaje in validos.items()
+                       if not mensaje.get('jornada') and partido not in self.en_juego]
+        libres = await asyncio.to_thread(self.jornadas_libres, sin_jornada) if sin_jornada else {}
+
+        finales = []
+        for partido, mensaje in validos.items():
+            resultado = str(mensaje['resultado']).strip()
+            jornada = mensaje.get('jornada') or (self.en_juego[partido][1] if partido in self.en_juego
+                                                 else libres[partido])
+            if mensaje.get('estado') == 'final':
+                finales.append((partido, resultado, int(jornada)))
+            else:
+                self.en_juego[partido] = (resultado, int(jornada))
+                self.provisional.fijar(*partido, resultado, int(jornada))
+
+        # Final results are posted to the log of the league, which takes a file lock
+        if finales:
+            await asyncio.to_thread(self.confirmar, finales)
+        else:
+            await asyncio.to_thread(self.liga.refrescar)  # Results posted by other users
+        # Matches in play whose final result was posted by another user
+        for partido in [partido for partido in self.en_juego if pd.notna(self.liga.df.at[partido])]:
+            del self.en_juego[partido]
+            self.finalizados.append(partido)
+
+        self.tabla = self.provisional.clasificar()
+        self.recalculos += 1
+        await asyncio.to_thread(self.guardar)
+        for funcion in self.suscriptores:
+            funcion(self)
+
+    def jornadas_libres(self, partidos):
+        """
+        Get the first free game week of several matches, inferring the game weeks of the league
+        once. It runs in a worker thread.
+
+        Args:
+            partidos (list): (local, visitante) pairs.
+
+        Returns:
+            dict: Game week by pair.
+        """
+        jornadas = self.liga.jornadas_partidos()
+        return {partido: self.liga.jornada_libre(*partido, jornadas) for partido in partidos}
+
+    def confirmar(self, finales):
+        """
+        Post the results of the finished matches to the league.
+
+        Args:
+            finales (list): ((local, visitante), resultado, jornada) of every finished match.
+        """
+        for partido, resultado, jornada in finales:
+            self.en_juego.pop(partido, None)
+            try:
+                self.liga.publicar(*partido, resultado, jornada)
+            except ConflictoResultado as error:
+                self.descartados.append(({'local': partido[0], 'visitante': partido[1], 'resultado': resultado},
+                                         str(error)))
+            # The matrices follow the league, so they hold the posted result or the conflicting one
+            self.finalizados.append(partido)
+
+    def guardar(self):
+        """
+        Write the provisional standings and the matches in play to the "provisional.json" file.
+        """
+        documento = {
+            'liga': os.path.basename(self.liga.file_path).replace('.csv', ''),
+            'actualizado': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'en_juego': [{'local': local, 'visitante': visitante, 'resultado': resultado, 'jornada': jornada}
+                         for (local, visitante), (resultado, jornada) in self.en_juego.items()],
+            'finalizados': [{'local': local, 'visitante': visitante} for local, visitante in self.finalizados],
+            'clasificacion': _registros_json(self.tabla.rename_axis('POS').reset_index()),
+        }
+        temporal = self.ruta + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(documento, archivo, ensure_ascii=False, indent=2, default=_valor_json)
+        os.replace(temporal, self.ruta)
+
+    def close(self):
+        """
+        Stop processing once the queued messages are applied.
+        """
+        self._fin = True
+        self._aviso.set()
+
+
+async def fuente_socket(host, puerto):
+    """
+    Read the lines of a live feed from a TCP socket until it is closed.
+
+    Args:
+        host (str): Host of the feed.
+        puerto (int): Port of the feed.
+
+    Yields:
+        str: Every line received.
+    """
+    reader, writer = await asyncio.open_connection(host, puerto)
+    try:
+        while linea := await reader.readline():
+            yield linea.decode('utf-8')
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def fuente_archivo(ruta, sondeo=0.2, espera=None):
+    """
+    Read the lines of a live feed from a file as they are appended to it, like "tail -f".
+
+    Args:
+        ruta (str): Path of the file. It is read from the beginning.
+        sondeo (float): Seconds between two checks for new lines.
+        espera (float, optional): Stop after this many seconds without new lines. By default, never.
+
+    Yields:
+        str: Every complete line.
+    """
+    while not os.path.exists(ruta):
+        await asyncio.sleep(sondeo)
+    with open(ruta, encoding='utf-8') as archivo:
+        resto, ultima = '', time.monotonic()
+        while True:
+            texto = archivo.read()
+            if texto:
+                ultima = time.monotonic()
+                *lineas, resto = (resto + texto).split('\n')  # The last piece may be an incomplete line
+                for linea in lineas:
+                    yield linea
+            elif espera is not None and time.monotonic() - ultima > espera:
+                if resto:
+                    yield resto
+                return
+            else:
+                await asyncio.sleep(sondeo)
+
+
+async def seguir_directo(file_path, fuente, intervalo=1.0, avisar=None):
+    """
+    Follow a live feed and keep the provisional standings of a league up to date.
+
+    Args:
+        file_path (str): Path of the scoresheet CSV file.
+        fuente (async iterator): Lines of the feed, see fuente_socket and fuente_archivo.
+        intervalo (float): Minimum seconds between two recomputations of the standings.
+        avisar (callable, optional): Function called with the MarcadorDirecto after every recomputation.
+
+    Returns:
+        MarcadorDirecto: The provisional standings once the feed ends.
+    """
+    marcador = MarcadorDirecto(LigaVersionada(file_path), intervalo)
+    if avisar:
+        marcador.suscribir(avisar)
+    procesador = asyncio.create_task(marcador.procesar())
+    try:
+        async for linea in fuente:
+            marcador.recibir_linea(linea)
+    finally:
+        marcador.close()
+        await procesador
+    return marcador
+
+
+async def simular_partidos(liga, duracion=90.0, semilla=0, repeticiones=3):
+    """
+    Stand-in live feed: play the next round of unplayed matches of a league with random goals.
+
+    Every team plays at most one match. The score of each match is sent at kick-off, after every
+    goal, repeated a few times like real feeds do, and as final at the end.
+
+    Args:
+        liga (LigaVersionada): The league.
+        duracion (float): Seconds that the 90 minutes of the matches last.
+        semilla (int): Seed of the random goals.
+        repeticiones (int): Times each score is sent.
+
+    Yields:
+        dict: The messages of the feed, in time order.
+    """
+    rng = np.random.default_rng(semilla)
+    ocupados, partidos = set(), []
+    for local, visitante in liga.df.isna().stack().loc[lambda libres: libres].index:
+        if local != visitante and local not in ocupados and visitante not in ocupados:
+            ocupados.update((local, visitante))
+            partidos.append((local, visitante, liga.jornada_libre(local, visitante)))
+
+    # Minute of every goal and of the end of every match, with the team that scored
+    eventos = []
+    for local, visitante, jornada in partidos:
+        partido = (local, visitante, jornada)
+        eventos += [(float(minuto), partido, 0) for minuto in rng.uniform(1, 90, rng.poisson(1.5))]
+        eventos += [(float(minuto), partido, 1) for minuto in rng.uniform(1, 90, rng.poisson(1.1))]
+        eventos.append((90 + float(rng.uniform(1, 6)), partido, None))
+    eventos.sort(key=lambda evento: evento[0])
+
+    goles = {partido: [0, 0] for partido in partidos}
+    for local, visitante, jornada in partidos:
+        yield {'local': local, 'visitante': visitante, 'resultado': '0-0', 'estado': 'en_juego', 'jornada': jornada}
+    anterior = 0.0
+    for minuto, (local, visitante, jornada), equipo in eventos:
+        await asyncio.sleep((minuto - anterior) * duracion / 90)
+        anterior = minuto
+        marcador = goles[(local, visitante, jornada)]
+        if equipo is not None:
+            marcador[equipo] += 1
+        mensaje = {'local': local, 'visitante': visitante, 'resultado': f"{marcador[0]}-{marcador[1]}",
+                   'estado': 'en_juego' if equipo is not None else 'final', 'jornada': jornada}
+        for _ in range(repeticiones if equipo is not None else 1):
+            yield mensaje
+
+
+async def servir_simulacion(file_path, host='127.0.0.1', puerto=9000, archivo=None, **opciones):
+    """
+    Publish the stand-in feed of a league, one JSON message per line.
+
+    Args:
+        file_path (str): Path of the scoresheet CSV file.
+        host (str): Host to listen on.
+        puerto (int): Port to listen on. Every client receives its own simulation.
+        archivo (str, optional): Append the messages to this file instead of serving them.
+        **opciones: Duration, seed and repetitions, see simular_partidos.
+    """
+    if archivo:
+        with open(archivo, 'a', encoding='utf-8') as salida:
+            async for mensaje in simular_partidos(LigaVersionada(file_path), **opciones):
+                salida.write(json.dumps(mensaje, ensure_ascii=False) + '\n')
+                salida.flush()
+        return
+
+    async def atender(reader, writer):
+        try:
+            async for mensaje in simular_partidos(LigaVersionada(file_path), **opciones):
+                writer.write((json.dumps(mensaje, ensure_ascii=False) + '\n').encode('utf-8'))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    servidor = await asyncio.start_server(atender, host, puerto)
+    print(f"Simulación en {host}:{puerto}")
+    async with servidor:
+        await servidor.serve_forever()
+
+
 class App:
     """
     Main application class for the Football Tables application.
@@ -1021,6 +5438,14 @@ class App:
                                                 command=self.open_visualizar_clasificacion_grafico, bg='white', width=50)
         boton_clasificacion_grafico.pack(pady=20)
 
+        boton_temporadas = tk.Button(self.master, text="Comparar Temporadas", command=self.open_comparar_temporadas,
+                                     bg='white', width=50)
+        boton_temporadas.pack(pady=20)
+
+        boton_jornada = tk.Button(self.master, text="Analizar Jornada", command=self.open_analizar_jornada, bg='white',
+                                  width=50)
+        boton_jornada.pack(pady=20)
+
 
     def open_crear_liga(self):
         """
@@ -1072,7 +5497,218 @@ class App:
         self.master.iconify()  # Minimize the main window
         VisualizarClasificacionGrafico(self.master)  # Initialize and open the 'Visualizar Clasificación Gráfico' window
 
+    def open_comparar_temporadas(self):
+        """
+        Open the 'Comparar Temporadas' window.
+
+        This method minimizes the main application window and opens the interface
+        for comparing the points and positions of the teams over several seasons.
+        """
+        self.master.iconify()  # Minimize the main window
+        VisualizarTemporadas(self.master)  # Initialize and open the 'Comparar Temporadas' window
+
+    def open_analizar_jornada(self):
+        """
+        Open the 'Analizar Jornada' window.
+
+        This method minimizes the main application window and opens the interface
+        for examining how the results of each game week moved the standings.
+        """
+        self.master.iconify()  # Minimize the main window
+        VisualizarJornada(self.master)  # Initialize and open the 'Analizar Jornada' window
+
 def main():
+    parser = argparse.ArgumentParser(description="Tablas de fútbol")
+    subparsers = parser.add_subparsers(dest='comando')
+
+    parser_servidor = subparsers.add_parser('servidor', help="Servir las clasificaciones como JSON por HTTP")
+    parser_servidor.add_argument('--directorio', default='.', help="Directorio con los CSV de las ligas")
+    parser_servidor.add_argument('--host', default='127.0.0.1')
+    parser_servidor.add_argument('--puerto', type=int, default=8000)
+
+    parser_exportar = subparsers.add_parser('exportar', help="Exportar tablas y gráficos de cada jornada")
+    parser_exportar.add_argument('ligas', nargs='+', help="CSV de resultados de las ligas")
+    parser_exportar.add_argument('--salida', default='exportacion', help="Directorio de salida")
+    parser_exportar.add_argument('--procesos', type=int, default=None, help="Número de procesos")
+    parser_exportar.add_argument('--formatos', default='csv,html,json', help="Formatos de las tablas")
+
+    parser_grupos = subparsers.add_parser('grupos', help="Clasificaciones de un archivo con varios grupos")
+    parser_grupos.add_argument('contenedor', help="Archivo de grupos (.zip)")
+    parser_grupos.add_argument('--importar', nargs='+', default=[], help="CSV de ligas a añadir como grupos")
+    parser_grupos.add_argument('--grupo', help="Mostrar solo este grupo")
+    parser_grupos.add_argument('--salida', help="Directorio donde guardar un CSV por grupo")
+    parser_grupos.add_argument('--procesos', type=int, default=None, help="Número de procesos")
+
+    parser_elo = subparsers.add_parser('elo', help="Ajustar y calcular los ratings ELO de varias temporadas")
+    parser_elo.add_argument('ligas', nargs='+', help="CSV de resultados de las temporadas, en orden")
+    parser_elo.add_argument('--k', default='10,20,30,40', help="Factores K a probar")
+    parser_elo.add_argument('--ventaja', default='0,50,100,150', help="Ventajas de campo a probar")
+    parser_elo.add_argument('--regresion', type=float, default=0.0, help="Regresión a la media entre temporadas")
+
+    parser_ingerir = subparsers.add_parser('ingerir', help="Crear las ligas de cada temporada de un archivo de partidos")
+    parser_ingerir.add_argument('archivo', help="CSV con un partido por fila")
+    parser_ingerir.add_argument('--salida', default='ligas', help="Directorio de salida")
+    parser_ingerir.add_argument('--procesos', type=int, default=None, help="Número de procesos")
+    parser_ingerir.add_argument('--bloque', type=int, default=100000, help="Filas leídas de una vez")
+    parser_ingerir.add_argument('--formato-fecha', default=None,
+                                help="Formato de las fechas, por ejemplo %%d/%%m/%%Y (por defecto, día primero o ISO)")
+
+    parser_objetivos = subparsers.add_parser('objetivos', help="Puestos asegurados y perdidos de cada equipo")
+    parser_objetivos.add_argument('liga', help="CSV de resultados de la liga")
+    parser_objetivos.add_argument('--puestos', help="Puestos a comprobar, por defecto el título y la permanencia")
+
+    parser_verificar = subparsers.add_parser('verificar', help="Comparar el cálculo por matrices con el original")
+    parser_verificar.add_argument('--casos', type=int, default=200, help="Número de hojas de resultados generadas")
+    parser_verificar.add_argument('--semilla', type=int, default=0)
+    parser_verificar.add_argument('--equipos', default='2,12', help="Mínimo y máximo de equipos")
+    parser_verificar.add_argument('--generadores', default=','.join(GENERADORES_HOJAS), help="Tipos de hojas")
+    parser_verificar.add_argument('--salida', help="CSV donde guardar la primera hoja con diferencias")
+
+    parser_temporadas = subparsers.add_parser('temporadas', help="Comparar varias temporadas jornada a jornada")
+    parser_temporadas.add_argument('ligas', nargs='+', help="CSV de resultados de las temporadas, en orden")
+    parser_temporadas.add_argument('--racha', type=int, default=5, help="Jornadas de las mejores y peores rachas")
+    parser_temporadas.add_argument('--equipo', help="Mostrar solo este equipo")
+
+    parser_jornada = subparsers.add_parser('jornada', help="Efecto de los resultados de una jornada en la clasificación")
+    parser_jornada.add_argument('liga', help="CSV de resultados de la liga")
+    parser_jornada.add_argument('--jornada', type=int, help="Jornada, por defecto la última con resultados")
+    parser_jornada.add_argument('--descensos', type=int, default=3, help="Número de puestos de descenso")
+
+    parser_directo = subparsers.add_parser('directo', help="Clasificación provisional a partir de marcadores en directo")
+    parser_directo.add_argument('liga', help="CSV de resultados de la liga")
+    fuente_directo = parser_directo.add_mutually_exclusive_group(required=True)
+    fuente_directo.add_argument('--socket', help="Servidor de marcadores, como host:puerto")
+    fuente_directo.add_argument('--archivo', help="Archivo de marcadores que se va ampliando")
+    parser_directo.add_argument('--intervalo', type=float, default=1.0, help="Segundos mínimos entre recálculos")
+    parser_directo.add_argument('--espera', type=float, default=None,
+                                help="Terminar tras estos segundos sin cambios en el archivo")
+
+    parser_simular = subparsers.add_parser('simular', help="Emitir marcadores en directo simulados")
+    parser_simular.add_argument('liga', help="CSV de resultados de la liga")
+    parser_simular.add_argument('--host', default='127.0.0.1')
+    parser_simular.add_argument('--puerto', type=int, default=9000)
+    parser_simular.add_argument('--archivo', help="Escribir los marcadores en este archivo en vez de servirlos")
+    parser_simular.add_argument('--duracion', type=float, default=90.0, help="Segundos que duran los partidos")
+    parser_simular.add_argument('--semilla', type=int, default=0)
+
+    parser_validar = subparsers.add_parser('validar', help="Comprobar los resultados de las ligas")
+    parser_validar.add_argument('ligas', nargs='+', help="CSV de resultados de las ligas")
+
+    args = parser.parse_args()
+    if args.comando == 'servidor':
+        servir_clasificaciones(args.directorio, args.host, args.puerto)
+        return
+    if args.comando == 'exportar':
+        resumen = exportar_jornadas(args.ligas, args.salida, args.procesos, tuple(args.formatos.split(',')))
+        print(f"Archivos escritos: {resumen['escritos']}, sin cambios: {resumen['omitidos']}")
+        return
+    if args.comando == 'elo':
+        resultados, ratings = ajustar_elo([partidos_temporada(file_path) for file_path in args.ligas],
+                                          [float(k) for k in args.k.split(',')],
+                                          [float(ventaja) for ventaja in args.ventaja.split(',')],
+                                          regresion=args.regresion)
+        print(resultados.to_string())
+        print()
+        for equipo, rating in sorted(ratings.items(), key=lambda item: -item[1]):
+            print(f"{equipo:<20} {rating:.0f}")
+        return
+    if args.comando == 'ingerir':
+        resumen = ingerir_partidos(args.archivo, args.salida, args.procesos, args.bloque, args.formato_fecha)
+        print(f"Filas leídas: {resumen['filas']}, temporadas creadas: {resumen['temporadas']}")
+        for nombre, problemas in resumen['problemas'].items():
+            print(f"{nombre}:\n" + '\n'.join(problemas))
+        return
+    if args.comando == 'objetivos':
+        liga = LigaVersionada(args.liga)
+        puestos = [int(puesto) for puesto in args.puestos.split(',')] if args.puestos else None
+        print(ObjetivosMatematicos(MatricesLiga.desde_liga(liga, seguir=False)).tabla(puestos).to_string())
+        return
+    if args.comando == 'verificar':
+        informe = verificar_motor(motor_matrices, casos=args.casos, semilla=args.semilla,
+                                  equipos=tuple(int(valor) for valor in args.equipos.split(',')),
+                                  generadores=args.generadores.split(','))
+        print(f"Casos: {informe['casos']}")
+        for nombre, tiempo in informe['tiempos'].items():
+            print(f"{nombre:<10} {tiempo['casos']:>5} casos  original {tiempo['referencia']:8.3f} s  "
+                  f"matrices {tiempo['motor']:8.3f} s")
+        divergencia = informe['divergencia']
+        if divergencia:
+            print(f"\nPrimera diferencia: hoja '{divergencia['generador']}' del caso {divergencia['caso']}, "
+                  f"posición {divergencia['posicion']}")
+            print(f"{divergencia['hoja'].to_string()}\n\nEsperado:\n{divergencia['esperado'].to_string()}"
+                  f"\n\nObtenido:\n{divergencia['obtenido'].to_string()}")
+            if args.salida:
+                divergencia['hoja'].to_csv(args.salida)
+        return
+    if args.comando == 'temporadas':
+        comparativa = ComparativaTemporadas.desde_archivos(args.ligas)
+        ritmo, rachas = comparativa.ritmo(), comparativa.rachas(args.racha)
+        medias = comparativa.posicion_media()
+        if args.equipo:
+            ritmo = ritmo[ritmo['EQUIPO'] == args.equipo]
+            rachas = rachas[rachas['EQUIPO'] == args.equipo]
+            medias = medias[medias.index == args.equipo]
+        print(f"Ritmo de {comparativa.temporadas[-1]} en la jornada {comparativa.jugadas()[-1]}:\n{ritmo.to_string(index=False)}")
+        print(f"\nRachas de {args.racha} jornadas:\n{rachas.to_string(index=False)}")
+        print(f"\nPosición media por jornada:\n{medias.to_string()}")
+        return
+    if args.comando == 'jornada':
+        impacto = ImpactoJornadas(HistoricoJornadas.desde_liga(LigaVersionada(args.liga), seguir=False), args.descensos)
+        equipos, resultados = impacto.jornada(args.jornada or impacto.jornadas)
+        print(f"{resultados.to_string(index=False)}\n\n{equipos.to_string()}")
+        return
+    if args.comando == 'directo':
+        if args.socket:
+            host, puerto = args.socket.rsplit(':', 1)
+            fuente = fuente_socket(host, int(puerto))
+        else:
+            fuente = fuente_archivo(args.archivo, espera=args.espera)
+
+        def avisar(marcador):
+            en_juego = ', '.join(f"{local} {resultado} {visitante}"
+                                 for (local, visitante), (resultado, _) in marcador.en_juego.items())
+            print(f"{time.strftime('%H:%M:%S')} En juego: {en_juego or '-'}; finalizados: {len(marcador.finalizados)}")
+
+        try:
+            marcador = asyncio.run(seguir_directo(args.liga, fuente, args.intervalo, avisar))
+        except KeyboardInterrupt:
+            return
+        if marcador.tabla is not None:
+            print(f"\n{marcador.tabla.to_string()}")
+        for mensaje, motivo in marcador.descartados:
+            print(f"Descartado ({motivo}): {mensaje}")
+        return
+    if args.comando == 'simular':
+        try:
+            asyncio.run(servir_simulacion(args.liga, args.host, args.puerto, args.archivo,
+                                          duracion=args.duracion, semilla=args.semilla))
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.comando == 'validar':
+        for file_path in args.ligas:
+            liga = LigaVersionada(file_path)
+            problemas = validar_resultados(liga.df, liga.jornadas_partidos())
+            print(f"{file_path}: {len(problemas)} problemas")
+            if problemas:
+                print(informe_validacion(problemas))
+        return
+    if args.comando == 'grupos':
+        contenedor = ContenedorGrupos(args.contenedor)
+        if args.importar:
+            contenedor.importar_ligas(args.importar)
+        if args.grupo:
+            tablas = {args.grupo: contenedor.clasificacion(args.grupo)}
+        else:
+            tablas = contenedor.clasificaciones(args.procesos)
+        for nombre, tabla in tablas.items():
+            if args.salida:
+                os.makedirs(args.salida, exist_ok=True)
+                tabla.to_csv(os.path.join(args.salida, f"{nombre}.csv"), index_label='POS')
+            else:
+                print(f"{nombre}\n{tabla.to_string()}\n")
+        return
+
     root = tk.Tk()
     app = App(root)
     root.mainloop()
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def escribir_hoja(ruta, resultados, equipos=('ALAVES', 'BETIS', 'CADIZ', 'DEPOR')):
+    """
+    Write a scoresheet with the given {(local, visitante): 'X-Y'} results.
+    """
+    df = pd.DataFrame(np.nan, index=list(equipos), columns=list(equipos), dtype=object)
+    for (local, visitante), resultado in resultados.items():
+        df.at[local, visitante] = resultado
+    df.to_csv(ruta)
+    return str(ruta)
+
+
+@pytest.fixture
+def liga_csv(tmp_path):
+    """
+    A four-team league with two played game weeks and no log.
+    """
+    return escribir_hoja(tmp_path / 'liga.csv', {
+        ('ALAVES', 'BETIS'): '2-0', ('CADIZ', 'DEPOR'): '1-1',
+        ('BETIS', 'CADIZ'): '3-1', ('DEPOR', 'ALAVES'): '0-2',
+    })
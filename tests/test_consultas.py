@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+
+@pytest.fixture
+def hoja():
+    return main.hoja_empates(np.random.default_rng(3), 8)
+
+
+def comparar(tabla, esperada):
+    esperada = esperada.reset_index(drop=True)
+    tabla = tabla.reset_index(drop=True)
+    for columna in main.MatricesLiga.COLUMNAS:
+        assert tabla[columna].astype(str).tolist() == esperada[columna].astype(str).tolist(), columna
+
+
+def test_equipos_es_la_liga_entre_ellos(hoja):
+    equipos = ['E01', 'E03', 'E04', 'E06']
+    tabla = main.MatricesLiga(hoja).consultar(equipos=equipos)
+    comparar(tabla, main.Clasificacion(hoja.loc[equipos, equipos]).clasificacion)
+
+
+def test_excluir_quita_equipos_y_partidos(hoja):
+    resto = [equipo for equipo in hoja.index if equipo not in ('E00', 'E05')]
+    tabla = main.MatricesLiga(hoja).consultar(excluir=['E00', 'E05'])
+    comparar(tabla, main.Clasificacion(hoja.loc[resto, resto]).clasificacion)
+
+
+def test_rango_de_jornadas(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    liga.publicar('ALAVES', 'CADIZ', '0-4', 3)
+    liga.publicar('BETIS', 'DEPOR', '1-0', 3)
+    jornadas = liga.jornadas_partidos()
+    matrices = main.MatricesLiga(liga.df, jornadas)
+
+    hasta = main.resultados_hasta_jornada(liga.df, jornadas, 2)
+    comparar(matrices.clasificar(jornadas=(1, 2)), main.Clasificacion(hasta).clasificacion)
+
+    solo_tercera = matrices.consultar(jornadas=(3, 3)).set_index('EQUIPO')
+    assert solo_tercera['PJ'].tolist() == [1, 1, 1, 1]
+    assert solo_tercera.loc['CADIZ', 'PTS'] == 3 and solo_tercera.index[0] == 'CADIZ'
+
+    # Subsets and ranges combine
+    tabla = matrices.consultar(equipos=['ALAVES', 'CADIZ'], jornadas=(3, 3))
+    assert tabla['EQUIPO'].tolist() == ['CADIZ', 'ALAVES'] and tabla['PJ'].tolist() == [1, 1]
+
+
+def test_equipo_desconocido(hoja):
+    with pytest.raises(KeyError):
+        main.MatricesLiga(hoja).consultar(equipos=['E01', 'NADIE'])
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+import main
+
+
+class Widget:
+    """
+    Stand-in for the labels and buttons of the window, which only records its options.
+    """
+
+    def __init__(self):
+        self.opciones = {}
+
+    def config(self, **opciones):
+        self.opciones.update(opciones)
+
+
+@pytest.fixture
+def ventana(liga_csv, monkeypatch):
+    errores = []
+    monkeypatch.setattr(main.messagebox, 'showerror', lambda titulo, mensaje: errores.append(mensaje))
+    ventana = main.ActualizarResultados.__new__(main.ActualizarResultados)
+    ventana.liga = main.LigaVersionada(liga_csv)
+    ventana.elo = main.MotorElo.desde_liga(ventana.liga)
+    ventana.matrices = main.MatricesLiga.desde_liga(ventana.liga)
+    ventana.deshechos, ventana.rehechos = [], []
+    ventana.elo_label, ventana.boton_deshacer, ventana.boton_rehacer = Widget(), Widget(), Widget()
+    ventana.errores = errores
+    return ventana
+
+
+def publicar(ventana, local, visitante, resultado, jornada=None):
+    entrada = ventana.publicar(local, visitante, resultado, jornada)
+    ventana.deshechos.append(entrada)
+    ventana.rehechos.clear()
+    return entrada
+
+
+def test_deshacer_y_rehacer(ventana, liga_csv):
+    publicar(ventana, 'ALAVES', 'CADIZ', '1-0', 3)
+    publicar(ventana, 'ALAVES', 'CADIZ', '3-3')
+    assert 'PTS: ALAVES 7, CADIZ 2' in ventana.elo_label.opciones['text']
+
+    ventana.deshacer()
+    assert ventana.liga.df.at['ALAVES', 'CADIZ'] == '1-0'
+    ventana.deshacer()
+    assert main.LigaVersionada(liga_csv).df.isna().at['ALAVES', 'CADIZ']
+    assert ventana.elo.ratings == pytest.approx(main.MotorElo.desde_liga(ventana.liga, seguir=False).ratings)
+    assert ventana.boton_deshacer.opciones['state'] == main.tk.DISABLED
+
+    ventana.rehacer()
+    assert ventana.liga.df.at['ALAVES', 'CADIZ'] == '1-0'
+    assert ventana.liga.jornadas_partidos()[('ALAVES', 'CADIZ')] == 3
+    assert not ventana.errores
+
+
+def test_deshacer_no_pisa_cambios_de_otros(ventana, liga_csv):
+    publicar(ventana, 'ALAVES', 'CADIZ', '1-0', 3)
+    otro = main.LigaVersionada(liga_csv)
+    otro.publicar('ALAVES', 'CADIZ', '2-0', 3)
+    ventana.liga.refrescar()  # The change of the other user is already merged
+
+    ventana.deshacer()
+    assert len(ventana.errores) == 1 and ventana.deshechos
+    assert main.LigaVersionada(liga_csv).df.at['ALAVES', 'CADIZ'] == '2-0'
+
+
+def test_rehacer_no_pisa_cambios_de_otros(ventana, liga_csv):
+    publicar(ventana, 'ALAVES', 'CADIZ', '1-0', 3)
+    ventana.deshacer()
+    main.LigaVersionada(liga_csv).publicar('ALAVES', 'CADIZ', '0-0', 3)
+    ventana.liga.refrescar()
+
+    ventana.rehacer()
+    assert len(ventana.errores) == 1 and ventana.rehechos
+    assert main.LigaVersionada(liga_csv).df.at['ALAVES', 'CADIZ'] == '0-0'
+
+
+def test_puntos_incrementales():
+    rng = np.random.default_rng(1)
+    df = main.hoja_aleatoria(rng, 6)
+    matrices = main.MatricesLiga(df, puntos_victoria=2)
+    for _ in range(50):
+        local, visitante = rng.choice(df.index, 2, replace=False)
+        resultado = f"{rng.integers(0, 3)}-{rng.integers(0, 3)}" if rng.random() < 0.7 else None
+        matrices.fijar(local, visitante, resultado)
+        assert (matrices.puntos == matrices.totales(matrices.jugado)['PTS']).all()
+
+
+def test_ultima_jornada_del_elo():
+    motor = main.MotorElo()
+    for jornada, partido in [(2, ('A', 'B')), (5, ('C', 'D')), (5, ('A', 'C'))]:
+        motor.aplicar_entrada({'Local': partido[0], 'Visitante': partido[1], 'Resultado': '1-0', 'Jornada': jornada})
+    assert motor._ultima_jornada == 5
+    motor.aplicar_entrada({'Local': 'C', 'Visitante': 'D', 'Resultado': '', 'Jornada': ''})
+    assert motor._ultima_jornada == 5
+    motor.aplicar_entrada({'Local': 'A', 'Visitante': 'C', 'Resultado': '', 'Jornada': ''})
+    assert motor._ultima_jornada == 2
+    motor.aplicar_entrada({'Local': 'B', 'Visitante': 'A', 'Resultado': '0-0', 'Jornada': ''})
+    assert motor.partidos[('B', 'A')][0] == 3
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import main
+
+
+def partido(local, visitante, resultado, estado='en_juego', **extra):
+    return {'local': local, 'visitante': visitante, 'resultado': resultado, 'estado': estado, **extra}
+
+
+async def correr(marcador, mensajes):
+    tarea = asyncio.create_task(marcador.procesar())
+    for mensaje in mensajes:
+        marcador.recibir(mensaje)
+    marcador.close()
+    await tarea
+
+
+def test_jornada_no_valida_se_descarta_sin_parar(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    marcador = main.MarcadorDirecto(liga, intervalo=0)
+    malos = [partido('ALAVES', 'CADIZ', '1-0', jornada=jornada) for jornada in ('x', 0, -1, 2.5, True)]
+    asyncio.run(correr(marcador, malos + [partido('BETIS', 'DEPOR', '0-1', jornada='3')]))
+    assert [motivo for _, motivo in marcador.descartados] == ["jornada no válida"] * len(malos)
+    assert marcador.en_juego == {('BETIS', 'DEPOR'): ('0-1', 3)}
+
+
+def test_mensajes_del_mismo_partido_se_agrupan(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    marcador = main.MarcadorDirecto(liga, intervalo=0)
+    asyncio.run(correr(marcador, [partido('ALAVES', 'CADIZ', resultado) for resultado in ('1-0', '2-0', '2-1')]))
+    assert marcador.recalculos == 1
+    assert marcador.en_juego == {('ALAVES', 'CADIZ'): ('2-1', 3)}
+    assert marcador.tabla.loc[marcador.tabla['EQUIPO'] == 'ALAVES', 'PTS'].item() == 9
+
+
+def test_jornada_libre_se_infiere_una_vez_por_partido(liga_csv, monkeypatch):
+    liga = main.LigaVersionada(liga_csv)
+    marcador = main.MarcadorDirecto(liga, intervalo=0)
+    llamadas = []
+    original = liga.jornadas_partidos
+    monkeypatch.setattr(liga, 'jornadas_partidos', lambda: llamadas.append(1) or original())
+
+    async def rondas():
+        marcador.recibir(partido('ALAVES', 'CADIZ', '1-0'))
+        marcador.recibir(partido('BETIS', 'DEPOR', '0-0'))
+        await marcador.aplicar()
+        marcador.recibir(partido('ALAVES', 'CADIZ', '2-0'))
+        await marcador.aplicar()
+
+    asyncio.run(rondas())
+    assert len(llamadas) == 1
+    assert marcador.en_juego == {('ALAVES', 'CADIZ'): ('2-0', 3), ('BETIS', 'DEPOR'): ('0-0', 3)}
+
+
+def test_resultado_final_se_publica_y_se_guarda(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    marcador = main.MarcadorDirecto(liga, intervalo=0)
+    asyncio.run(correr(marcador, [partido('ALAVES', 'CADIZ', '1-0'), partido('BETIS', 'DEPOR', '0-0')]))
+    asyncio.run(correr(marcador, [partido('ALAVES', 'CADIZ', '3-0', estado='final')]))
+    asyncio.run(correr(marcador, [partido('ALAVES', 'CADIZ', '4-0')]))  # Late message
+    assert liga.df.at['ALAVES', 'CADIZ'] == '3-0'
+    assert liga.jornadas_partidos()[('ALAVES', 'CADIZ')] == 3
+    assert marcador.finalizados == [('ALAVES', 'CADIZ')]
+
+    with open(main.ruta_provisional(liga_csv), encoding='utf-8') as archivo:
+        documento = json.load(archivo)
+    assert documento['en_juego'] == [{'local': 'BETIS', 'visitante': 'DEPOR', 'resultado': '0-0', 'jornada': 3}]
+    assert documento['finalizados'] == [{'local': 'ALAVES', 'visitante': 'CADIZ'}]
+    assert main.LigaVersionada(liga_csv).df.at['ALAVES', 'CADIZ'] == '3-0'
@@ -0,0 +1,64 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import main
+
+
+def entrada(local, visitante, resultado, jornada=''):
+    return {'Local': local, 'Visitante': visitante, 'Resultado': resultado, 'Jornada': jornada}
+
+
+def test_actualizar_y_esperado():
+    motor = main.MotorElo(k=20, ventaja_local=100)
+    assert motor.esperado('A', 'B') == pytest.approx(1 / (1 + 10 ** (-100 / 400)))
+    delta = motor.actualizar('A', 'B', 0, 3)
+    assert delta < 0 and motor.rating('A') + motor.rating('B') == pytest.approx(3000)
+    assert motor.rating('C') == 1500
+
+
+def test_en_linea_igual_que_recalcular():
+    rng = np.random.default_rng(0)
+    equipos = [f"E{i}" for i in range(6)]
+    for _ in range(200):
+        motor = main.MotorElo()
+        partidos = list(itertools.permutations(equipos, 2))
+        rng.shuffle(partidos)
+        for local, visitante in partidos[:rng.integers(1, 30)]:
+            # Game weeks arrive in any order, some results are removed again
+            motor.aplicar_entrada(entrada(local, visitante, f"{rng.integers(0, 4)}-{rng.integers(0, 4)}",
+                                          int(rng.integers(1, 11))))
+            if rng.random() < 0.2:
+                anterior = list(motor.partidos)[int(rng.integers(len(motor.partidos)))]
+                motor.aplicar_entrada(entrada(*anterior, ''))
+        en_linea = dict(motor.ratings)
+        motor.recalcular()
+        assert en_linea == pytest.approx(motor.ratings)
+
+
+def test_jornada_tardia_solo_recalcula_desde_ella(monkeypatch):
+    motor = main.MotorElo()
+    for jornada, (local, visitante) in enumerate([('A', 'B'), ('C', 'D'), ('A', 'C'), ('B', 'D')], start=1):
+        motor.aplicar_entrada(entrada(local, visitante, '1-0', jornada))
+    motor.recalcular()
+
+    valorados = []
+    original = main.MotorElo.actualizar
+    monkeypatch.setattr(main.MotorElo, 'actualizar',
+                        lambda self, *partido: valorados.append(partido[:2]) or original(self, *partido))
+    motor.aplicar_entrada(entrada('D', 'A', '2-2', 3))  # Game week 3 posted after game week 4
+    assert valorados == [('A', 'C'), ('D', 'A'), ('B', 'D')]
+
+    en_linea = dict(motor.ratings)
+    motor.recalcular()
+    assert en_linea == pytest.approx(motor.ratings)
+
+
+def test_desde_liga_sigue_los_resultados(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    motor = main.MotorElo.desde_liga(liga)
+    assert motor.rating('ALAVES') > 1500 > motor.rating('DEPOR')
+    main.LigaVersionada(liga_csv).publicar('DEPOR', 'BETIS', '5-0', 3)
+    liga.refrescar()
+    assert motor.ratings == pytest.approx(main.MotorElo.desde_liga(main.LigaVersionada(liga_csv)).ratings)
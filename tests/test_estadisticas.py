@@ -0,0 +1,48 @@
+import main
+
+
+def test_tablas_local_y_visitante(liga_csv):
+    estadisticas = main.EstadisticasLiga.desde_liga(main.LigaVersionada(liga_csv))
+    local = estadisticas.tabla_local().set_index('EQUIPO')
+    visitante = estadisticas.tabla_visitante().set_index('EQUIPO')
+    assert local.loc['ALAVES', ['PJ', 'PG', 'GF', 'GC', 'PTS']].tolist() == [1, 1, 2, 0, 3]
+    assert visitante.loc['ALAVES', ['PJ', 'PG', 'GF', 'GC', 'PTS']].tolist() == [1, 1, 2, 0, 3]
+    assert local.loc['CADIZ', ['PE', 'PTS']].tolist() == [1, 1]
+    assert estadisticas.tabla_local().iloc[0]['EQUIPO'] == 'BETIS'  # Same points and difference, more goals
+
+    # The split tables add up to the full standings
+    total = local[estadisticas.COLUMNAS] + visitante[estadisticas.COLUMNAS]
+    general = main.Clasificacion(main.LigaVersionada(liga_csv).df).clasificacion.set_index('EQUIPO')
+    assert (total['PTS'] == general.loc[total.index, 'PTS']).all()
+
+
+def test_forma_y_rachas():
+    estadisticas = main.EstadisticasLiga(['A', 'B', 'C', 'D'])
+    partidos = [('A', 'B', '1-0'), ('C', 'A', '0-0'), ('A', 'D', '1-2'), ('B', 'A', '0-3'), ('A', 'C', '1-1'),
+                ('D', 'A', '0-2')]
+    for jornada, (local, visitante, resultado) in enumerate(partidos, start=1):
+        estadisticas.fijar(local, visitante, resultado, jornada)
+    forma = estadisticas.forma_rachas().set_index('EQUIPO')
+    assert forma.loc['A', 'FORMA'] == 'EPGEG'  # G E P G E G, last five
+    assert forma.loc['A', ['INVICTO', 'SIN_GANAR', 'PORTERIA_CERO']].tolist() == [3, 0, 4]
+    assert forma.loc['D', ['FORMA', 'INVICTO', 'SIN_GANAR']].tolist() == ['GP', 0, 1]
+
+    # Changing an old result recomputes the form in game week order
+    estadisticas.fijar('B', 'A', '1-0', 4)
+    forma = estadisticas.forma_rachas().set_index('EQUIPO')
+    assert forma.loc['A', ['FORMA', 'INVICTO', 'PORTERIA_CERO']].tolist() == ['EPPEG', 2, 3]
+    estadisticas.fijar('C', 'A', None)
+    assert estadisticas.forma_rachas().set_index('EQUIPO').loc['A', 'FORMA'] == 'GPPEG'
+    assert estadisticas.tabla_local()['PJ'].sum() == 5
+
+
+def test_sigue_los_resultados_de_otros(liga_csv):
+    lector = main.LigaVersionada(liga_csv)
+    estadisticas = main.EstadisticasLiga.desde_liga(lector)
+    fijas = main.EstadisticasLiga.desde_liga(main.LigaVersionada(liga_csv), seguir=False)
+
+    main.LigaVersionada(liga_csv).publicar('CADIZ', 'ALAVES', '3-0', 3)
+    lector.refrescar()
+    assert estadisticas.tabla_local().set_index('EQUIPO').loc['CADIZ', 'PTS'] == 4
+    assert estadisticas.forma_rachas().set_index('EQUIPO').loc['ALAVES', 'FORMA'] == 'GGP'
+    assert fijas.tabla_local().set_index('EQUIPO').loc['CADIZ', 'PTS'] == 1
@@ -0,0 +1,44 @@
+import json
+import os
+
+import pandas as pd
+
+import main
+
+
+def test_resultados_hasta_jornada(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    jornadas = liga.jornadas_partidos()
+    parcial = main.resultados_hasta_jornada(liga.df, jornadas, 1)
+    assert parcial.notna().sum().sum() == sum(1 for jornada in jornadas.values() if jornada <= 1)
+    for partido, jornada in jornadas.items():
+        assert (parcial.at[partido] == liga.df.at[partido]) if jornada <= 1 else pd.isna(parcial.at[partido])
+
+
+def test_exportar_y_omitir_sin_cambios(liga_csv, tmp_path):
+    salida = str(tmp_path / 'salida')
+    primera = main.exportar_jornadas([liga_csv], salida, procesos=2)
+    directorio = os.path.join(salida, 'liga')
+    assert primera == {'escritos': 4, 'omitidos': 0}  # Two game weeks, a table and a chart each
+    for extension in ('csv', 'html', 'json', 'png'):
+        assert os.path.isfile(os.path.join(directorio, f"jornada_02.{extension}"))
+
+    with open(os.path.join(directorio, 'jornada_02.json'), encoding='utf-8') as archivo:
+        tabla = json.load(archivo)
+    esperada = main.Clasificacion(main.LigaVersionada(liga_csv).df).clasificacion
+    assert [fila['EQUIPO'] for fila in tabla] == list(esperada['EQUIPO'])
+    assert [fila['PTS'] for fila in tabla] == list(esperada['PTS'])
+
+    assert main.exportar_jornadas([liga_csv], salida, procesos=2) == {'escritos': 0, 'omitidos': 4}
+
+
+def test_exportar_solo_lo_que_cambia(liga_csv, tmp_path):
+    salida = str(tmp_path / 'salida')
+    main.exportar_jornadas([liga_csv], salida, procesos=2)
+    main.LigaVersionada(liga_csv).publicar('ALAVES', 'CADIZ', '5-0', 3)
+
+    # Game weeks 1 and 2 did not change; game week 3 is new
+    assert main.exportar_jornadas([liga_csv], salida, procesos=2) == {'escritos': 2, 'omitidos': 4}
+    with open(os.path.join(salida, 'liga', 'manifiesto.json'), encoding='utf-8') as archivo:
+        manifiesto = json.load(archivo)
+    assert manifiesto['tabla_03']['posiciones']['ALAVES'] == 1
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import main
+
+
+def test_indice_rejilla_igual_que_recorrer_todos():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 38, 500), rng.uniform(1, 20, 500)
+    indice = main.IndiceRejilla(x, y)
+    for cx, cy, rx, ry in rng.uniform([0, 1, 0.1, 0.1], [38, 20, 3, 3], size=(50, 4)):
+        cerca = set(np.flatnonzero((np.abs(x - cx) <= rx) & (np.abs(y - cy) <= ry)))
+        candidatos = indice.candidatos(cx, cy, rx, ry)
+        assert cerca <= set(candidatos) and len(candidatos) < len(x)
+
+
+@pytest.fixture
+def grafico():
+    historica = pd.DataFrame([(equipo, jornada, posicion) for jornada in range(1, 7)
+                              for posicion, equipo in enumerate(['A', 'B', 'C', 'D'] if jornada % 2 else
+                                                                ['B', 'A', 'D', 'C'], start=1)],
+                             columns=['Equipo', 'Jornada', 'Posicion'])
+    figura = Figure(figsize=(8, 5), dpi=100)
+    canvas = FigureCanvasAgg(figura)
+    ax = figura.add_subplot(111)
+    lineas = main.dibujar_clasificacion(ax, historica, {'A': 1523.4})
+    interaccion = main.InteraccionClasificacion(ax, lineas, historica, {('B', 2): 6})
+    canvas.draw()
+    return interaccion
+
+
+def raton(interaccion, nombre, jornada, posicion, desplazamiento=0):
+    x, y = interaccion.ax.transData.transform((jornada, posicion))
+    return MouseEvent(nombre, interaccion.canvas, x + desplazamiento, y)
+
+
+def test_leyenda_con_ratings(grafico):
+    etiquetas = [texto.get_text() for texto in grafico.ax.get_legend().get_texts()]
+    assert etiquetas == ['A (1523)', 'B', 'C', 'D']
+
+
+def test_anotacion_al_pasar_el_raton(grafico):
+    grafico.on_move(raton(grafico, 'motion_notify_event', 2, 1))
+    assert grafico.anotacion.get_visible()
+    assert grafico.anotacion.get_text() == "B\nJornada 2\nPosición 1\n6 puntos"
+
+    grafico.on_move(raton(grafico, 'motion_notify_event', 2, 1, desplazamiento=40))  # Away from any point
+    assert not grafico.anotacion.get_visible()
+
+
+def test_resaltar_al_pulsar(grafico):
+    grafico.on_click(raton(grafico, 'button_press_event', 3, 4))
+    assert grafico.seleccionado == 'D' and grafico.resaltado.get_visible()
+    assert list(grafico.resaltado.get_ydata()) == [4, 3, 4, 3, 4, 3]
+
+    grafico.on_click(raton(grafico, 'button_press_event', 3.5, 2.5))
+    assert grafico.seleccionado is None and not grafico.resaltado.get_visible()
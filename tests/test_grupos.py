@@ -0,0 +1,64 @@
+import zipfile
+
+import pytest
+
+import main
+from conftest import escribir_hoja
+
+
+@pytest.fixture
+def ligas(tmp_path, liga_csv):
+    otra = escribir_hoja(tmp_path / 'otra.csv', {('A', 'B'): '1-1', ('B', 'C'): '0-2', ('C', 'A'): '1-0'},
+                         equipos=('A', 'B', 'C'))
+    return [liga_csv, otra]
+
+
+def test_importar_y_clasificar(tmp_path, ligas):
+    contenedor = main.ContenedorGrupos(str(tmp_path / 'federacion.zip'))
+    contenedor.importar_ligas(ligas, reglas={'puntos_victoria': 2})
+    assert contenedor.grupos() == ['liga', 'otra']
+
+    df, jornadas, reglas = contenedor.leer_grupo('liga')
+    liga = main.LigaVersionada(ligas[0])
+    assert df.fillna('').equals(liga.df.fillna('')) and jornadas == liga.jornadas_partidos()
+    assert reglas == {'puntos_victoria': 2, 'puntos_empate': 1}
+
+    tablas = contenedor.clasificaciones(procesos=2)
+    assert list(tablas) == ['liga', 'otra']
+    assert tablas['otra'].set_index('EQUIPO').loc['C', 'PTS'] == 4  # Two wins at two points
+    assert tablas['liga'].equals(contenedor.clasificacion('liga'))
+    with pytest.raises(KeyError):
+        contenedor.leer_grupo('nadie')
+
+
+def test_importar_en_una_sola_escritura(tmp_path, ligas, monkeypatch):
+    contenedor = main.ContenedorGrupos(str(tmp_path / 'federacion.zip'))
+    contenedor.guardar_grupo('previo', main.LigaVersionada(ligas[1]).df)
+    reescrituras = []
+    original = main.os.replace
+    monkeypatch.setattr(main.os, 'replace', lambda *args: (reescrituras.append(args), original(*args)))
+
+    contenedor.importar_ligas(ligas)
+    assert len(reescrituras) == 1
+    assert contenedor.grupos() == ['previo', 'liga', 'otra']
+    with zipfile.ZipFile(contenedor.ruta) as archivo:
+        nombres = archivo.namelist()
+    assert len(nombres) == len(set(nombres)) == 1 + 3 * 3
+
+
+def test_reemplazar_grupo(tmp_path, ligas):
+    contenedor = main.ContenedorGrupos(str(tmp_path / 'federacion.zip'))
+    contenedor.importar_ligas(ligas)
+    contenedor.importar_liga(ligas[1], nombre='liga')
+    assert contenedor.grupos() == ['liga', 'otra']
+    assert list(contenedor.leer_grupo('liga')[0].index) == ['A', 'B', 'C']
+    with pytest.raises(ValueError):
+        contenedor.guardar_grupo('a/b', main.LigaVersionada(ligas[1]).df)
+
+
+def test_no_importa_nada_si_una_liga_no_es_valida(tmp_path, ligas):
+    mala = escribir_hoja(tmp_path / 'mala.csv', {('A', 'B'): '1:1'}, equipos=('A', 'B'))
+    contenedor = main.ContenedorGrupos(str(tmp_path / 'federacion.zip'))
+    with pytest.raises(ValueError):
+        contenedor.importar_ligas(ligas + [mala])
+    assert contenedor.grupos() == []
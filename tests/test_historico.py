@@ -0,0 +1,43 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def liga(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    liga.publicar('ALAVES', 'CADIZ', '0-4', 3)
+    liga.publicar('BETIS', 'DEPOR', '1-0', 3)
+    return liga
+
+
+def test_cada_jornada_es_la_clasificacion_hasta_ella(liga):
+    historico = main.HistoricoJornadas.desde_liga(liga)
+    assert historico.total == 6  # A double round-robin of four teams
+    matrices = main.MatricesLiga(liga.df, liga.jornadas_partidos())
+    for jornada in range(1, 4):
+        esperada = matrices.clasificar(jornadas=(1, jornada))
+        assert historico.tabla(jornada).equals(esperada)
+    with pytest.raises(IndexError):
+        historico.como_en(7)
+
+
+def test_filas_sin_cambios_se_comparten(liga):
+    historico = main.HistoricoJornadas.desde_liga(liga)
+    filas = {fila.EQUIPO: fila for fila in historico.como_en(3)}
+    siguientes = {fila.EQUIPO: fila for fila in historico.como_en(4)}  # No results in game week 4
+    assert all(siguientes[equipo] is fila for equipo, fila in filas.items())
+
+
+def test_un_resultado_solo_reconstruye_desde_su_jornada(liga):
+    historico = main.HistoricoJornadas.desde_liga(liga)
+    primera, tercera = historico.como_en(1), historico.como_en(3)
+
+    liga.publicar('ALAVES', 'CADIZ', '4-0', 3)
+    assert historico.como_en(1) is primera  # Earlier snapshots are kept
+    assert historico.como_en(3) is not tercera
+    assert historico.como_en(3)[0].EQUIPO == 'ALAVES'
+
+    posiciones = historico.historica()
+    assert len(posiciones) == 6 * 4
+    assert posiciones.query('Jornada == 3 and Posicion == 1')['Equipo'].item() == 'ALAVES'
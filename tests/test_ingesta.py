@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+
+import main
+
+
+def escribir_archivo(ruta, filas):
+    pd.DataFrame(filas, columns=['date', 'season', 'home', 'away', 'score']).to_csv(ruta, index=False)
+    return str(ruta)
+
+
+def test_ingerir_temporadas(tmp_path):
+    # Day-first dates, which sort differently read month first
+    archivo = escribir_archivo(tmp_path / 'partidos.csv', [
+        ('13/08/2022', '2022', 'b', 'C', '0-0'),
+        ('02/09/2022', '2022', 'A', 'B', '2-1'),
+        ('12/08/2022', '2022', 'A', 'C', '1 - 0'),
+        ('2022-08-20', '2022', 'C', 'B', '3-0'),
+        ('mañana', '2022', 'B', 'A', '1-1'),
+        ('01/08/2023', '2023', 'A', 'B', 'aplazado'),
+    ])
+    salida = str(tmp_path / 'ligas')
+    resumen = main.ingerir_partidos(archivo, salida, procesos=2, tamano_bloque=2)
+    assert resumen['filas'] == 6 and resumen['temporadas'] == 2
+
+    liga = main.LigaVersionada(os.path.join(salida, 'liga_2022.csv'))
+    assert liga.df.at['A', 'C'] == '1-0' and liga.df.at['B', 'C'] == '0-0'
+    jornadas = liga.jornadas_partidos()
+    assert jornadas[('A', 'C')] == 1 and jornadas[('B', 'C')] == 2 and jornadas[('C', 'B')] == 3
+    assert jornadas[('A', 'B')] == 4 and jornadas[('B', 'A')] == 5  # The unreadable date goes last
+    assert any('mañana' in problema for problema in resumen['problemas']['liga_2022'])
+    assert os.path.isfile(os.path.join(salida, 'liga_2022clasificacion.csv'))
+
+    # A season without valid matches is reported and not created
+    assert not os.path.exists(os.path.join(salida, 'liga_2023.csv'))
+    assert any('vacia' in problema for problema in resumen['problemas']['liga_2023'])
+
+    # Running it again does not build anything
+    assert main.ingerir_partidos(archivo, salida, procesos=2, tamano_bloque=2)['temporadas'] == 0
+
+
+def test_formato_de_fecha(tmp_path):
+    archivo = escribir_archivo(tmp_path / 'partidos.csv', [
+        ('08/13/2022', '2022', 'A', 'B', '1-0'),
+        ('08/12/2022', '2022', 'C', 'A', '0-0'),
+    ])
+    salida = str(tmp_path / 'ligas')
+    resumen = main.ingerir_partidos(archivo, salida, procesos=1, formato_fecha='%m/%d/%Y')
+    assert 'liga_2022' not in resumen['problemas']
+    jornadas = main.LigaVersionada(os.path.join(salida, 'liga_2022.csv')).jornadas_partidos()
+    assert jornadas == {('C', 'A'): 1, ('A', 'B'): 2}
+
+
+def test_historico_de_liga_sin_partidos():
+    historico = main.HistoricoJornadas(main.MatricesLiga(pd.DataFrame(dtype=object)))
+    assert historico.total == 0 and historico.historica().empty
@@ -0,0 +1,109 @@
+import sys
+
+import pytest
+
+import main
+from conftest import escribir_hoja
+
+
+class Combo:
+    """
+    Stand-in for the game week ttk.Combobox.
+    """
+
+    def __init__(self, valor):
+        self.valor = str(valor)
+
+    def get(self):
+        return self.valor
+
+    def set(self, valor):
+        self.valor = str(valor)
+
+
+class Arbol:
+    """
+    Stand-in for a ttk.Treeview with the top-level rows only.
+    """
+
+    def __init__(self):
+        self.filas = []
+
+    def get_children(self):
+        return tuple(range(len(self.filas)))
+
+    def delete(self, *iids):
+        self.filas = [fila for iid, fila in enumerate(self.filas) if iid not in iids]
+
+    def insert(self, padre, indice, values, tags):
+        self.filas.append((list(values), tags))
+
+
+def impacto(liga_csv, descensos=1):
+    return main.ImpactoJornadas(main.HistoricoJornadas.desde_liga(main.LigaVersionada(liga_csv), seguir=False),
+                                descensos)
+
+
+def test_clasificacion_tras_la_jornada(liga_csv):
+    equipos, _ = impacto(liga_csv).jornada(2)
+    assert list(equipos['EQUIPO']) == ['ALAVES', 'BETIS', 'CADIZ', 'DEPOR']
+    betis = equipos.loc[2]
+    assert (betis.ANTES, betis.MOV, betis.PTS, betis.GANADOS, betis.LIDER, betis.DESCENSO) == (4, 2, 3, 3, 3, 2)
+    assert list(equipos['MOV']) == [0, 2, -1, -1]
+    # DEPOR is relegated: it is 0 points behind the last safe place, CADIZ
+    assert list(equipos['DESCENSO']) == [5, 2, 0, 0]
+
+
+def test_primera_jornada_sin_posicion_anterior(liga_csv):
+    equipos, resultados = impacto(liga_csv).jornada(1)
+    assert equipos['ANTES'].isna().all() and equipos['MOV'].isna().all()
+    assert list(equipos['GANADOS']) == list(equipos['PTS']) == [3, 1, 1, 0]
+    assert list(resultados[['LOCAL', 'RESULTADO', 'VISITANTE']].itertuples(index=False, name=None)) == \
+        [('ALAVES', '2-0', 'BETIS'), ('CADIZ', '1-1', 'DEPOR')]
+    assert list(resultados['POS_VISITANTE']) == [4, 3]
+    assert list(resultados['DESCENSO_VISITANTE']) == [-1, 1]
+
+
+def test_jornada_fuera_de_rango_y_tablas_reutilizadas(liga_csv):
+    efecto = impacto(liga_csv)
+    assert efecto.jornadas == 2
+    for jornada in (0, 3):
+        with pytest.raises(IndexError):
+            efecto.jornada(jornada)
+    assert efecto.jornada(2) is efecto.jornada(2)
+
+
+def test_liga_sin_resultados(tmp_path):
+    efecto = impacto(escribir_hoja(tmp_path / 'vacia.csv', {}))
+    assert efecto.jornadas == 0
+    with pytest.raises(IndexError):
+        efecto.jornada(1)
+
+
+def test_ventana_mueve_la_jornada_y_colorea(liga_csv):
+    ventana = main.VisualizarJornada.__new__(main.VisualizarJornada)
+    ventana.impacto = impacto(liga_csv)
+    ventana.combo_jornada = Combo(2)
+    ventana.arbol_resultados, ventana.arbol_clasificacion = Arbol(), Arbol()
+
+    ventana.mover(1)  # There is no game week 3
+    assert ventana.combo_jornada.get() == '2' and ventana.arbol_clasificacion.filas == []
+
+    ventana.mostrar()
+    ventana.mostrar()
+    assert [valores[1] for valores, _ in ventana.arbol_clasificacion.filas] == ['ALAVES', 'BETIS', 'CADIZ', 'DEPOR']
+    assert [etiquetas for _, etiquetas in ventana.arbol_clasificacion.filas] == [(), ('sube',), ('baja',), ('baja',)]
+
+    ventana.mover(-1)
+    assert ventana.combo_jornada.get() == '1'
+    assert [valores[0] for valores, _ in ventana.arbol_resultados.filas] == ['ALAVES', 'CADIZ']
+    assert ventana.arbol_clasificacion.filas[0][0][2] == ''  # No position before the first game week
+
+
+def test_comando_jornada(liga_csv, monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'argv', ['main.py', 'jornada', liga_csv, '--jornada', '1', '--descensos', '1'])
+    main.main()
+    salida = capsys.readouterr().out
+    resultados, equipos = salida.split('\n\n')
+    assert 'ALAVES' in resultados.splitlines()[1] and '2-0' in resultados.splitlines()[1]
+    assert equipos.splitlines()[2].split()[:2] == ['1', 'ALAVES']
@@ -0,0 +1,92 @@
+import os
+
+import pandas as pd
+import pytest
+
+import main
+
+
+def estado(liga):
+    return liga.df.fillna('').to_dict(), dict(liga.jornadas)
+
+
+def test_publicar_y_recargar(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    entrada = liga.publicar('ALAVES', 'CADIZ', '1-0', 3)
+    assert entrada['Anterior'] == '' and entrada['Jornada'] == 3
+    assert liga.publicar('ALAVES', 'CADIZ', '1-0', 3) is None  # Same result and game week
+
+    otra = main.LigaVersionada(liga_csv)
+    assert otra.df.at['ALAVES', 'CADIZ'] == '1-0'
+    assert otra.jornadas_partidos()[('ALAVES', 'CADIZ')] == 3
+
+
+def test_conflicto_entre_escritores(liga_csv):
+    primera, segunda = main.LigaVersionada(liga_csv), main.LigaVersionada(liga_csv)
+    primera.publicar('ALAVES', 'CADIZ', '1-0')
+    with pytest.raises(main.ConflictoResultado):
+        segunda.publicar('ALAVES', 'CADIZ', '0-1')
+    assert segunda.df.at['ALAVES', 'CADIZ'] == '1-0'  # The other result was merged
+
+
+def test_registro_anterior_sin_base(liga_csv):
+    with open(main.ruta_registro(liga_csv), 'w') as archivo:
+        archivo.write('Secuencia,Local,Visitante,Anterior,Resultado\n1,ALAVES,CADIZ,,4-4\n')
+    liga = main.LigaVersionada(liga_csv)
+    assert liga.df.at['ALAVES', 'CADIZ'] == '4-4' and liga.version == 1
+
+
+def test_compactar_recorta_el_registro(liga_csv, monkeypatch):
+    monkeypatch.setattr(main.LigaVersionada, 'COMPACTAR_CADA', 4)
+    liga = main.LigaVersionada(liga_csv)
+    partidos = [('ALAVES', 'CADIZ'), ('BETIS', 'DEPOR'), ('CADIZ', 'BETIS'), ('DEPOR', 'CADIZ')]
+    for vuelta in range(10):
+        for jornada, (local, visitante) in enumerate(partidos, start=3):
+            liga.publicar(local, visitante, f"{vuelta}-0", jornada)
+
+    with open(main.ruta_registro(liga_csv)) as archivo:
+        lineas = archivo.read().splitlines()
+    assert lineas[0] == f"#base,{liga.version}"
+    assert len(lineas) <= 2 + len(liga.jornadas)  # Only the game weeks, not 40 updates
+
+    recargada = main.LigaVersionada(liga_csv)
+    assert recargada.version == liga.version == 40
+    assert estado(recargada) == estado(liga)
+
+
+def test_lector_atrasado_se_resincroniza(liga_csv, monkeypatch):
+    monkeypatch.setattr(main.LigaVersionada, 'COMPACTAR_CADA', 3)
+    lector = main.LigaVersionada(liga_csv)
+    vistas = []
+    lector.suscribir(vistas.append)
+    lector.refrescar()
+
+    escritor = main.LigaVersionada(liga_csv)
+    escritor.publicar('ALAVES', 'CADIZ', '1-0', 3)
+    escritor.publicar('ALAVES', 'BETIS', '', None)  # A removed result
+    escritor.publicar('BETIS', 'DEPOR', '2-2', 4)
+    escritor.publicar('CADIZ', 'BETIS', '0-3', 4)  # Written after the compaction
+
+    entradas = lector.refrescar()
+    assert estado(lector) == estado(escritor)
+    assert lector.version == escritor.version
+    cambios = {(entrada['Local'], entrada['Visitante']): entrada['Resultado'] for entrada in entradas}
+    assert cambios == {('ALAVES', 'CADIZ'): '1-0', ('ALAVES', 'BETIS'): '', ('BETIS', 'DEPOR'): '2-2',
+                       ('CADIZ', 'BETIS'): '0-3'}
+    assert vistas == entradas
+
+    # The matrices of the reader follow the compaction through the same entries
+    matrices = main.MatricesLiga.desde_liga(main.LigaVersionada(liga_csv))
+    assert matrices.clasificar().equals(main.MatricesLiga(escritor.df, escritor.jornadas_partidos()).clasificar())
+
+
+def test_no_quedan_archivos_de_bloqueo(liga_csv):
+    main.LigaVersionada(liga_csv).publicar('ALAVES', 'CADIZ', '1-0')
+    assert not os.path.exists(liga_csv.replace('.csv', '.lock'))
+
+
+def test_archivo_auxiliar_solo_junto_a_su_liga(tmp_path, liga_csv):
+    assert main.es_archivo_auxiliar(str(tmp_path / 'ligaregistro.csv'))
+    assert main.es_archivo_auxiliar(str(tmp_path / 'ligaclasificacion.csv'))
+    assert not main.es_archivo_auxiliar(str(tmp_path / 'copaclasificacion.csv'))
+    assert not main.es_archivo_auxiliar(liga_csv)
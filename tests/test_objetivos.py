@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+import main
+
+
+def estados_por_enumeracion(matrices, equipo, puesto):
+    """
+    Status of a team for a position, trying every outcome of the unplayed matches.
+    """
+    objetivos = main.ObjetivosMatematicos(matrices)
+    x = objetivos.equipos.index(equipo)
+    siempre, nunca = True, True
+    for desenlaces in itertools.product((0, 1, 2), repeat=len(objetivos.pendientes)):
+        puntos = list(objetivos.puntos)
+        for (local, visitante), desenlace in zip(objetivos.pendientes, desenlaces):
+            if desenlace == 1:
+                puntos[local] += matrices.puntos_empate
+                puntos[visitante] += matrices.puntos_empate
+            else:
+                puntos[local if desenlace == 0 else visitante] += matrices.puntos_victoria
+        # Level teams count as able to finish above and below
+        por_encima = sum(puntos[i] > puntos[x] for i in range(len(puntos)) if i != x)
+        a_la_par = sum(puntos[i] >= puntos[x] for i in range(len(puntos)) if i != x)
+        siempre &= a_la_par < puesto
+        nunca &= por_encima >= puesto
+    return 'asegurado' if siempre else 'eliminado' if nunca else 'posible'
+
+
+def test_igual_que_probar_todos_los_desenlaces():
+    rng = np.random.default_rng(5)
+    for _ in range(25):
+        df = main.hoja_aleatoria(rng, 4)
+        # Leave at most six matches unplayed so that every outcome can be tried
+        pendientes = [partido for partido in itertools.permutations(df.index, 2) if pd.isna(df.at[partido])]
+        for partido in pendientes[6:]:
+            df.at[partido] = f"{rng.integers(0, 3)}-{rng.integers(0, 3)}"
+        matrices = main.MatricesLiga(df)
+        objetivos = main.ObjetivosMatematicos(matrices, presupuesto=10 ** 6)
+        for equipo in df.index:
+            for puesto in range(1, 4):
+                assert objetivos.estado(equipo, puesto) == estados_por_enumeracion(matrices, equipo, puesto), \
+                    (df.to_dict(), equipo, puesto)
+
+
+def test_liga_terminada_y_sin_empezar():
+    rng = np.random.default_rng(0)
+    terminada = main.hoja_aleatoria(rng, 5)
+    for partido in itertools.permutations(terminada.index, 2):
+        if pd.isna(terminada.at[partido]):
+            terminada.at[partido] = '1-0'
+    objetivos = main.ObjetivosMatematicos(main.MatricesLiga(terminada))
+    tabla = main.MatricesLiga(terminada).clasificar()
+    lider = tabla.iloc[0]
+    if lider['PTS'] > tabla.iloc[1]['PTS']:
+        assert objetivos.estado(lider['EQUIPO'], 1) == 'asegurado'
+    assert objetivos.estado(tabla.iloc[-1]['EQUIPO'], 1) == 'eliminado' or tabla['PTS'].nunique() == 1
+
+    vacia = main.ObjetivosMatematicos(main.MatricesLiga(main.hoja_vacia(rng, 5)))
+    assert {vacia.estado(equipo, puesto) for equipo in vacia.equipos for puesto in (1, 4)} == {'posible'}
+
+
+def test_tabla(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    tabla = main.ObjetivosMatematicos(main.MatricesLiga.desde_liga(liga, seguir=False)).tabla([1, 3])
+    assert list(tabla.columns) == ['EQUIPO', 'PTS', 'TOP 1', 'TOP 3']
+    assert tabla.iloc[0]['EQUIPO'] == 'ALAVES'
+    assert set(tabla['TOP 1']) <= {'asegurado', 'posible', 'eliminado'}
@@ -0,0 +1,69 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def servidor(liga_csv, tmp_path):
+    servidor = main.ServidorClasificaciones(('127.0.0.1', 0), str(tmp_path), intervalo=0)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def pedir(url, cabeceras=None):
+    peticion = urllib.request.Request(url, headers=cabeceras or {})
+    try:
+        with urllib.request.urlopen(peticion) as respuesta:
+            return respuesta.status, respuesta.headers, respuesta.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.headers, error.read()
+
+
+def test_lista_ligas_sin_archivos_auxiliares(servidor, liga_csv):
+    main.LigaVersionada(liga_csv).publicar('ALAVES', 'CADIZ', '1-0')
+    estado, _, cuerpo = pedir(servidor + '/ligas')
+    assert estado == 200
+    assert json.loads(cuerpo) == {'ligas': ['liga']}
+
+
+def test_clasificacion_y_etag(servidor):
+    estado, cabeceras, cuerpo = pedir(servidor + '/ligas/liga/clasificacion')
+    assert estado == 200
+    tabla = json.loads(cuerpo)
+    assert [fila['EQUIPO'] for fila in tabla] == ['ALAVES', 'BETIS', 'CADIZ', 'DEPOR']
+    assert tabla[0]['PTS'] == 6 and tabla[0]['POS'] == 1
+
+    estado, _, cuerpo = pedir(servidor + '/ligas/liga/clasificacion', {'If-None-Match': cabeceras['ETag']})
+    assert estado == 304 and cuerpo == b''
+
+
+def test_etag_cambia_con_un_resultado(servidor, liga_csv):
+    _, cabeceras, _ = pedir(servidor + '/ligas/liga/clasificacion')
+    main.LigaVersionada(liga_csv).publicar('CADIZ', 'ALAVES', '3-0')
+    estado, nuevas, cuerpo = pedir(servidor + '/ligas/liga/clasificacion', {'If-None-Match': cabeceras['ETag']})
+    assert estado == 200
+    assert nuevas['ETag'] != cabeceras['ETag']
+    assert {fila['EQUIPO']: fila['PTS'] for fila in json.loads(cuerpo)}['CADIZ'] == 4
+
+
+def test_clasificacion_por_jornada_y_consulta(servidor):
+    _, _, cuerpo = pedir(servidor + '/ligas/liga/clasificacion?jornada=1')
+    assert {fila['EQUIPO']: fila['PJ'] for fila in json.loads(cuerpo)} == {'ALAVES': 1, 'BETIS': 1, 'CADIZ': 1, 'DEPOR': 1}
+
+    _, _, cuerpo = pedir(servidor + '/ligas/liga/consulta?equipos=ALAVES,BETIS')
+    assert [(fila['EQUIPO'], fila['PJ']) for fila in json.loads(cuerpo)] == [('ALAVES', 1), ('BETIS', 1)]
+
+
+def test_errores(servidor):
+    assert pedir(servidor + '/ligas/otra/clasificacion')[0] == 404
+    assert pedir(servidor + '/ligas/liga/clasificacion?jornada=99')[0] == 400
+    assert pedir(servidor + '/ligas/liga/consulta?equipos=NADIE')[0] == 400
+    assert pedir(servidor + '/nada')[0] == 404
@@ -0,0 +1,126 @@
+import itertools
+
+import pandas as pd
+import pytest
+
+import main
+
+
+class Arbol:
+    """
+    Stand-in for a ttk.Treeview with the top-level rows only.
+    """
+
+    def __init__(self):
+        self.hijos, self.valores, self.movidos = [], {}, []
+
+    def insert(self, padre, indice, iid):
+        self.hijos.insert(len(self.hijos) if indice == 'end' else indice, iid)
+
+    def delete(self, iid):
+        self.hijos.remove(iid)
+
+    def detach(self, iid):
+        self.hijos.remove(iid)
+
+    def move(self, iid, padre, indice):
+        self.movidos.append(iid)
+        self.hijos.insert(indice, iid)
+
+    def item(self, iid, values, tags):
+        self.valores[iid] = values
+
+    def get_children(self):
+        return tuple(self.hijos)
+
+
+def tabla(equipos):
+    return pd.DataFrame({'EQUIPO': equipos, 'PTS': range(len(equipos), 0, -1)}, index=range(1, len(equipos) + 1))
+
+
+@pytest.fixture
+def widget():
+    widget = main.TablaClasificacion.__new__(main.TablaClasificacion)
+    widget.columnas, widget.arbol, widget.filas = ['EQUIPO', 'PTS'], Arbol(), {}
+    return widget
+
+
+def test_orden_tras_cambios(widget):
+    widget.actualizar(tabla(['A', 'B', 'C', 'D']))
+    widget.actualizar(tabla(['C', 'B', 'D', 'A']))
+    assert widget.arbol.hijos == ['C', 'B', 'D', 'A']
+    assert widget.arbol.valores['A'][:2] == (4, '▼3') and widget.arbol.valores['C'][:2] == (1, '▲2')
+
+
+def test_todas_las_permutaciones(widget):
+    anterior = ['A', 'B', 'C', 'D', 'E']
+    widget.actualizar(tabla(anterior))
+    for orden in itertools.permutations(anterior):
+        widget.arbol.movidos.clear()
+        widget.actualizar(tabla(list(orden)))
+        assert widget.arbol.hijos == list(orden)
+        assert len(widget.arbol.movidos) <= sum(a != b for a, b in zip(anterior, orden))
+        anterior = list(orden)
+
+
+def test_equipos_retirados_y_nuevos(widget):
+    widget.actualizar(tabla(['A', 'B', 'C', 'D']))
+    widget.actualizar(tabla(['D', 'E', 'A']))
+    assert widget.arbol.hijos == ['D', 'E', 'A']
+    assert set(widget.filas) == {'A', 'D', 'E'}
+
+
+def test_solo_redibuja_lo_que_cambia(widget):
+    widget.actualizar(tabla(['A', 'B', 'C', 'D']))
+    assert widget.actualizar(tabla(['A', 'B', 'C', 'D'])) == 0
+    assert widget.actualizar(tabla(['B', 'A', 'C', 'D'])) == 2
+    assert widget.arbol.movidos == ['B']
+
+
+class Pestanas:
+    def __init__(self, visible):
+        self.visible = visible
+
+    def select(self):
+        return self.visible
+
+    def tab(self, pestana, opcion):
+        return pestana
+
+
+class Texto:
+    def __init__(self):
+        self.contenido, self.veces = '', 0
+
+    def config(self, **opciones):
+        pass
+
+    def delete(self, *indices):
+        self.contenido = ''
+
+    def insert(self, indice, texto):
+        self.contenido += texto
+        self.veces += 1
+
+
+def test_solo_se_muestra_la_pestana_visible(liga_csv):
+    ventana = main.VisualizarClasificacion.__new__(main.VisualizarClasificacion)
+    ventana.liga = main.LigaVersionada(liga_csv)
+    ventana.estadisticas = main.EstadisticasLiga.desde_liga(ventana.liga)
+    ventana.matrices = main.MatricesLiga.desde_liga(ventana.liga)
+    ventana.textos_estadisticas = {pestana: Texto() for pestana in ["Local", "Visitante", "Forma y rachas", "Objetivos"]}
+    ventana.pestanas, ventana.pendientes = Pestanas('General'), set()
+
+    ventana.mostrarEstadisticas(ventana.textos_estadisticas)
+    assert all(texto.veces == 0 for texto in ventana.textos_estadisticas.values())
+
+    ventana.pestanas.visible = 'Objetivos'
+    ventana.mostrarEstadisticas()
+    ventana.mostrarEstadisticas()
+    assert ventana.textos_estadisticas['Objetivos'].veces == 1
+    assert 'TOP 1' in ventana.textos_estadisticas['Objetivos'].contenido
+    assert ventana.textos_estadisticas['Local'].veces == 0
+
+    ventana.pestanas.visible = 'Local'
+    ventana.mostrarEstadisticas()
+    assert 'ALAVES' in ventana.textos_estadisticas['Local'].contenido
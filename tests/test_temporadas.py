@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import main
+from conftest import escribir_hoja
+
+
+def temporada(ruta, equipos, partidos):
+    """
+    Write a league and post its (local, visitante, resultado, jornada) matches.
+    """
+    liga = main.LigaVersionada(escribir_hoja(ruta, {}, equipos=equipos))
+    for partido in partidos:
+        liga.publicar(*partido)
+    return liga.file_path
+
+
+@pytest.fixture
+def comparativa(tmp_path):
+    primera = temporada(tmp_path / 't1.csv', ('A', 'B', 'C'),
+                        [('A', 'B', '1-0', 1), ('B', 'C', '2-2', 2), ('C', 'A', '0-3', 3), ('B', 'A', '1-0', 4)])
+    segunda = temporada(tmp_path / 't2.csv', ('A', 'B', 'D'), [('B', 'A', '2-0', 1), ('A', 'D', '1-1', 2)])
+    return main.ComparativaTemporadas.desde_archivos([primera, segunda])
+
+
+def test_alineadas_por_equipo_y_jornada(comparativa):
+    assert comparativa.temporadas == ['t1', 't2'] and comparativa.equipos == ['A', 'B', 'C', 'D']
+    assert comparativa.puntos.shape == (2, 4, 4)  # The longest season has 4 game weeks
+    assert comparativa.jugadas().tolist() == [4, 2]
+
+    puntos = comparativa.serie('A')
+    assert puntos['t1'].tolist() == [3, 3, 6, 6]
+    assert puntos['t2'].tolist()[:2] == [0, 1] and np.isnan(puntos['t2'][3])
+    assert np.isnan(comparativa.serie('C')['t2']).all()  # C did not play the second season
+    assert comparativa.serie('A', 'posiciones')['t1'].tolist() == [1, 1, 1, 1]
+
+
+def test_posiciones_igual_que_el_historico(tmp_path, comparativa):
+    historico = main.HistoricoJornadas.desde_liga(main.LigaVersionada(str(tmp_path / 't1.csv')), seguir=False)
+    for jornada in range(1, 5):
+        for posicion, fila in enumerate(historico.como_en(jornada), start=1):
+            assert comparativa.posiciones[0, comparativa.indices[fila.EQUIPO], jornada - 1] == posicion
+
+
+def test_ritmo(comparativa):
+    ritmo = comparativa.ritmo().set_index('EQUIPO')
+    assert ritmo.loc['B', ['PTS', 'MEDIA', 'DIF', 'TEMPORADAS']].tolist() == [3, 1, 2, 1]  # After game week 2
+    assert ritmo.loc['A', 'DIF'] == -2
+    assert np.isnan(ritmo.loc['D', 'MEDIA']) and ritmo.loc['D', 'TEMPORADAS'] == 0
+    assert ritmo.index[0] == 'B'
+    assert np.isnan(comparativa.ritmo(temporada=0)['MEDIA']).all()  # Nothing to compare with
+
+
+def test_rachas_y_posicion_media(comparativa):
+    rachas = comparativa.rachas(longitud=2).set_index(['TEMPORADA', 'EQUIPO'])
+    assert rachas.loc[('t1', 'B'), ['MEJOR', 'DESDE_MEJOR', 'PEOR', 'DESDE_PEOR']].tolist() == [3, 3, 1, 1]
+    assert ('t2', 'C') not in rachas.index
+    assert comparativa.rachas(longitud=5).empty
+
+    media = comparativa.posicion_media()
+    assert 'C' in media.index and media.loc['A', 1] == pytest.approx(2.0)  # First and third
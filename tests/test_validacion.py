@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+import main
+from conftest import escribir_hoja
+
+
+def tipos(problemas):
+    return sorted(problema.tipo for problema in problemas)
+
+
+def test_hoja_correcta(liga_csv):
+    liga = main.LigaVersionada(liga_csv)
+    assert main.validar_resultados(liga.df, liga.jornadas_partidos()) == []
+
+
+def test_celdas_no_validas():
+    df = pd.DataFrame(np.nan, index=['A', 'B', 'C'], columns=['A', 'B', 'C'], dtype=object)
+    df.at['A', 'B'] = '2:1'
+    df.at['B', 'C'] = '31-0'
+    df.at['C', 'C'] = '1-1'
+    problemas = main.validar_resultados(df)
+    assert tipos(problemas) == ['diagonal', 'formato', 'goles']
+    formato = next(problema for problema in problemas if problema.tipo == 'formato')
+    assert (formato.local, formato.visitante) == ('A', 'B')
+    assert '[formato] (A, B)' in main.informe_validacion(problemas)
+
+
+def test_nombres_de_equipos():
+    df = pd.DataFrame(np.nan, index=['A', 'b', 'C'], columns=['A', 'B', 'C'], dtype=object)
+    problemas = main.validar_resultados(df)
+    assert tipos(problemas) == ['nombres', 'nombres', 'nombres']
+
+
+def test_partidos_y_jornadas():
+    df = pd.DataFrame(np.nan, index=['A', 'B', 'C'], columns=['A', 'B', 'C'], dtype=object)
+    df.at['A', 'B'], df.at['A', 'C'] = '1-0', '2-2'
+    problemas = main.validar_resultados(df, {('A', 'B'): 1, ('A', 'C'): 1})
+    assert tipos(problemas) == ['jornada']
+    assert problemas[0].local == 'A'
+
+
+def test_partido_en_las_dos_orientaciones(tmp_path):
+    ruta = escribir_hoja(tmp_path / 'liga.csv', {('ALAVES', 'BETIS'): '2-1', ('BETIS', 'ALAVES'): '1-2'})
+    liga = main.LigaVersionada(ruta)
+    liga.publicar('ALAVES', 'BETIS', '2-1', 4)
+    liga.publicar('BETIS', 'ALAVES', '1-2', 4)
+
+    problemas = main.validar_resultados(liga.df, liga.jornadas_partidos())
+    orientacion = [problema for problema in problemas if problema.tipo == 'orientacion']
+    assert len(orientacion) == 1
+    assert (orientacion[0].local, orientacion[0].visitante) == ('ALAVES', 'BETIS')
+    assert 'jornada 4' in orientacion[0].mensaje
+
+    # The two legs of the pair in different game weeks are fine
+    liga.publicar('BETIS', 'ALAVES', '1-2', 9)
+    assert main.validar_resultados(liga.df, liga.jornadas_partidos()) == []
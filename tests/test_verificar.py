@@ -0,0 +1,47 @@
+import numpy as np
+
+import main
+
+
+def test_motor_de_matrices_igual_que_la_ventana():
+    informe = main.verificar_motor(main.motor_matrices, casos=60, equipos=(2, 8))
+    assert informe['divergencia'] is None
+    assert informe['casos'] == 60
+    assert set(informe['tiempos']) == set(main.GENERADORES_HOJAS)
+
+
+def test_encuentra_y_reproduce_una_divergencia():
+    def motor_sin_desempates(df):
+        tabla = main.MatricesLiga(df).clasificar()
+        tabla = tabla.sort_values(['PTS', 'EQUIPO'], ascending=[False, True])
+        tabla.index = range(1, len(tabla) + 1)
+        return tabla
+
+    informe = main.verificar_motor(motor_sin_desempates, casos=100, generadores=['triple'])
+    divergencia = informe['divergencia']
+    assert divergencia is not None and informe['casos'] == divergencia['caso'] + 1
+
+    # The case can be generated again from the seed and its number
+    rng = np.random.default_rng([0, divergencia['caso']])
+    hoja = main.GENERADORES_HOJAS['triple'](rng, int(rng.integers(2, 13)))
+    assert hoja.equals(divergencia['hoja'])
+
+
+def test_errores_del_motor_son_divergencias():
+    def motor_roto(df):
+        raise ValueError("roto")
+
+    divergencia = main.verificar_motor(motor_roto, casos=5)['divergencia']
+    assert divergencia['caso'] == 0 and 'roto' in divergencia['obtenido']['ERROR'][0]
+
+
+def test_generadores():
+    rng = np.random.default_rng(0)
+    for nombre, generador in main.GENERADORES_HOJAS.items():
+        df = generador(rng, 6)
+        assert list(df.index) == list(df.columns) and df.shape == (6, 6), nombre
+        assert df.isna().to_numpy().diagonal().all(), nombre
+        assert main.validar_resultados(df) == [], nombre
+    assert main.hoja_vacia(rng, 4).isna().all().all()
+    solo_ida = main.hoja_solo_ida(rng, 6).notna().to_numpy()
+    assert not (solo_ida & solo_ida.T).any()